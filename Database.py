@@ -1,15 +1,615 @@
+import datetime
+import decimal
+import functools
+import itertools
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+
 import pymysql
+
+BACKENDS = ('mysql', 'sqlite')
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'database', 'schema.sql')
+MIGRATIONS_DIR = os.path.join(os.path.dirname(SCHEMA_PATH), 'migrations')
+# FULLTEXT indeksi bulunamayan tablo bu kadar saniye sonra yeniden kontrol edilir
+# (başka bir süreçte `python migrate.py` çalıştırılmış olabilir)
+FULLTEXT_CHECK_INTERVAL = 60
+MIGRATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version     VARCHAR(255) PRIMARY KEY,
+        applied_at  TIMESTAMP NOT NULL
+    )
+"""
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes free within checkout_timeout."""
+
+
+class PooledConnection:
+    """
+    Wrapper handed out by ConnectionPool. Everything is delegated to the real
+    pymysql connection except close(), which returns it to the pool, so the
+    existing `finally: conn.close()` blocks in services keep working unchanged.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self._pool.release(self._raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of MySQL connections.
+
+    - max_size: upper bound of open connections (idle + checked out)
+    - max_idle_time: idle connections older than this (seconds) are closed
+    - checkout_timeout: how long acquire() waits for a free slot
+    - health_check_interval: connections idle longer than this are pinged
+      before being handed out; dead ones are replaced transparently
+    """
+
+    def __init__(self, factory, max_size=10, max_idle_time=300,
+                 checkout_timeout=5.0, health_check_interval=30):
+        self._factory = factory
+        self.max_size = max_size
+        self.max_idle_time = max_idle_time
+        self.checkout_timeout = checkout_timeout
+        self.health_check_interval = health_check_interval
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (connection, last_used) - en sağdaki en son kullanılan
+        self._size = 0
+        self._in_use = 0
+        self._pid = os.getpid()
+        self._counters = {
+            'created': 0, 'reused': 0, 'evicted': 0, 'discarded': 0,
+            'timeouts': 0, 'waits': 0, 'peak_in_use': 0,
+        }
+
+    # --- Checkout ---
+    def acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            raw, last_used = self._reserve(deadline)
+
+            if raw is None:
+                try:
+                    raw = self._factory()
+                except Exception:
+                    self._forget(in_use=True)
+                    raise
+                self._bump('created')
+                return PooledConnection(self, raw)
+
+            if time.monotonic() - last_used > self.health_check_interval and not self._is_alive(raw):
+                self._discard(raw, in_use=True)
+                continue
+
+            self._bump('reused')
+            return PooledConnection(self, raw)
+
+    def _reserve(self, deadline):
+        """Reserves a slot; returns an idle connection or (None, None) if a new one may be opened."""
+        with self._cond:
+            self._check_fork()
+            waited = False
+            while True:
+                stale = self._pop_stale_locked()
+                if stale:
+                    self._close_quietly(stale)
+
+                if self._idle:
+                    raw, last_used = self._idle.pop()
+                    self._mark_checkout_locked()
+                    return raw, last_used
+
+                if self._size < self.max_size:
+                    self._size += 1
+                    self._mark_checkout_locked()
+                    return None, None
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters['timeouts'] += 1
+                    raise PoolTimeoutError(
+                        f"No connection available within {self.checkout_timeout}s "
+                        f"(pool size {self.max_size})"
+                    )
+                if not waited:
+                    self._counters['waits'] += 1
+                    waited = True
+                self._cond.wait(remaining)
+
+    def _mark_checkout_locked(self):
+        self._in_use += 1
+        if self._in_use > self._counters['peak_in_use']:
+            self._counters['peak_in_use'] = self._in_use
+
+    # --- Checkin ---
+    def release(self, raw):
+        with self._cond:
+            if os.getpid() != self._pid:
+                return
+        try:
+            # Okuma yapan servisler commit etmiyor; açık kalan transaction'ı
+            # kapatmazsak bir sonraki kullanıcı eski snapshot'ı görür.
+            raw.rollback()
+        except Exception:
+            self._discard(raw, in_use=True)
+            return
+
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append((raw, time.monotonic()))
+            self._cond.notify()
+
+    # --- Maintenance ---
+    def _pop_stale_locked(self):
+        if self.max_idle_time is None:
+            return []
+        limit = time.monotonic() - self.max_idle_time
+        stale = []
+        # En eski bağlantılar solda duruyor
+        while self._idle and self._idle[0][1] < limit:
+            raw, _ = self._idle.popleft()
+            stale.append(raw)
+        self._size -= len(stale)
+        self._counters['evicted'] += len(stale)
+        return stale
+
+    def _check_fork(self):
+        # gunicorn gibi pre-fork sunucularda ebeveynin soketleri paylaşılmamalı
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._idle.clear()
+            self._size = 0
+            self._in_use = 0
+
+    def _is_alive(self, raw):
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, raw, in_use):
+        self._close_quietly([raw])
+        self._forget(in_use=in_use)
+        self._bump('discarded')
+
+    def _forget(self, in_use):
+        with self._cond:
+            self._size -= 1
+            if in_use:
+                self._in_use -= 1
+            self._cond.notify()
+
+    def _bump(self, counter):
+        with self._cond:
+            self._counters[counter] += 1
+
+    @staticmethod
+    def _close_quietly(connections):
+        for raw in connections:
+            try:
+                raw.close()
+            except Exception:
+                pass
+
+    def evict_idle(self):
+        """Closes idle connections that exceeded max_idle_time."""
+        with self._cond:
+            stale = self._pop_stale_locked()
+        self._close_quietly(stale)
+        return len(stale)
+
+    def close_all(self):
+        """Closes every idle connection; checked-out ones return to the pool as usual."""
+        with self._cond:
+            idle = [raw for raw, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+        self._close_quietly(idle)
+
+    def stats(self):
+        """Pool size metrics and lifetime counters."""
+        with self._cond:
+            return {
+                'max_size': self.max_size,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                **self._counters,
+            }
+
+
+# --- SQLite ---
+# MySQL sunucusu olmadan (testler, benchmark) servislerin aynen çalışabilmesi için.
+# Servisler pymysql'e göre yazıldığından SQLite bağlantısı onun arayüzünü taklit eder:
+#   - %s parametreleri ? olur, %% -> % (pymysql'in `query % args` davranışı gibi)
+#   - DictCursor/SSDictCursor istenirse satırlar dict, Cursor/SSCursor ise tuple döner;
+#     COUNT(*) satırı da aynı şekilde {'COUNT(*)': n} ya da (n,) olur (bkz. query_utils.read_count)
+#   - tamponlu cursor'lar (Cursor, DictCursor) sonucu execute sırasında okur, rowcount dolar;
+#     SS cursor'lar satırları fetch edildikçe okur
+#   - sqlite3 hataları aynı isimli pymysql.err sınıflarına çevrilir, `except pymysql.MySQLError` çalışır
+#   - DATE/TIMESTAMP/DATETIME/DECIMAL sütunları date/datetime/Decimal olarak okunur
+# SQL lehçesi farkları (FULLTEXT, ON DUPLICATE KEY UPDATE, LOAD DATA) kullanan modüllerde
+# db.backend'e bakılarak ele alınır.
+
+
+@functools.lru_cache(maxsize=1024)
+def sqlite_query(query):
+    """pymysql sorgusunu sqlite3 parametre stiline çevirir."""
+    return re.sub(r'%[s%]', lambda m: '?' if m.group() == '%s' else '%', query)
+
+
+def _convert(parse):
+    """Okunamayan değeri (ör. boş metin) olduğu gibi bırakan sqlite3 dönüştürücüsü."""
+    def convert(value):
+        text = value.decode('utf-8')
+        try:
+            return parse(text)
+        except (ValueError, decimal.InvalidOperation):
+            return text
+    return convert
+
+
+sqlite3.register_adapter(datetime.date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime.datetime, lambda value: value.isoformat(' '))
+sqlite3.register_adapter(decimal.Decimal, str)
+sqlite3.register_converter('DATE', _convert(lambda text: datetime.date.fromisoformat(text[:10])))
+sqlite3.register_converter('TIMESTAMP', _convert(datetime.datetime.fromisoformat))
+sqlite3.register_converter('DATETIME', _convert(datetime.datetime.fromisoformat))
+sqlite3.register_converter('DECIMAL', _convert(decimal.Decimal))
+
+
+def _mysql_error(e):
+    """sqlite3 hatasının pymysql karşılığı (IntegrityError -> pymysql.err.IntegrityError ...)."""
+    return getattr(pymysql.err, type(e).__name__, pymysql.err.DatabaseError)(str(e))
+
+
+def _dict_row(cursor, row):
+    return dict(zip([column[0] for column in cursor.description], row))
+
+
+class SQLiteCursor:
+    """pymysql cursor'ı gibi davranan sqlite3 cursor sarmalayıcısı."""
+
+    def __init__(self, conn, cursorclass):
+        self.connection = conn
+        # cached_fetchall satır tipini buna bakarak ayırır
+        self.dict_type = dict if issubclass(cursorclass, pymysql.cursors.DictCursorMixin) else None
+        self._buffered = not issubclass(cursorclass, pymysql.cursors.SSCursor)
+        self._cursor = conn.raw.cursor()
+        if self.dict_type is not None:
+            self._cursor.row_factory = _dict_row
+        self._rows = None
+        self.rowcount = -1
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def execute(self, query, args=None):
+        if args is not None:
+            query = sqlite_query(query)
+            if not isinstance(args, (list, tuple)):
+                args = (args,)
+        try:
+            self._cursor.execute(query, () if args is None else args)
+            self._rows = None
+            self.rowcount = self._cursor.rowcount
+            if self._buffered and self._cursor.description is not None:
+                # pymysql'in tamponlu cursor'ları gibi: tüm sonuç şimdi okunur
+                rows = self._cursor.fetchall()
+                self.rowcount = len(rows)
+                self._rows = iter(rows)
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+        return self.rowcount
+
+    def executemany(self, query, args):
+        try:
+            self._cursor.executemany(sqlite_query(query), args)
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+        self._rows = None
+        self.rowcount = self._cursor.rowcount
+        return self.rowcount
+
+    def fetchone(self):
+        if self._rows is not None:
+            return next(self._rows, None)
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size=None):
+        if self._rows is not None:
+            return list(itertools.islice(self._rows, size or self._cursor.arraysize))
+        return self._cursor.fetchmany(size or self._cursor.arraysize)
+
+    def fetchall(self):
+        if self._rows is not None:
+            return list(self._rows)
+        return self._cursor.fetchall()
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def close(self):
+        self._rows = None
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class SQLiteConnection:
+    """pymysql bağlantısı gibi davranan sqlite3 bağlantısı (havuz ve servisler için)."""
+
+    def __init__(self, raw, cursorclass=pymysql.cursors.DictCursor):
+        self.raw = raw
+        self.cursorclass = cursorclass
+
+    def cursor(self, cursor=None):
+        return SQLiteCursor(self, cursor or self.cursorclass)
+
+    def _call(self, method):
+        try:
+            return method()
+        except sqlite3.Error as e:
+            raise _mysql_error(e) from e
+
+    def commit(self):
+        self._call(self.raw.commit)
+
+    def rollback(self):
+        self._call(self.raw.rollback)
+
+    def close(self):
+        self._call(self.raw.close)
+
+    def ping(self, reconnect=False):
+        self._call(lambda: self.raw.execute("SELECT 1"))
+
+    def get_server_info(self):
+        return f"SQLite {sqlite3.sqlite_version}"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_statements(path):
+    """.sql dosyasını (yorumlar atılmış) tek tek ifadelere böler."""
+    with open(path, encoding='utf-8') as f:
+        lines = [line.split('--', 1)[0] for line in f]
+    return [statement.strip() for statement in ''.join(lines).split(';') if statement.strip()]
+
+
+def _sqlite_create_table(statement):
+    """
+    SQLite'ta FULLTEXT yoktur, CREATE TABLE içinde INDEX tanımlanamaz: FULLTEXT atılır,
+    INDEX satırları ayrı CREATE INDEX IF NOT EXISTS ifadelerine dönüşür.
+    """
+    statement = re.sub(r',\s*FULLTEXT INDEX [^)]*\)[^,)]*', '', statement)
+    match = re.match(r'CREATE TABLE IF NOT EXISTS (\w+)', statement)
+    if match is None:
+        return [statement]
+    indexes = re.findall(r',\s*INDEX (\w+) (\([^)]*\))', statement)
+    statement = re.sub(r',\s*INDEX \w+ \([^)]*\)', '', statement)
+    return [statement] + [f"CREATE INDEX IF NOT EXISTS {name} ON {match.group(1)} {columns}"
+                          for name, columns in indexes]
+
+
+_CONSTRAINTS = ('INDEX', 'FULLTEXT', 'PRIMARY', 'UNIQUE', 'KEY', 'FOREIGN', 'CONSTRAINT')
+
+
+@functools.lru_cache(maxsize=4)
+def schema_column_types(path=SCHEMA_PATH):
+    """
+    schema.sql'deki sütun tipleri: {tablo: {sütun: tip}}, ör. clubs.average_age -> 'DECIMAL(4, 1)'.
+    Sorgu sonucundan bağımsız sabit bir şema gereken yerler (ör. Parquet/Arrow dışa aktarımı) kullanır.
+    """
+    tables = {}
+    for statement in read_statements(path):
+        match = re.match(r'CREATE TABLE IF NOT EXISTS (\w+)\s*\((.*)\)\s*$', statement, re.DOTALL)
+        if match is None:
+            continue
+        columns = tables[match.group(1)] = {}
+        # Virgüller parantez içinde de geçer (DECIMAL(4, 1), INDEX (a, b)); sadece en dıştakiler ayırır
+        for item in re.split(r',(?![^(]*\))', match.group(2)):
+            parts = re.match(r'\s*(\w+)\s+(\w+(?:\s*\([^)]*\))?)', item)
+            if parts and parts.group(1).upper() not in _CONSTRAINTS:
+                columns[parts.group(1)] = parts.group(2).upper()
+    return tables
+
+
+def schema_statements(backend='mysql', server_info='', path=SCHEMA_PATH):
+    """
+    schema.sql'deki CREATE ifadeleri, arka uca göre uyarlanmış: SQLite'ta FULLTEXT
+    indeksi yoktur ve indeksler ayrı ifadelerle kurulur, MariaDB'de ngram parser'ı yoktur.
+    """
+    statements = read_statements(path)
+    if backend == 'sqlite':
+        return [converted for statement in statements for converted in _sqlite_create_table(statement)]
+    if 'mariadb' in server_info.lower():
+        # Indeks varsayılan parser ile kurulur
+        return [statement.replace(' WITH PARSER ngram', '') for statement in statements]
+    return statements
+
+
+def migration_files(directory=MIGRATIONS_DIR, backend=None):
+    """
+    [(sürüm, yol)] dosya adı sırasıyla; sürüm uzantısız dosya adıdır, ör. '002_secondary_indexes'.
+    'NNN_ad.mysql.sql' / 'NNN_ad.sqlite.sql' dosyaları sadece o arka uçta çalışır (SQL lehçesi
+    farklı olduğunda); backend verilirse diğer arka ucun dosyaları atlanır.
+    """
+    if not os.path.isdir(directory):
+        return []
+    files = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.sql'):
+            continue
+        version, _, target = name[:-len('.sql')].partition('.')
+        if target and backend is not None and target != backend:
+            continue
+        files.append((version, os.path.join(directory, name)))
+    return files
+
+
+_CREATE_INDEX = re.compile(r'CREATE\s+(?:(UNIQUE|FULLTEXT)\s+)?INDEX\s+(\w+)\s+ON\s+(\w+)\s*\(([^)]*)\)',
+                           re.IGNORECASE)
+_ADD_COLUMN = re.compile(r'ALTER\s+TABLE\s+(\w+)\s+ADD\s+COLUMN\s+(\w+)', re.IGNORECASE)
+_ADD_PRIMARY_KEY = re.compile(r'ALTER\s+TABLE\s+(\w+)\s.*\bADD\s+PRIMARY\s+KEY\b', re.IGNORECASE | re.DOTALL)
+_memory_ids = itertools.count(1)
+
+
 class Database:
-    def __init__(self):
+    """
+    backend 'mysql' (varsayılan) ya da 'sqlite'; verilmezse MONEYBALL_DB_BACKEND ve
+    MONEYBALL_SQLITE_PATH ortam değişkenlerinden okunur. sqlite_path ':memory:' ise
+    (varsayılan) süreç içi bir bellek veritabanı kullanılır.
+    """
+
+    def __init__(self, pool_size=10, max_idle_time=300, checkout_timeout=5.0,
+                 health_check_interval=30, backend=None, sqlite_path=None):
         self.host = 'localhost'
         self.user = 'root'
-        self.password = '' 
+        self.password = ''
         self.db = 'moneyball'
         self.charset = 'utf8mb4'
+        self._pool_options = dict(
+            max_size=pool_size,
+            max_idle_time=max_idle_time,
+            checkout_timeout=checkout_timeout,
+            health_check_interval=health_check_interval,
+        )
+        self.pool = None
+        self._players = None
+        self._players_lock = threading.Lock()
+        self._unique_keys = set()
+        # {(tablo, sütunlar): (var mı, okunma zamanı)}; bkz. has_fulltext_index
+        self._fulltext = {}
+        # services.instrumentation.Recorder; verilirse bağlantılar ölçülen cursor döndürür
+        self.recorder = None
+        self._memory_keeper = None
+        self.configure(backend or os.environ.get('MONEYBALL_DB_BACKEND', 'mysql'),
+                       sqlite_path or os.environ.get('MONEYBALL_SQLITE_PATH', ':memory:'))
 
-    def get_connection(self):
-        try:
-            connection = pymysql.connect(
+    def configure(self, backend='mysql', sqlite_path=':memory:', **params):
+        """
+        Arka ucu ya da bağlantı ayarlarını değiştirir, ör. db.configure('sqlite') ya da
+        db.configure('mysql', db='moneyball_bench'). `params` host, user, password, db, charset
+        olabilir. Havuz ve bellek içi player store yeniden kurulur; SQLite veritabanında
+        eksik tablolar schema.sql'den oluşturulur.
+        """
+        backend = backend.lower()
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown database backend: {backend} (expected one of {', '.join(BACKENDS)})")
+        for name, value in params.items():
+            if name not in ('host', 'user', 'password', 'db', 'charset'):
+                raise TypeError(f"Unknown connection setting: {name}")
+            setattr(self, name, value)
+
+        if self.pool is not None:
+            self.pool.close_all()
+        if self._memory_keeper is not None:
+            self._memory_keeper.close()
+            self._memory_keeper = None
+
+        self.backend = backend
+        self.sqlite_path = sqlite_path
+        self._sqlite_uri = None
+        if backend == 'sqlite' and sqlite_path == ':memory:':
+            # Havuzdaki bağlantıların hepsi aynı veritabanını görsün diye memdb VFS'te adlandırılmış
+            # bir bellek veritabanı (SQLite 3.36+). Shared-cache yerine bu kullanılır: shared-cache'te
+            # eşzamanlı yazan bağlantılar beklemeden "database table is locked" hatası alır.
+            # Son bağlantı kapanınca veritabanı silinir, bu yüzden biri hep açık tutulur.
+            self._sqlite_uri = f"file:/moneyball-{os.getpid()}-{next(_memory_ids)}?vfs=memdb"
+            self._memory_keeper = self._sqlite_connect()
+
+        # Eski bağlantılar eski havuza döner, yeni ayarlarla karışmaz
+        self.pool = ConnectionPool(self._connect, **self._pool_options)
+        with self._players_lock:
+            self._players = None
+        self._unique_keys.clear()
+        self._fulltext.clear()
+        # Önbellek anahtarları veritabanına göre ayrılır: aynı önbellek dosyasını paylaşan
+        # başka bir veritabanının sonuçları okunmaz
+        from services.cache import result_cache
+        result_cache.namespace = self.identity
+
+        if backend == 'sqlite':
+            self.create_schema()
+
+    @property
+    def identity(self):
+        """Bağlanılan veritabanını tanımlayan metin (önbellek anahtarları için)."""
+        if self.backend == 'sqlite':
+            return f"sqlite:{self._sqlite_uri or os.path.abspath(self.sqlite_path)}"
+        return f"mysql://{self.user}@{self.host}/{self.db}"
+
+    @property
+    def supports_fulltext(self):
+        """MATCH ... AGAINST kullanılabilir mi (bkz. services/search.py)."""
+        return self.backend == 'mysql'
+
+    def _connect(self):
+        return self.connect()
+
+    def _sqlite_connect(self):
+        options = dict(detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False, timeout=30)
+        if self._sqlite_uri is not None:
+            return sqlite3.connect(self._sqlite_uri, uri=True, **options)
+        raw = sqlite3.connect(self.sqlite_path, **options)
+        # Okuyucular yazanı beklemesin (importer tabloları paralel yazar)
+        raw.execute("PRAGMA journal_mode = WAL")
+        raw.execute("PRAGMA synchronous = NORMAL")
+        return raw
+
+    def connect(self, record=False, **options):
+        """
+        Havuzdan bağımsız yeni bir bağlantı açar (toplu içe aktarma gibi uzun işler
+        havuzdaki bağlantıları meşgul etmesin diye). `options` pymysql.connect'e
+        iletilir, ör. local_infile=True. SQLite'ta yalnızca cursorclass kullanılır.
+        record=True ise ölçüm açıkken (db.recorder) sorgular get_connection()'daki gibi kaydedilir.
+        """
+        if self.backend == 'sqlite':
+            try:
+                raw = self._sqlite_connect()
+            except sqlite3.Error as e:
+                raise _mysql_error(e) from e
+            conn = SQLiteConnection(raw, options.get('cursorclass', pymysql.cursors.DictCursor))
+        else:
+            params = dict(
                 host=self.host,
                 user=self.user,
                 password=self.password,
@@ -17,8 +617,233 @@ class Database:
                 charset=self.charset,
                 cursorclass=pymysql.cursors.DictCursor
             )
-            return connection
-        except pymysql.MySQLError as e:
+            params.update(options)
+            conn = pymysql.connect(**params)
+        if record and self.recorder is not None:
+            return self.recorder.wrap_connection(conn)
+        return conn
+
+    def create_schema(self):
+        """schema.sql'deki tabloları (yoksa) oluşturur."""
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            for statement in schema_statements(self.backend, conn.get_server_info()):
+                cursor.execute(statement)
+            conn.commit()
+        finally:
+            conn.close()
+
+    # --- Migration ---
+    def applied_migrations(self):
+        """Uygulanmış migration sürümleri (schema_migrations yoksa oluşturulur)."""
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(MIGRATIONS_TABLE)
+            cursor.execute("SELECT version FROM schema_migrations")
+            versions = {row['version'] for row in cursor.fetchall()}
+            conn.commit()
+            return versions
+        finally:
+            conn.close()
+
+    def migrate(self, dry_run=False, directory=MIGRATIONS_DIR):
+        """
+        Uygulanmamış migration dosyalarını sırayla uygular ve schema_migrations'a yazar;
+        [(sürüm, [çalıştırılan ifadeler])] döndürür. Zaten var olan indeksler (schema.sql ile
+        kurulmuş ya da elle eklenmiş) atlanır. MySQL'de DDL kendi commit'ini yaptığından yarıda
+        kalan bir dosya geri alınamaz; tekrar çalıştırıldığında kurulmuş indeksler atlanır.
+        """
+        applied = self.applied_migrations()
+        results = []
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            server_info = conn.get_server_info()
+            for version, path in migration_files(directory, self.backend):
+                if version in applied:
+                    continue
+                executed = []
+                for statement in read_statements(path):
+                    statement = self._migration_statement(cursor, statement, server_info)
+                    if statement is None:
+                        continue
+                    executed.append(statement)
+                    if not dry_run:
+                        cursor.execute(statement)
+                if not dry_run:
+                    cursor.execute("INSERT INTO schema_migrations (version, applied_at) VALUES (%s, %s)",
+                                   (version, datetime.datetime.now().replace(microsecond=0)))
+                    conn.commit()
+                results.append((version, executed))
+        finally:
+            conn.close()
+            self._unique_keys.clear()
+            self._fulltext.clear()
+        return results
+
+    def _migration_statement(self, cursor, statement, server_info):
+        """
+        İfadenin bu arka uçta çalışacak hali; gereksizse None: indeks ya da sütun zaten var,
+        tabloda birincil anahtar zaten var, benzersiz indeksin sütunları zaten benzersiz,
+        arka uçta FULLTEXT yok. Böylece schema.sql ile kurulmuş bir veritabanında da çalışır.
+        """
+        match = _ADD_COLUMN.match(statement)
+        if match is not None:
+            return None if self._column_exists(cursor, *match.groups()) else statement
+        match = _ADD_PRIMARY_KEY.match(statement)
+        if match is not None:
+            return None if 'PRIMARY' in self._read_unique_keys(cursor, match.group(1)) else statement
+        match = _CREATE_INDEX.match(statement)
+        if match is None:
+            return statement
+        kind, index_name, table_name, columns = match.groups()
+        kind = (kind or '').upper()
+        if kind == 'FULLTEXT':
+            if not self.supports_fulltext:
+                return None
+            if 'mariadb' in server_info.lower():
+                statement = statement.replace(' WITH PARSER ngram', '')
+        if self._index_exists(cursor, table_name, index_name):
+            return None
+        if kind == 'UNIQUE':
+            wanted = {col.strip() for col in columns.split(',')}
+            if any(set(key) == wanted for key in self._read_unique_keys(cursor, table_name).values()):
+                return None
+        return statement
+
+    def _column_exists(self, cursor, table_name, column_name):
+        if self.backend == 'sqlite':
+            cursor.execute("SELECT COUNT(*) AS n FROM pragma_table_info(%s) WHERE name = %s",
+                           (table_name, column_name))
+        else:
+            cursor.execute("SELECT COUNT(*) AS n FROM information_schema.columns"
+                           " WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s",
+                           (table_name, column_name))
+        return cursor.fetchone()['n'] > 0
+
+    def _read_unique_keys(self, cursor, table_name):
+        """{indeks adı: (sütunlar)}; birincil anahtar 'PRIMARY' adıyla."""
+        keys = {}
+        if self.backend == 'sqlite':
+            # INTEGER PRIMARY KEY (rowid) için indeks yoktur, birincil anahtar table_info'dan okunur
+            cursor.execute("SELECT name FROM pragma_table_info(%s) WHERE pk > 0 ORDER BY pk", (table_name,))
+            primary_key = tuple(row['name'] for row in cursor.fetchall())
+            if primary_key:
+                keys['PRIMARY'] = primary_key
+            cursor.execute("SELECT name FROM pragma_index_list(%s) WHERE \"unique\" = 1 AND origin != 'pk'",
+                           (table_name,))
+            for index_name in [row['name'] for row in cursor.fetchall()]:
+                cursor.execute("SELECT name FROM pragma_index_info(%s) ORDER BY seqno", (index_name,))
+                keys[index_name] = tuple(row['name'] for row in cursor.fetchall())
+            return keys
+        cursor.execute("SELECT index_name AS name, column_name AS col FROM information_schema.statistics"
+                       " WHERE table_schema = DATABASE() AND table_name = %s AND non_unique = 0"
+                       " ORDER BY index_name, seq_in_index", (table_name,))
+        for row in cursor.fetchall():
+            keys[row['name']] = keys.get(row['name'], ()) + (row['col'],)
+        return keys
+
+    def unique_keys(self, table_name):
+        """Tablonun birincil anahtarı ve benzersiz indeksleri: {indeks adı: (sütunlar)}."""
+        conn = self.connect()
+        try:
+            return self._read_unique_keys(conn.cursor(), table_name)
+        finally:
+            conn.close()
+
+    def has_unique_key(self, table_name, columns):
+        """
+        `columns` tabloda birincil anahtar ya da benzersiz indeks mi? Upsert (ON DUPLICATE KEY /
+        ON CONFLICT) ve senkron ancak öyleyse satırı günceller, yoksa sessizce yeni satır ekler.
+        Olumlu sonuç saklanır (configure/migrate sıfırlar); olumsuz sonuç her seferinde
+        yeniden okunur, başka bir süreçte uygulanan migration hemen görülür.
+        """
+        wanted = frozenset(columns)
+        if (table_name, wanted) in self._unique_keys:
+            return True
+        found = any(set(key) == wanted for key in self.unique_keys(table_name).values())
+        if found:
+            self._unique_keys.add((table_name, wanted))
+        return found
+
+    def fulltext_indexes(self, table_name):
+        """Tablonun FULLTEXT indeksleri: {indeks adı: (sütunlar)}. FULLTEXT'i olmayan arka uçta boş."""
+        if not self.supports_fulltext:
+            return {}
+        conn = self.connect()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT index_name AS name, column_name AS col FROM information_schema.statistics"
+                           " WHERE table_schema = DATABASE() AND table_name = %s AND index_type = 'FULLTEXT'"
+                           " ORDER BY index_name, seq_in_index", (table_name,))
+            indexes = {}
+            for row in cursor.fetchall():
+                indexes[row['name']] = indexes.get(row['name'], ()) + (row['col'],)
+            return indexes
+        finally:
+            conn.close()
+
+    def has_fulltext_index(self, table_name, columns):
+        """
+        `columns` için bir FULLTEXT indeksi var mı? MATCH() sütun listesi bir indeksle birebir
+        örtüşmezse MySQL hata verir; yoksa arama LIKE'a döner (bkz. services/search.py).
+        Olumlu sonuç configure/migrate'e kadar saklanır; olumsuz sonuç her aramada
+        information_schema'ya gitmemek için FULLTEXT_CHECK_INTERVAL saniye saklanır.
+        """
+        if not table_name or not self.supports_fulltext:
+            return False
+        key = (table_name, frozenset(columns))
+        cached = self._fulltext.get(key)
+        now = time.monotonic()
+        if cached is not None and (cached[0] or now - cached[1] < FULLTEXT_CHECK_INTERVAL):
+            return cached[0]
+        try:
+            found = any(set(index) == key[1] for index in self.fulltext_indexes(table_name).values())
+        except Exception as e:
+            print(f"Error (has_fulltext_index): {e}")
+            return False
+        self._fulltext[key] = (found, now)
+        return found
+
+    def _index_exists(self, cursor, table_name, index_name):
+        if self.backend == 'sqlite':
+            cursor.execute("SELECT COUNT(*) AS n FROM sqlite_master WHERE type = 'index' AND name = %s",
+                           (index_name,))
+        else:
+            cursor.execute("SELECT COUNT(*) AS n FROM information_schema.statistics"
+                           " WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+                           (table_name, index_name))
+        return cursor.fetchone()['n'] > 0
+
+    def get_connection(self):
+        """
+        Havuzdan bir bağlantı döndürür. Servisler her zamanki gibi conn.close()
+        çağırır; bağlantı kapanmaz, havuza geri döner.
+        """
+        started = time.perf_counter()
+        try:
+            conn = self.pool.acquire()
+        except (pymysql.MySQLError, PoolTimeoutError) as e:
             print(f"Veritabanı bağlantı hatası: {e}")
             return None
-db = Database()
\ No newline at end of file
+        if self.recorder is not None:
+            return self.recorder.wrap_connection(conn, time.perf_counter() - started)
+        return conn
+
+    def pool_stats(self):
+        return self.pool.stats()
+
+    @property
+    def players(self):
+        """players tablosunun bellek içi, sütunlu kopyası (bkz. services/player_store.py)."""
+        if self._players is None:
+            with self._players_lock:
+                if self._players is None:
+                    from services.player_store import PlayerStore
+                    self._players = PlayerStore(self)
+        return self._players
+
+
+db = Database()
@@ -1,5 +1,11 @@
+from Models.SlotModel import SlotModel
+
+
+class Appearances(SlotModel):
+    __slots__ = ('appearance_id', 'game_id', 'player_id', 'player_club_id',
+                 'player_current_club_id', 'date', 'player_name', 'competition_id',
+                 'yellow_cards', 'red_cards', 'assists', 'minutes_played')
 
-class Appearances:
     def __init__(self,appearance_id,game_id,player_id,player_club_id,player_current_club_id,date,player_name,competition_id,yellow_cards,red_cards,assists,minutes_played):
         self.appearance_id = appearance_id
         self.game_id = game_id
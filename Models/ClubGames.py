@@ -1,4 +1,11 @@
-class ClubGames:
+from Models.SlotModel import SlotModel
+
+
+class ClubGames(SlotModel):
+    __slots__ = ('game_id', 'club_id', 'own_goals', 'own_position', 'own_manager_name',
+                 'opponent_id', 'opponent_goals', 'opponent_position',
+                 'opponent_manager_name', 'hosting', 'is_win')
+
     def __init__(
         self,
         game_id,
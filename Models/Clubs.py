@@ -1,4 +1,13 @@
-class Clubs:
+from Models.SlotModel import SlotModel
+
+
+class Clubs(SlotModel):
+    __slots__ = ('club_id', 'club_code', 'name', 'domestic_competition_id',
+                 'total_market_value', 'squad_size', 'average_age', 'foreigners_number',
+                 'foreigners_percentage', 'national_team_players', 'stadium_name',
+                 'stadium_seats', 'net_transfer_record', 'coach_name', 'last_season',
+                 'url')
+
     def __init__(
         self,
         club_id,
@@ -1,4 +1,11 @@
-class Competitions:
+from Models.SlotModel import SlotModel
+
+
+class Competitions(SlotModel):
+    __slots__ = ('competition_id', 'competition_code', 'name', 'sub_type', 'type',
+                 'country_id', 'country_name', 'domestic_league_code', 'confederation',
+                 'url')
+
     def __init__(self, competition_id, competition_code, name, sub_type, type,
                  country_id, country_name, domestic_league_code, confederation, url):
         self.competition_id = competition_id
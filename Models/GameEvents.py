@@ -1,8 +1,13 @@
-import csv
+from Models.SlotModel import SlotModel
+
+
+class GameEvents(SlotModel):
+    __slots__ = ('game_event_id', 'game_id', 'minute', 'type', 'club_id', 'player_id',
+                 'description', 'player_in_id')
 
-class GameEvents:
     def __init__(
         self,
+        game_event_id,
         game_id,
         minute,
         type,
@@ -11,6 +16,7 @@ class GameEvents:
         description,
         player_in_id
     ):
+        self.game_event_id = game_event_id
         self.game_id = game_id
         self.minute = minute
         self.type = type
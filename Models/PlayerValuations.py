@@ -1,4 +1,11 @@
-class PlayerValuations:
+from Models.SlotModel import SlotModel
+
+
+class PlayerValuations(SlotModel):
+    __slots__ = ('player_id', 'last_season', 'datetime', 'date', 'dateweek',
+                 'market_value_in_eur', 'n', 'current_club_id',
+                 'player_club_domestic_competition_id')
+
     def __init__(self, player_id, last_season, datetime, date, dateweek,
                  market_value_in_eur, n, current_club_id,
                  player_club_domestic_competition_id):
@@ -3,7 +3,18 @@
 # Description: Python class representation of the "Players" table for the Moneyball project.
 #              Each instance of this class represents a single player and their attributes.
 
-class Players:
+from Models.SlotModel import SlotModel
+
+
+class Players(SlotModel):
+    __slots__ = ('player_id', 'first_name', 'last_name', 'name', 'last_season',
+                 'current_club_id', 'player_code', 'country_of_birth', 'city_of_birth',
+                 'country_of_citizenship', 'date_of_birth', 'sub_position', 'position',
+                 'foot', 'height_in_cm', 'market_value_in_eur',
+                 'highest_market_value_in_eur', 'contract_expiration_date',
+                 'agent_name', 'image_url', 'url',
+                 'current_club_domestic_competition_id', 'current_club_name')
+
     def __init__(self, player_id, first_name, last_name, name, last_season,
                  current_club_id, player_code, country_of_birth, city_of_birth,
                  country_of_citizenship, date_of_birth, sub_position, position,
@@ -37,5 +48,5 @@ class Players:
         self.current_club_domestic_competition_id = current_club_domestic_competition_id
         self.current_club_name = current_club_name
 
-def __repr__(self):
-    return f"<Player {self.player_id} - {self.name}>"
+    def __repr__(self):
+        return f"<Player {self.player_id} - {self.name}>"
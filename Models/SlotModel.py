@@ -0,0 +1,34 @@
+# File: Models/SlotModel.py
+# Description: Common base class for the Moneyball models.
+#              Models declare their fields in __slots__ (in table column order), so
+#              instances carry no per-instance __dict__. Rows from a tuple cursor are
+#              turned into objects with Model.from_row(row) without building a dict first.
+
+class SlotModel:
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, row):
+        """Builds an instance from a tuple row whose values follow __slots__ order."""
+        return cls(*row)
+
+    @classmethod
+    def from_rows(cls, rows):
+        return [cls(*row) for row in rows]
+
+    def as_dict(self):
+        """Plain dict copy of the fields (for templates / JSON)."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    # Mapping-like read access so templates can use row['col'] and dict(obj) works
+    def keys(self):
+        return self.__slots__
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {getattr(self, self.__slots__[0])}>"
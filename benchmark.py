@@ -0,0 +1,126 @@
+# File: benchmark.py
+# Description: Reproducible benchmark of the service layer and the Flask routes.
+#              Generates Transfermarkt-shaped synthetic data (benchmarks/datagen.py),
+#              loads it into a separate MySQL/MariaDB database (default: moneyball_bench,
+#              connection settings from Database.py) or, with --backend sqlite, into an
+#              in-process SQLite database, times every case in benchmarks/cases.py and
+#              writes the timings to JSON.
+#
+# Usage:
+#   python benchmark.py --scale 10k                         # generate, load, run -> benchmarks/results/
+#   python benchmark.py --scale 1m --skip-load --repeat 10  # reuse the already loaded database
+#   python benchmark.py --scale 10k --groups deep search    # only deep pages and searches
+#   python benchmark.py --scale 10k --match players.        # cases whose name contains "players."
+#   python benchmark.py --scale 10k --compare benchmarks/results/before.json
+#   python benchmark.py --generate-only --scale 10m         # only write the CSV files
+#   python benchmark.py --scale 10k --backend sqlite        # no MySQL server needed (in-memory SQLite)
+#   python benchmark.py --scale 1m --backend sqlite --sqlite-path bench.sqlite3
+#   python benchmark.py --scale 10k --explain                # EXPLAIN every service query, no timing
+#
+# Without --skip-load the benchmark tables are emptied (TRUNCATE) and reloaded;
+# never point --database or --sqlite-path at the application's database.
+# SQLite timings are not comparable with MySQL ones (no FULLTEXT: searches use LIKE).
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.datagen import SCALES, Scale, data_dir, generate
+from importer.loader import print_summary
+
+GROUPS = ('read', 'search', 'deep', 'write', 'route')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the services and routes on synthetic data.")
+    parser.add_argument('--scale', choices=list(SCALES), default='10k', help="total generated rows (default: 10k)")
+    parser.add_argument('--database', default='moneyball_bench',
+                        help="database to load and benchmark (default: moneyball_bench)")
+    parser.add_argument('--backend', choices=('mysql', 'sqlite'), default='mysql', help="database backend (default: mysql)")
+    parser.add_argument('--sqlite-path', default=':memory:',
+                        help="with --backend sqlite, database file (default: :memory:)")
+    parser.add_argument('--data-dir', help="where the CSV files are generated (default: benchmarks/data/<scale>)")
+    parser.add_argument('--seed', type=int, default=42, help="data generator seed (default: 42)")
+    parser.add_argument('--regenerate', action='store_true', help="regenerate the CSV files even if they exist")
+    parser.add_argument('--generate-only', action='store_true', help="generate the CSV files and exit")
+    parser.add_argument('--skip-load', action='store_true', help="benchmark the data already in --database")
+    parser.add_argument('--method', choices=('executemany', 'load-data'), default='executemany',
+                        help="importer method used to load the data (default: executemany)")
+    parser.add_argument('--groups', nargs='+', choices=GROUPS, help="case groups to run (default: all)")
+    parser.add_argument('--match', help="only cases whose name contains this text")
+    parser.add_argument('--repeat', type=int, default=5, help="timed calls per case (default: 5)")
+    parser.add_argument('--warmup', type=int, default=1, help="untimed calls before timing (default: 1)")
+    parser.add_argument('--keep-cache', action='store_true',
+                        help="do not clear the result cache between calls (measures cached reads)")
+    parser.add_argument('--bulk-rows', type=int, default=1000, help="rows per insert_many/upsert_many case")
+    parser.add_argument('--explain', action='store_true',
+                        help="EXPLAIN the queries of the read cases instead of timing them (see benchmarks/explain.py)")
+    parser.add_argument('-o', '--output',
+                        help="result file (default: benchmarks/results/<scale>-<timestamp>.json)")
+    parser.add_argument('--compare', metavar='BASELINE', help="compare the results with an earlier result file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.skip_load and args.backend == 'sqlite' and args.sqlite_path == ':memory:':
+        print("--skip-load needs --sqlite-path: an in-memory database starts empty")
+        return 2
+    csv_dir = args.data_dir or data_dir(args.scale)
+    started = time.monotonic()
+    counts = generate(args.scale, csv_dir, seed=args.seed, force=args.regenerate)
+    print(f"Data ({args.scale}, {sum(counts.values()):,} rows) in {csv_dir} ({time.monotonic() - started:.1f}s)")
+    if args.generate_only:
+        return 0
+
+    # Uygulama modülleri bağlantı açmadan önce veritabanı değiştirilir
+    from Database import db
+    if args.backend == 'sqlite':
+        db.configure('sqlite', sqlite_path=args.sqlite_path)
+    else:
+        db.configure('mysql', db=args.database)
+    from benchmarks import cases as bench_cases
+    from benchmarks import runner
+    from main import TABLE_REGISTRY, app
+
+    if not args.skip_load:
+        runner.prepare_database(args.database)
+        results, elapsed = runner.load_scale(csv_dir, method=args.method)
+        print_summary(results, elapsed)
+
+    if args.explain:
+        from benchmarks import explain
+        cases = bench_cases.build_cases(args.scale, app, TABLE_REGISTRY, None, groups=('read', 'search', 'deep'))
+        cases = [case for case in cases if case.covers != 'export.export_to_file']
+        if args.match:
+            cases = [case for case in cases if args.match in case.name]
+        report = explain.check(explain.capture(cases))
+        explain.print_report(report)
+        return 0 if all(entry['status'] != 'scan' for entry in report) else 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = bench_cases.build_cases(args.scale, app, TABLE_REGISTRY, os.path.join(tmp, 'export.csv'),
+                                        groups=args.groups, bulk_rows=args.bulk_rows)
+        uncovered = bench_cases.uncovered_functions(cases)
+        if args.match:
+            cases = [case for case in cases if args.match in case.name]
+        results = runner.run_cases(cases, repeat=args.repeat, warmup=args.warmup, keep_cache=args.keep_cache)
+
+    meta = runner.run_metadata(args.scale, Scale(args.scale).counts(), args.repeat, args.warmup, args.keep_cache)
+    output = args.output or os.path.join('benchmarks', 'results', f"{args.scale}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    runner.write_results(output, meta, results, uncovered)
+    print(f"Results written to {output}")
+    if uncovered and not args.groups and not args.match:
+        print(f"Service functions without a benchmark case: {', '.join(uncovered)}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        runner.print_comparison(runner.compare_results(baseline, {'results': results}))
+    return 0 if all('error' not in entry for entry in results.values()) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
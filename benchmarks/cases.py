@@ -0,0 +1,441 @@
+# File: benchmarks/cases.py
+# Description: What the benchmark times. Every public function of the table services
+#              and every Flask route gets at least one case; reads are timed on a
+#              first page, a deep page (OFFSET and keyset cursor) and with searches
+#              (FULLTEXT text, prefix and number terms). Ids and search terms come from
+#              benchmarks.datagen.Scale, so the same cases hit the same rows on every run.
+#              Write cases insert/update/delete rows with ids above the generated range
+#              and clean up after themselves (setup/teardown are not timed).
+#              uncovered_functions() lists service functions without a case, so a new
+#              service function shows up in the results instead of silently going untimed.
+
+import inspect
+from collections import namedtuple
+
+from Database import db
+from benchmarks.datagen import LAST_SEASON, Scale
+from services import appearances, club_games, clubs, competitions, game_events, games, players
+from services import playervaluations
+from services.export import export_to_file
+from services.pagination import encode_cursor, keyset_columns, row_key
+
+SERVICE_MODULES = [players, clubs, competitions, games, club_games, appearances, game_events, playervaluations]
+
+PER_PAGE = 50
+# Oyuncunun ortadaki piyasa değeri kaydı (datagen: oyuncu başına VALUATIONS_PER_PLAYER kayıt)
+VALUATION_INDEX = 7
+
+# group: 'read' | 'search' | 'deep' | 'write' | 'route'
+Case = namedtuple('Case', ['group', 'name', 'run', 'setup', 'teardown', 'covers'])
+
+
+def case(group, name, run, setup=None, teardown=None, covers=None):
+    """`covers`: case'in ölçtüğü servis fonksiyonu ('players.get_player'); yoksa run'dan çıkarılır."""
+    if covers is None and inspect.isfunction(run) and run.__module__.startswith('services.'):
+        covers = f"{run.__module__.split('.')[-1]}.{run.__name__}"
+    return Case(group, name, run, setup, teardown, covers)
+
+
+def _call(func, *args, **kwargs):
+    def run():
+        return func(*args, **kwargs)
+    run.__module__, run.__name__ = func.__module__, func.__name__
+    return run
+
+
+def _execute(query, params=()):
+    """Kurulum/temizlik için doğrudan SQL (zamanlanmaz)."""
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def _deep_page(total_rows):
+    """Tablonun ortasındaki sayfa: OFFSET'in en pahalı olduğu tipik derinlik."""
+    return max(1, (total_rows // PER_PAGE) // 2)
+
+
+def _cursor_at(keyset, page, sort_by, primary_key, keyset_kwargs):
+    """`page`. sayfanın başlangıcına ait cursor (OFFSET ile bir kez, zamanlamadan önce)."""
+    rows, _, _ = keyset(PER_PAGE, "", None, None, page, columns=keyset_columns(sort_by, primary_key), **keyset_kwargs)
+    if not rows:
+        return None
+    return encode_cursor(sort_by, row_key(rows[0], keyset_columns(sort_by, primary_key)))
+
+
+# --- Okuma ---
+def _table_reads(name, module, total, get_one, search_terms, page_func, total_func, keyset=None,
+                 sort_by=None, keyset_kwargs=None, keyset_total=None):
+    """Bir tablonun sayfalama/sayım/arama case'leri."""
+    deep = _deep_page(total)
+    last = max(1, -(-total // PER_PAGE))
+    cases = [
+        case('read', f"{name}.get_one", get_one),
+        case('read', f"{name}.page_1", _call(page_func, 1, PER_PAGE)),
+        case('deep', f"{name}.page_deep_offset", _call(page_func, deep, PER_PAGE)),
+        case('deep', f"{name}.page_last_offset", _call(page_func, last, PER_PAGE)),
+        case('read', f"{name}.count", _call(total_func)),
+    ]
+    for kind, term in search_terms.items():
+        cases.append(case('search', f"{name}.search_{kind}", _call(page_func, 1, PER_PAGE, term)))
+        cases.append(case('search', f"{name}.count_{kind}", _call(total_func, term)))
+    if keyset is not None:
+        keyset_kwargs = keyset_kwargs or {}
+        # Sayfaların sıralama anahtarı (game_events'te birincil anahtardan farklı)
+        cursor = _cursor_at(keyset, deep, sort_by, getattr(module, 'SORT_KEY', module.PRIMARY_KEY), keyset_kwargs)
+        cases += [
+            case('read', f"{name}.keyset_1", _call(keyset, PER_PAGE, **keyset_kwargs)),
+            case('deep', f"{name}.keyset_deep_offset", _call(keyset, PER_PAGE, page=deep, **keyset_kwargs)),
+            case('deep', f"{name}.keyset_deep_cursor", _call(keyset, PER_PAGE, after=cursor, **keyset_kwargs)),
+        ]
+    if keyset_total is not None:
+        # show_table'ın yolu: cursor'lu sayfa + toplam sayı tek bağlantıda
+        cases.append(case('deep', f"{name}.keyset_deep_cursor_with_total",
+                          _call(keyset_total, PER_PAGE, after=cursor, **keyset_kwargs)))
+    return cases
+
+
+def read_cases(scale):
+    counts = scale.counts()
+    player_id = scale.players // 2
+    game_id = scale.games // 2
+    club_id = scale.clubs // 2
+    home, away = scale.game_clubs(game_id)
+    first, last = scale.player_name(player_id)
+    league = scale.club_league(club_id)[0]
+    valuation_day = scale.valuation_dates(player_id)[VALUATION_INDEX]
+
+    cases = []
+    cases += _table_reads(
+        'players', players, counts['players'], _call(players.get_player, player_id),
+        {'text': last, 'number': str(player_id)},
+        players.get_all_players_with_total, players.get_total_player_count,
+    )
+    cases += [
+        case('read', 'players.get_all_players', _call(players.get_all_players, 1, PER_PAGE)),
+        case('read', 'players.get_top_players', _call(players.get_top_players, 10)),
+        case('read', 'players.get_top_players_filtered',
+             _call(players.get_top_players, 10, 'peak_value', 'Attack', league)),
+        case('read', 'players.find_players',
+             _call(players.find_players, foot='left', position='Defender', competition_id=league)),
+        case('read', 'players.find_players_any', _call(players.find_players, 'any', country=['Brazil', 'Spain'])),
+        case('read', 'players.get_players_by_position', _call(players.get_players_by_position, 'Midfield')),
+        case('read', 'players.get_players_by_age_range', _call(players.get_players_by_age_range, 21, 25)),
+        case('read', 'players.get_players_older_than', _call(players.get_players_older_than, 35)),
+        case('read', 'players.get_players_younger_than', _call(players.get_players_younger_than, 21)),
+        case('read', 'players.get_undervalued_players', _call(players.get_undervalued_players, 0.3)),
+        case('read', 'players.screen_undervalued_players',
+             _call(players.screen_undervalued_players, 0.5, min_age=20, max_age=30,
+                   contract_expires_before=f"{LAST_SEASON + 3}-01-01")),
+        case('read', 'players.get_players_by_country', _call(players.get_players_by_country, 'Germany')),
+        case('read', 'players.get_players_by_foot', _call(players.get_players_by_foot, 'both')),
+    ]
+
+    cases += _table_reads(
+        'clubs', clubs, counts['clubs'], _call(clubs.get_club, club_id),
+        {'text': 'Istanbul', 'prefix': league},
+        clubs.get_all_clubs_with_total, clubs.get_total_club_count,
+    )
+    cases += [
+        case('read', 'clubs.get_all_clubs', _call(clubs.get_all_clubs, 1, PER_PAGE)),
+        case('read', 'clubs.search_clubs_by_competition', _call(clubs.search_clubs_by_competition, league)),
+    ]
+
+    cases += _table_reads(
+        'competitions', competitions, counts['competitions'], _call(competitions.get_competition, league),
+        {'text': 'liga', 'prefix': 'GB'},
+        competitions.get_all_competitions_with_total, competitions.get_total_competition_count,
+    )
+    cases += [
+        case('read', 'competitions.get_all_competitions', _call(competitions.get_all_competitions, 1, PER_PAGE)),
+        case('read', 'competitions.get_competition_total_market_value',
+             _call(competitions.get_competition_total_market_value, league)),
+    ]
+
+    cases += _table_reads(
+        'games', games, counts['games'], _call(games.get_game, game_id),
+        {'text': scale.club_name(home), 'prefix': league},
+        games.get_all_games_with_total, games.get_total_game_count,
+        keyset=games.get_all_games_keyset, keyset_total=games.get_all_games_keyset_with_total,
+        sort_by='date', keyset_kwargs={'sort_by': 'date'},
+    )
+    cases += [
+        case('read', 'games.get_all_games', _call(games.get_all_games, 1, PER_PAGE)),
+        case('read', 'games.search_games_by_club', _call(games.search_games_by_club, club_id)),
+    ]
+
+    cases += _table_reads(
+        'club_games', club_games, counts['club_games'], _call(club_games.get_club_game, game_id, home),
+        {'text': first, 'prefix': 'Away', 'number': str(away)},
+        club_games.get_all_club_games_with_total, club_games.get_total_club_game_count,
+    )
+    cases += [
+        case('read', 'club_games.get_all_club_games', _call(club_games.get_all_club_games, 1, PER_PAGE)),
+        case('read', 'club_games.search_all_club_games_by_club',
+             _call(club_games.search_all_club_games_by_club, club_id)),
+    ]
+
+    cases += _table_reads(
+        'appearances', appearances, counts['appearances'],
+        _call(appearances.get_appearance, f"{game_id}_{scale.game_players(game_id)[0]}"),
+        {'text': last, 'prefix': f"{game_id}_"},
+        appearances.get_all_appearances_with_total, appearances.get_total_appearance_count,
+        keyset=appearances.get_all_appearances_keyset, keyset_total=appearances.get_all_appearances_keyset_with_total,
+        sort_by='player_name',
+    )
+    cases += [
+        case('read', 'appearances.get_all_appearances', _call(appearances.get_all_appearances, 1, PER_PAGE)),
+        case('read', 'appearances.search_appearances_by_player',
+             _call(appearances.search_appearances_by_player, player_id)),
+    ]
+
+    cases += _table_reads(
+        'game_events', game_events, counts['game_events'],
+        _call(game_events.get_event, scale.event_id(game_id, 0)),
+        {'text': last, 'prefix': 'Subst'},
+        game_events.get_all_events_with_total, game_events.get_total_event_count,
+        keyset=game_events.get_all_events_keyset, keyset_total=game_events.get_all_events_keyset_with_total,
+        sort_by='game_id',
+    )
+    cases += [
+        case('read', 'game_events.get_all_events', _call(game_events.get_all_events, 1, PER_PAGE)),
+        case('read', 'game_events.search_events_by_game', _call(game_events.search_events_by_game, game_id)),
+    ]
+
+    cases += _table_reads(
+        'player_valuations', playervaluations, counts['player_valuations'],
+        _call(playervaluations.get_valuation, player_id, str(valuation_day)),
+        {'prefix': league, 'number': str(player_id)},
+        playervaluations.get_all_valuations_with_total, playervaluations.get_total_valuation_count,
+        keyset=playervaluations.get_all_valuations_keyset, keyset_total=playervaluations.get_all_valuations_keyset_with_total,
+        sort_by='date',
+    )
+    cases += [
+        case('read', 'player_valuations.get_all_valuations',
+             _call(playervaluations.get_all_valuations, 1, PER_PAGE)),
+        case('read', 'player_valuations.get_valuations_by_player',
+             _call(playervaluations.get_valuations_by_player, player_id)),
+    ]
+    return cases
+
+
+# --- Yazma ---
+def _write_cycle(name, insert, delete, key, record, update=None, update_data=None):
+    """insert / update / delete case'leri; her biri diğerinin bıraktığı durumu temizler."""
+    cases = [
+        case('write', f"{name}.insert", _call(insert, record), teardown=_call(delete, *key)),
+        case('write', f"{name}.delete", _call(delete, *key), setup=_call(insert, record)),
+    ]
+    if update is not None:
+        cases.append(case('write', f"{name}.update", _call(update, *key, update_data),
+                          setup=_call(insert, record), teardown=_call(delete, *key)))
+    return cases
+
+
+def _bulk_cases(name, table_name, key_column, insert_many, records, upsert_many=None):
+    first_id = records[0][key_column]
+    cleanup = lambda: _execute(f"DELETE FROM {table_name} WHERE {key_column} >= %s", (first_id,))
+    cases = [case('write', f"{name}.insert_many", _call(insert_many, records), teardown=cleanup)]
+    if upsert_many is not None:
+        # İkinci çalıştırmadan itibaren satırlar vardır: ölçülen yol "güncelle"
+        cases.append(case('write', f"{name}.upsert_many", _call(upsert_many, records), teardown=cleanup))
+    return cases
+
+
+def write_cases(scale, bulk_rows=1000):
+    # Üretilen aralığın dışında kalan id'ler
+    player_id = scale.players + 1_000_000
+    club_id = scale.clubs + 1_000_000
+    game_id = scale.games + 1_000_000
+    competition_id = 'BENCH'
+    day = '2024-01-01'
+    home, away = scale.game_clubs(1)
+
+    cases = []
+    cases += _write_cycle(
+        'players', players.insert_player, players.delete_player, (player_id,),
+        {'player_id': player_id, 'name': 'Bench Player', 'position': 'Attack', 'market_value_in_eur': 1_000_000},
+        players.update_player, {'market_value_in_eur': 2_000_000},
+    )
+    cases += _write_cycle(
+        'clubs', clubs.insert_club, clubs.delete_club, (club_id,),
+        {'club_id': club_id, 'name': 'Bench FC', 'domestic_competition_id': 'GB1'},
+        clubs.update_club, {'squad_size': 30},
+    )
+    cases += _write_cycle(
+        'competitions', competitions.insert_competition, competitions.delete_competition, (competition_id,),
+        {'competition_id': competition_id, 'name': 'bench-league', 'country_name': 'Nowhere'},
+        competitions.update_competition, {'name': 'bench-league-2'},
+    )
+    cases += _write_cycle(
+        'games', games.insert_game, games.delete_game, (game_id,),
+        {'game_id': game_id, 'competition_id': 'GB1', 'date': day, 'home_club_id': home, 'away_club_id': away},
+        games.update_game, {'attendance': 12_345},
+    )
+    cases += _write_cycle(
+        'club_games', club_games.insert_club_game, club_games.delete_club_game, (game_id, home),
+        {'game_id': game_id, 'club_id': home, 'own_goals': 1, 'opponent_id': away, 'hosting': 'Home'},
+        club_games.update_club_game, {'own_goals': 2},
+    )
+    cases += _write_cycle(
+        'appearances', appearances.insert_appearance, appearances.delete_appearance, (f"{game_id}_1",),
+        {'appearance_id': f"{game_id}_1", 'game_id': game_id, 'player_id': 1, 'player_name': 'Bench Player'},
+    )
+    cases += _write_cycle(
+        'game_events', game_events.insert_event, game_events.delete_event, (f"bench{game_id}",),
+        {'game_event_id': f"bench{game_id}", 'game_id': game_id, 'minute': 1, 'type': 'Goals',
+         'description': 'bench'},
+    )
+    # game_event_id'siz olay: id insert_event içinde new_event_id ile üretilir
+    cases.append(case('write', 'game_events.insert_generated_id',
+                      _call(game_events.insert_event, {'game_id': game_id, 'minute': 2, 'type': 'Cards'}),
+                      teardown=lambda: _execute("DELETE FROM game_events WHERE game_id = %s AND minute = 2",
+                                                (game_id,)),
+                      covers='game_events.new_event_id'))
+    cases += _write_cycle(
+        'player_valuations', playervaluations.insert_valuation, playervaluations.delete_valuation, (player_id, day),
+        {'player_id': player_id, 'date': day, 'market_value_in_eur': 1_000_000},
+        playervaluations.update_valuation, {'market_value_in_eur': 1_500_000},
+    )
+
+    ids = range(bulk_rows)
+    cases += _bulk_cases('players', 'players', 'player_id', players.insert_many_players,
+                         [{'player_id': player_id + 1 + i, 'name': f"Bench {i}"} for i in ids])
+    cases += _bulk_cases('clubs', 'clubs', 'club_id', clubs.insert_many_clubs,
+                         [{'club_id': club_id + 1 + i, 'name': f"Bench {i}"} for i in ids])
+    cases += _bulk_cases('competitions', 'competitions', 'competition_id', competitions.insert_many_competitions,
+                         [{'competition_id': f"BENCH{i:05d}", 'name': f"bench-{i}"} for i in ids])
+    cases += _bulk_cases('games', 'games', 'game_id', games.insert_many_games,
+                         [{'game_id': game_id + 1 + i, 'date': day} for i in ids])
+    cases += _bulk_cases('club_games', 'club_games', 'game_id', club_games.insert_many_club_games,
+                         [{'game_id': game_id + 1 + i, 'club_id': home} for i in ids],
+                         upsert_many=club_games.upsert_many_club_games)
+    cases += _bulk_cases('appearances', 'appearances', 'game_id', appearances.insert_many_appearances,
+                         [{'appearance_id': f"{game_id + 1 + i}_1", 'game_id': game_id + 1 + i, 'player_id': 1}
+                          for i in ids],
+                         upsert_many=appearances.upsert_many_appearances)
+    cases += _bulk_cases('game_events', 'game_events', 'game_id', game_events.insert_many_events,
+                         [{'game_id': game_id + 1 + i, 'minute': 1, 'type': 'Goals'} for i in ids])
+    cases += _bulk_cases('player_valuations', 'player_valuations', 'player_id',
+                         playervaluations.insert_many_valuations,
+                         [{'player_id': player_id + 1 + i, 'date': day} for i in ids],
+                         upsert_many=playervaluations.upsert_many_valuations)
+    return cases
+
+
+# --- Flask route'ları ---
+def _get(client, url):
+    def run():
+        response = client.get(url)
+        body = response.get_data()  # akış yanıtları da sonuna kadar okunur
+        if response.status_code >= 400:
+            raise RuntimeError(f"GET {url} -> {response.status_code}: {body[:200]!r}")
+        return len(body)
+    return run
+
+
+def _post(client, url, **kwargs):
+    def run():
+        response = client.post(url, **kwargs)
+        if response.status_code >= 400:
+            raise RuntimeError(f"POST {url} -> {response.status_code}: {response.get_data()[:200]!r}")
+        return response.status_code
+    return run
+
+
+def _middle_keys(scale):
+    """Her tablonun ortalarındaki bir satırın birincil anahtarı (registry adıyla)."""
+    game_id = scale.games // 2
+    player_id = scale.players // 2
+    home, _ = scale.game_clubs(game_id)
+    return {
+        'players': [player_id],
+        'clubs': [scale.clubs // 2],
+        'competitions': ['GB1'],
+        'games': [game_id],
+        'club_games': [game_id, home],
+        'appearances': [f"{game_id}_{scale.game_players(game_id)[0]}"],
+        'game_events': [scale.event_id(game_id, 0)],
+        'playervaluations': [player_id, str(scale.valuation_dates(player_id)[VALUATION_INDEX])],
+    }
+
+
+def route_cases(scale, app, registry):
+    client = app.test_client()
+    counts = scale.counts()
+    # Route tablo adı -> veritabanı tablo adı
+    rows_in = {name: counts[entry['table']] for name, entry in registry.items()}
+    middle_keys = _middle_keys(scale)
+    _, last = scale.player_name(scale.players // 2)
+
+    cases = [case('route', 'GET /', _get(client, '/'))]
+    for name, entry in registry.items():
+        deep = _deep_page(rows_in[name])
+        cases += [
+            case('route', f"GET /table/{name}", _get(client, f"/table/{name}")),
+            case('route', f"GET /table/{name}?page=deep", _get(client, f"/table/{name}?page={deep}")),
+            case('route', f"GET /table/{name}?q=", _get(client, f"/table/{name}?q={last}")),
+            case('route', f"GET /table/{name}/add", _get(client, f"/table/{name}/add")),
+            case('route', f"GET /api/{name}", _get(client, f"/api/{name}?limit=100")),
+            case('route', f"GET /api/{name}?format=ndjson",
+                 _get(client, f"/api/{name}?format=ndjson&limit=10000")),
+            case('route', f"GET /export/{name}", _get(client, f"/export/{name}?limit=10000")),
+        ]
+        # /api varsayılan olarak birincil anahtara göre sıralar; cursor tablonun ortasından başlar
+        cursor = encode_cursor(entry['key'][0], middle_keys[name])
+        cases.append(case('route', f"GET /api/{name}?after=deep",
+                          _get(client, f"/api/{name}?limit=100&after={cursor}")))
+
+    # Yazma route'ları tek tabloda (games) ölçülür; hepsi aynı registry işlemlerine gider
+    game_id = scale.games + 2_000_000
+    form = {'game_id': str(game_id), 'competition_id': 'GB1', 'date': '2024-01-01'}
+    delete_game = _call(games.delete_game, game_id)
+    bulk = [{'game_id': game_id + 1 + i, 'date': '2024-01-01'} for i in range(100)]
+    cases += [
+        case('route', 'POST /table/games/add', _post(client, '/table/games/add', data=form),
+             teardown=delete_game),
+        case('route', 'POST /table/games/delete', _post(client, f"/table/games/delete/{game_id}"),
+             setup=_call(games.insert_game, form)),
+        case('route', 'POST /table/games/bulk', _post(client, '/table/games/bulk', json=bulk),
+             teardown=lambda: _execute("DELETE FROM games WHERE game_id > %s", (game_id,))),
+    ]
+    return cases
+
+
+def other_cases(scale, registry, output_path):
+    """table_query/export yolunu Flask olmadan ölçer."""
+    spec = registry['appearances']
+    return [
+        case('read', 'table_query.fetch_rows', lambda: spec['rows'](limit=1000)[0], covers='table_query.fetch_rows'),
+        case('read', 'table_query.stream_batches',
+             lambda: sum(len(rows) for rows in spec['stream'](limit=50_000)), covers='table_query.stream_batches'),
+        case('read', 'export.export_to_file',
+             lambda: export_to_file(spec['stream'](limit=50_000), spec['table'], spec['columns'], output_path).rows,
+             covers='export.export_to_file'),
+    ]
+
+
+def build_cases(scale_name, app, registry, export_path, groups=None, bulk_rows=1000):
+    scale = Scale(scale_name)
+    cases = read_cases(scale) + write_cases(scale, bulk_rows) + \
+        other_cases(scale, registry, export_path) + route_cases(scale, app, registry)
+    if groups:
+        cases = [c for c in cases if c.group in groups]
+    return cases
+
+
+def uncovered_functions(cases):
+    """Hiçbir case'in ölçmediği public servis fonksiyonları ('modül.fonksiyon')."""
+    covered = {c.covers for c in cases if c.covers}
+    public = set()
+    for module in SERVICE_MODULES:
+        short = module.__name__.split('.')[-1]
+        for name, func in inspect.getmembers(module, inspect.isfunction):
+            if not name.startswith('_') and func.__module__ == module.__name__:
+                public.add(f"{short}.{name}")
+    return sorted(public - covered)
@@ -0,0 +1,316 @@
+# File: benchmarks/datagen.py
+# Description: Deterministic synthetic data shaped like the Transfermarkt dump.
+#              Writes one CSV per table (same file names and headers as data/, so
+#              importer.loader can load it) with realistic proportions between the
+#              tables: ~22 appearances and ~13 events per game, two club_games rows
+#              per game, ~15 valuations per player. Names, positions, countries and
+#              leagues are drawn from small pools so searches and filters have
+#              Transfermarkt-like selectivity.
+#              The same scale and seed always produce the same files; the benchmark
+#              cases derive their ids from the same Scale.
+
+import csv
+import hashlib
+import os
+import random
+from datetime import date, timedelta
+
+from importer.tables import TABLES
+
+# Toplam satır sayısı (tüm tablolar)
+SCALES = {
+    '10k': 10_000,
+    '1m': 1_000_000,
+    '10m': 10_000_000,
+}
+
+APPEARANCES_PER_GAME = 22
+EVENTS_PER_GAME = 13
+VALUATIONS_PER_PLAYER = 15
+# games : players oranı gerçek dökümdekine yakın (~75k maç, ~32k oyuncu)
+PLAYERS_PER_GAME = 0.43
+
+FIRST_NAMES = [
+    'Lionel', 'Cristiano', 'Kevin', 'Mohamed', 'Robert', 'Kylian', 'Erling', 'Luka', 'Virgil',
+    'Harry', 'Joshua', 'Bruno', 'Marcus', 'Paulo', 'Arda', 'Hakan', 'Kerem', 'Mauro', 'Dries',
+    'Thomas', 'Antoine', 'Sergio', 'Jan', 'Pedro', 'Gabriel', 'Lucas', 'Marco', 'Ivan', 'Ali',
+    'Emre', 'Jordi', 'Andrea', 'Nicolo', 'Federico', 'Jude', 'Bukayo', 'Phil', 'Jamal', 'Florian',
+]
+LAST_NAMES = [
+    'Silva', 'Santos', 'Müller', 'Kane', 'Salah', 'Mbappé', 'Haaland', 'Modric', 'van Dijk',
+    'De Bruyne', 'Kimmich', 'Fernandes', 'Rashford', 'Dybala', 'Güler', 'Çalhanoğlu', 'Aktürkoğlu',
+    'Icardi', 'Mertens', 'Griezmann', 'Ramos', 'Oblak', 'Rodríguez', 'Jesus', 'Hernández',
+    'Rossi', 'Perišić', 'Yılmaz', 'Alba', 'Pirlo', 'Barella', 'Chiesa', 'Bellingham', 'Saka',
+    'Foden', 'Musiala', 'Wirtz', 'Kroos', 'Pedri', 'García',
+]
+COUNTRIES = [
+    'Germany', 'England', 'Spain', 'Italy', 'France', 'Türkiye', 'Brazil', 'Argentina',
+    'Portugal', 'Netherlands', 'Belgium', 'Croatia', 'Scotland', 'Greece', 'Denmark', 'Ukraine',
+]
+CITIES = ['Istanbul', 'London', 'Madrid', 'Milan', 'Munich', 'Paris', 'Lisbon', 'Amsterdam',
+          'Rosario', 'São Paulo', 'Glasgow', 'Athens', 'Kyiv', 'Zagreb', 'Brussels', 'Copenhagen']
+POSITIONS = {
+    'Goalkeeper': ['Goalkeeper'],
+    'Defender': ['Centre-Back', 'Left-Back', 'Right-Back'],
+    'Midfield': ['Central Midfield', 'Defensive Midfield', 'Attacking Midfield', 'Left Midfield'],
+    'Attack': ['Centre-Forward', 'Left Winger', 'Right Winger', 'Second Striker'],
+}
+FEET = ['right', 'right', 'right', 'left', 'both', None]
+EVENT_TYPES = ['Goals', 'Cards', 'Substitutions', 'Shootout']
+ROUNDS = [f"{n}. Matchday" for n in range(1, 35)] + ['Group A', 'Group B', 'Final', 'Semi-Finals']
+# (competition_id, name, country_id, country_name)
+LEAGUES = [
+    ('GB1', 'premier-league', 189, 'England'), ('ES1', 'laliga', 157, 'Spain'),
+    ('IT1', 'serie-a', 75, 'Italy'), ('L1', 'bundesliga', 40, 'Germany'),
+    ('FR1', 'ligue-1', 50, 'France'), ('TR1', 'super-lig', 174, 'Turkey'),
+    ('PO1', 'liga-portugal', 136, 'Portugal'), ('NL1', 'eredivisie', 122, 'Netherlands'),
+    ('BE1', 'jupiler-pro-league', 19, 'Belgium'), ('SC1', 'scottish-premiership', 190, 'Scotland'),
+    ('GR1', 'super-league-1', 56, 'Greece'), ('DK1', 'superligaen', 39, 'Denmark'),
+    ('UKR1', 'premier-liga', 177, 'Ukraine'), ('RU1', 'premier-liga', 141, 'Russia'),
+]
+CUPS = [('CL', 'uefa-champions-league'), ('EL', 'europa-league'), ('UCOL', 'conference-league')]
+
+FIRST_SEASON = 2012
+LAST_SEASON = 2024
+
+
+class Scale:
+    """Bir ölçekteki tablo başına satır sayıları ve id aralıkları (id'ler 1'den başlar)."""
+
+    def __init__(self, name):
+        if name not in SCALES:
+            raise ValueError(f"Unknown scale: {name} (expected one of {', '.join(SCALES)})")
+        self.name = name
+        total = SCALES[name]
+        rows_per_game = 1 + 2 + APPEARANCES_PER_GAME + EVENTS_PER_GAME + \
+            PLAYERS_PER_GAME * (1 + VALUATIONS_PER_PLAYER)
+        self.games = max(1, int(total / rows_per_game))
+        self.players = max(APPEARANCES_PER_GAME * 2, int(self.games * PLAYERS_PER_GAME))
+        self.clubs = max(20, min(2000, self.games // 40))
+        self.competitions = len(LEAGUES) + len(CUPS)
+
+    def counts(self):
+        return {
+            'competitions': self.competitions,
+            'clubs': self.clubs,
+            'players': self.players,
+            'games': self.games,
+            'club_games': self.games * 2,
+            'appearances': self.games * APPEARANCES_PER_GAME,
+            'game_events': self.games * EVENTS_PER_GAME,
+            'player_valuations': self.players * VALUATIONS_PER_PLAYER,
+        }
+
+    # --- Diğer modüllerin de kullandığı deterministik eşlemeler ---
+    def game_clubs(self, game_id):
+        home = (game_id * 7) % self.clubs + 1
+        # home'dan 1..clubs-1 ileride: ev sahibiyle aynı kulüp olamaz
+        away = (home + game_id % (self.clubs - 1)) % self.clubs + 1
+        return home, away
+
+    def game_players(self, game_id):
+        """Maçta oynayan (birbirinden farklı) oyuncu id'leri."""
+        start = (game_id * APPEARANCES_PER_GAME) % self.players
+        return [(start + k) % self.players + 1 for k in range(APPEARANCES_PER_GAME)]
+
+    def game_date(self, game_id):
+        days = (LAST_SEASON - FIRST_SEASON + 1) * 365
+        return date(FIRST_SEASON, 8, 1) + timedelta(days=(game_id * 97) % days)
+
+    def valuation_dates(self, player_id):
+        first = date(2004, 1, 1) + timedelta(days=(player_id * 31) % 720)
+        return [first + timedelta(days=182 * k) for k in range(VALUATIONS_PER_PLAYER)]
+
+    def event_minutes(self, game_id):
+        # Son olay bir öncekiyle aynı dakikada (çift oyuncu değişikliği gibi), bkz. _game_events
+        minutes = [k * 7 + (game_id + k) % 7 + 1 for k in range(EVENTS_PER_GAME - 1)]
+        return minutes + minutes[-1:]
+
+    def event_type(self, game_id, k):
+        # Son olay bir öncekinin tekrarı: (game_id, minute, type) benzersiz değildir, dökümde de öyle
+        k = min(k, EVENTS_PER_GAME - 2)
+        return EVENT_TYPES[(game_id + k) % len(EVENT_TYPES)]
+
+    def event_id(self, game_id, k):
+        """Maçın k. olayının game_event_id'si (dökümdeki gibi 32 hex)."""
+        return hashlib.md5(f"{game_id}/{k}".encode('ascii')).hexdigest()
+
+    def player_name(self, player_id):
+        first = FIRST_NAMES[player_id % len(FIRST_NAMES)]
+        last = LAST_NAMES[(player_id * 7 + player_id // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        return first, last
+
+    def club_name(self, club_id):
+        city = CITIES[club_id % len(CITIES)]
+        return f"{city} FC {club_id}" if club_id > len(CITIES) else f"{city} FC"
+
+    def club_league(self, club_id):
+        return LEAGUES[club_id % len(LEAGUES)]
+
+
+def _money(rng, low, high):
+    # Transfermarkt değerleri yuvarlaktır: 25.000'in katları
+    return rng.randint(low // 25_000, high // 25_000) * 25_000
+
+
+def _competitions(scale, rng):
+    for competition_id, code, country_id, country in LEAGUES:
+        yield [competition_id, code, code, 'first_tier', 'domestic_league', country_id, country,
+               competition_id, 'europa', f"https://www.transfermarkt.co.uk/{code}/startseite/wettbewerb/{competition_id}"]
+    for competition_id, code in CUPS:
+        yield [competition_id, code, code, 'uefa_champions_league', 'international_cup', -1, None,
+               None, 'europa', f"https://www.transfermarkt.co.uk/{code}/startseite/pokalwettbewerb/{competition_id}"]
+
+
+def _clubs(scale, rng):
+    for club_id in range(1, scale.clubs + 1):
+        name = scale.club_name(club_id)
+        code = name.lower().replace(' ', '-')
+        squad = rng.randint(22, 35)
+        foreigners = rng.randint(0, squad)
+        yield [club_id, code, name, scale.club_league(club_id)[0], _money(rng, 5_000_000, 1_200_000_000),
+               squad, round(rng.uniform(22.5, 29.5), 1), foreigners, round(foreigners * 100 / squad, 1),
+               rng.randint(0, 12), f"{CITIES[club_id % len(CITIES)]} Arena {club_id}",
+               rng.randint(5_000, 80_000), _money(rng, -150_000_000, 150_000_000),
+               f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", rng.randint(FIRST_SEASON, LAST_SEASON),
+               f"https://www.transfermarkt.co.uk/{code}/startseite/verein/{club_id}"]
+
+
+def _players(scale, rng):
+    for player_id in range(1, scale.players + 1):
+        first, last = scale.player_name(player_id)
+        name = f"{first} {last}"
+        code = name.lower().replace(' ', '-')
+        club_id = player_id % scale.clubs + 1
+        position = rng.choice(list(POSITIONS))
+        peak = _money(rng, 50_000, 180_000_000)
+        born = date(1980, 1, 1) + timedelta(days=rng.randint(0, 365 * 26))
+        contract = date(LAST_SEASON + 1 + rng.randint(0, 4), 6, 30) if rng.random() < 0.8 else None
+        country = rng.choice(COUNTRIES)
+        yield [player_id, first, last, name, rng.randint(FIRST_SEASON, LAST_SEASON), club_id, code,
+               country, rng.choice(CITIES), country if rng.random() < 0.85 else rng.choice(COUNTRIES), born,
+               rng.choice(POSITIONS[position]), position, rng.choice(FEET), rng.randint(165, 200),
+               _money(rng, 25_000, peak), peak, contract, f"{rng.choice(LAST_NAMES)} Management",
+               f"https://img.transfermarkt.co.uk/portrait/header/{player_id}.jpg",
+               f"https://www.transfermarkt.co.uk/{code}/profil/spieler/{player_id}",
+               scale.club_league(club_id)[0], scale.club_name(club_id)]
+
+
+def _game_competition(scale, game_id, home):
+    if game_id % 10 == 0:
+        return CUPS[game_id % len(CUPS)][0], 'international_cup'
+    return scale.club_league(home)[0], 'domestic_league'
+
+
+def _games(scale, rng):
+    for game_id in range(1, scale.games + 1):
+        home, away = scale.game_clubs(game_id)
+        competition_id, competition_type = _game_competition(scale, game_id, home)
+        played = scale.game_date(game_id)
+        season = played.year if played.month >= 7 else played.year - 1
+        yield [game_id, competition_id, season, rng.choice(ROUNDS), played, home, away,
+               rng.randint(0, 4), rng.randint(0, 4), rng.randint(1, 20), rng.randint(1, 20),
+               f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+               f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+               f"{CITIES[home % len(CITIES)]} Arena {home}", rng.randint(1_000, 80_000),
+               f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+               f"https://www.transfermarkt.co.uk/spielbericht/index/spielbericht/{game_id}",
+               scale.club_name(home), scale.club_name(away), None, competition_type]
+
+
+def _club_games(scale, rng):
+    for game_id in range(1, scale.games + 1):
+        home, away = scale.game_clubs(game_id)
+        home_goals, away_goals = rng.randint(0, 4), rng.randint(0, 4)
+        home_manager = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        away_manager = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        home_position, away_position = rng.randint(1, 20), rng.randint(1, 20)
+        yield [game_id, home, home_goals, home_position, home_manager, away, away_goals, away_position,
+               away_manager, 'Home', int(home_goals > away_goals)]
+        yield [game_id, away, away_goals, away_position, away_manager, home, home_goals, home_position,
+               home_manager, 'Away', int(away_goals > home_goals)]
+
+
+def _appearances(scale, rng):
+    for game_id in range(1, scale.games + 1):
+        home, away = scale.game_clubs(game_id)
+        competition_id, _ = _game_competition(scale, game_id, home)
+        played = scale.game_date(game_id)
+        for k, player_id in enumerate(scale.game_players(game_id)):
+            first, last = scale.player_name(player_id)
+            club_id = home if k < APPEARANCES_PER_GAME // 2 else away
+            yield [f"{game_id}_{player_id}", game_id, player_id, club_id, player_id % scale.clubs + 1,
+                   played, f"{first} {last}", competition_id, int(rng.random() < 0.15),
+                   int(rng.random() < 0.01), int(rng.random() < 0.08), rng.choice([90, 90, 90, 45, 25, 10])]
+
+
+def _game_events(scale, rng):
+    for game_id in range(1, scale.games + 1):
+        home, away = scale.game_clubs(game_id)
+        players = scale.game_players(game_id)
+        for k, minute in enumerate(scale.event_minutes(game_id)):
+            event_type = scale.event_type(game_id, k)
+            player_id = players[k % len(players)]
+            first, last = scale.player_name(player_id)
+            player_in_id = players[(k + 11) % len(players)] if event_type == 'Substitutions' else None
+            yield [scale.event_id(game_id, k), game_id, minute, event_type, home if k % 2 == 0 else away,
+                   player_id, f"{minute}' {event_type[:-1]}, {first} {last}", player_in_id]
+
+
+def _player_valuations(scale, rng):
+    for player_id in range(1, scale.players + 1):
+        club_id = player_id % scale.clubs + 1
+        value = _money(rng, 25_000, 5_000_000)
+        for n, day in enumerate(scale.valuation_dates(player_id), start=1):
+            value = max(25_000, _money(rng, int(value * 0.6), int(value * 1.6)))
+            week = day - timedelta(days=day.weekday())
+            yield [player_id, min(day.year, LAST_SEASON), f"{day} 00:00:00", day, week, value, n, club_id,
+                   scale.club_league(club_id)[0]]
+
+
+GENERATORS = {
+    'competitions': _competitions,
+    'clubs': _clubs,
+    'players': _players,
+    'games': _games,
+    'club_games': _club_games,
+    'appearances': _appearances,
+    'game_events': _game_events,
+    'player_valuations': _player_valuations,
+}
+
+
+def _header(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return next(csv.reader(f), None)
+
+
+def data_dir(scale_name, root=os.path.join('benchmarks', 'data')):
+    return os.path.join(root, scale_name)
+
+
+def generate(scale_name, output_dir=None, seed=42, force=False):
+    """
+    Ölçeğin CSV dosyalarını `output_dir`'e (varsayılan: benchmarks/data/<ölçek>) yazar.
+    Dosyalar zaten varsa (force=False) yeniden üretilmez; başlığı tablonun güncel sütunlarıyla
+    uyuşmayan (eski sürümle üretilmiş) dosyalar yeniden üretilir. {tablo: satır sayısı} döndürür.
+    """
+    scale = Scale(scale_name)
+    output_dir = output_dir or data_dir(scale_name)
+    os.makedirs(output_dir, exist_ok=True)
+
+    counts = {}
+    for table_name, make_rows in GENERATORS.items():
+        path = os.path.join(output_dir, TABLES[table_name]['files'][0])
+        counts[table_name] = scale.counts()[table_name]
+        if os.path.exists(path) and not force and _header(path) == TABLES[table_name]['columns']:
+            continue
+        # Her tablo kendi tohumundan üretilir: tek tablo yeniden üretilse de çıktı aynı kalır
+        rng = random.Random(f"{seed}:{table_name}")
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(TABLES[table_name]['columns'])
+            writer.writerows(make_rows(scale, rng))
+        os.replace(tmp_path, path)
+    return counts
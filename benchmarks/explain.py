@@ -0,0 +1,184 @@
+# File: benchmarks/explain.py
+# Description: EXPLAIN check for the service queries (python benchmark.py --explain).
+#              The read cases of benchmarks/cases.py run once with a query log hooked into
+#              db.get_connection() (the db.recorder hook, see services/instrumentation.py);
+#              every SELECT/UPDATE/DELETE they send is then EXPLAINed with its real
+#              parameters and classified:
+#                index  - every table is read through an index (or the primary key)
+#                sort   - rows are found through an index but sorted afterwards
+#                         (filesort / temp b-tree); fine for small result sets
+#                search - LIKE/MATCH search that reads the whole table; a contains-LIKE
+#                         cannot use a B-tree index (SQLite has no FULLTEXT)
+#                full   - unfiltered read of a whole table (player store load, COUNT(*))
+#                scan   - a filtered or LIMITed query reads a whole table: missing index
+#              Only "scan" fails the check. Streaming reads (db.connect(record=True):
+#              export, NDJSON) are seen; other unpooled connections (importer) are not.
+
+import re
+from collections import namedtuple
+
+from Database import db
+from services.cache import result_cache
+from services.instrumentation import query_template
+
+STATUSES = ('scan', 'sort', 'search', 'full', 'index')
+EXPLAINED = ('SELECT', 'UPDATE', 'DELETE')
+
+Query = namedtuple('Query', ['case', 'query', 'params'])
+
+
+class _LoggingCursor:
+    def __init__(self, cursor, log):
+        self._cursor = cursor
+        self._log = log
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, query, args=None):
+        self._log.add(query, args)
+        return self._cursor.execute(query) if args is None else self._cursor.execute(query, args)
+
+    def executemany(self, query, args):
+        return self._cursor.executemany(query, args)
+
+
+class _LoggingConnection:
+    def __init__(self, conn, log):
+        self._conn = conn
+        self._log = log
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return _LoggingCursor(self._conn.cursor(*args, **kwargs), self._log)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class QueryLog:
+    """db.recorder yerine takılır; havuzdan alınan bağlantıların sorgularını case adıyla toplar."""
+
+    def __init__(self):
+        self.case = None
+        self.queries = []
+
+    def wrap_connection(self, conn, acquire_seconds=None):
+        return _LoggingConnection(conn, self)
+
+    def add(self, query, args):
+        if query.lstrip().split(None, 1)[0].upper() in EXPLAINED:
+            self.queries.append(Query(self.case, query, tuple(args or ())))
+
+
+def capture(cases):
+    """Case'leri birer kez (önbellek temizlenerek) çalıştırır; [Query] döndürür."""
+    log = QueryLog()
+    previous, db.recorder = db.recorder, log
+    try:
+        for case in cases:
+            log.case = case.name
+            result_cache.clear()
+            if case.setup is not None:
+                case.setup()
+            try:
+                case.run()
+            finally:
+                if case.teardown is not None:
+                    case.teardown()
+    finally:
+        db.recorder = previous
+    return log.queries
+
+
+# --- Plan ---
+def explain(cursor, query, params):
+    """Sorgunun planı; MySQL'de EXPLAIN satırları, SQLite'ta EXPLAIN QUERY PLAN satırları."""
+    prefix = "EXPLAIN QUERY PLAN " if db.backend == 'sqlite' else "EXPLAIN "
+    cursor.execute(prefix + query, params)
+    return list(cursor.fetchall())
+
+
+def _read_plan(plan, ordered_limit):
+    """
+    (baştan sona okunan tablolar, sonradan sıralama var mı, kullanılan indeksler).
+    ORDER BY ... LIMIT sorgusu sıralamayı indeksten (ya da birincil anahtardan) alıyorsa
+    okuma LIMIT'e ulaşınca durur; o tarama tam okuma sayılmaz.
+    """
+    if db.backend == 'sqlite':
+        details = [row['detail'] for row in plan]
+        sorts = any('TEMP B-TREE FOR ORDER BY' in detail for detail in details)
+        scans = [] if ordered_limit and not sorts else \
+            [detail.split()[1] for detail in details if detail.startswith('SCAN ')]
+        indexes = re.findall(r'USING (?:COVERING )?INDEX (\w+)|USING (INTEGER PRIMARY KEY)', ' '.join(details))
+        indexes = [name or 'PRIMARY' for name, _ in indexes]
+        if ordered_limit and not sorts and not indexes:
+            indexes = ['PRIMARY']
+        return scans, sorts, indexes
+    sorts = any('filesort' in (row['Extra'] or '') for row in plan)
+    scans = [row['table'] for row in plan
+             if row['type'] == 'ALL' or (row['type'] == 'index' and not (ordered_limit and not sorts))]
+    return scans, sorts, [row['key'] for row in plan if row['key']]
+
+
+def classify(query, plan):
+    text = ' '.join(query.split())
+    ordered_limit = ' ORDER BY ' in text and ' LIMIT ' in text
+    scans, sorts, indexes = _read_plan(plan, ordered_limit)
+    filtered = (' WHERE ' in text and ' WHERE 1 = 0' not in text) or ' LIMIT ' in text
+    if scans:
+        if 'MATCH(' in text or ' LIKE ' in text:
+            return 'search', scans, indexes
+        return ('scan' if filtered else 'full'), scans, indexes
+    if sorts and filtered:
+        return 'sort', scans, indexes
+    return 'index', scans, indexes
+
+
+def check(queries):
+    """
+    Her farklı sorgu şablonunu (ilk görüldüğü case'in parametreleriyle) EXPLAIN eder.
+    [{'case', 'query', 'status', 'scans', 'indexes'}] döndürür, en kötü durum önce.
+    """
+    seen = {}
+    for query in queries:
+        seen.setdefault(query_template(query.query), query)
+
+    results = []
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        for template, query in seen.items():
+            try:
+                status, scans, indexes = classify(query.query, explain(cursor, query.query, query.params))
+            except Exception as e:
+                print(f"Error (explain {query.case}): {e}")
+                continue
+            results.append({'case': query.case, 'query': template, 'status': status,
+                            'scans': scans, 'indexes': indexes})
+        cursor.close()
+    finally:
+        conn.close()
+    results.sort(key=lambda entry: STATUSES.index(entry['status']))
+    return results
+
+
+def print_report(results, width=110):
+    for entry in results:
+        tables = f" scans {', '.join(entry['scans'])}" if entry['scans'] else ''
+        indexes = f" uses {', '.join(entry['indexes'])}" if entry['indexes'] else ''
+        print(f"{entry['status']:<7}{entry['case']:<40}{tables}{indexes}")
+        print(f"       {entry['query'][:width]}")
+    counts = {status: sum(1 for entry in results if entry['status'] == status) for status in STATUSES}
+    print(', '.join(f"{status}: {count}" for status, count in counts.items()))
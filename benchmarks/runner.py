@@ -0,0 +1,204 @@
+# File: benchmarks/runner.py
+# Description: Loads a generated scale into the benchmark database, times the cases
+#              from benchmarks.cases and writes/compares JSON results.
+#              Each case runs once cold (result cache cleared, first call), then
+#              `warmup` untimed and `repeat` timed calls. By default the result cache
+#              is cleared before every call so the database path is what gets measured;
+#              keep_cache=True measures the cached path instead. The in-memory player
+#              store (db.players) is built on the first call and stays warm, as in the app.
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+
+from Database import db, schema_statements
+from importer.loader import run_import
+from importer.tables import TABLES
+from services.cache import result_cache
+
+
+# --- Veritabanı ---
+def server_version():
+    conn = db.get_connection()
+    try:
+        return conn.get_server_info()
+    finally:
+        conn.close()
+
+
+def prepare_database(database):
+    """
+    Veritabanını (yoksa) oluşturur, şemayı kurar, bekleyen migration'ları uygular ve
+    tabloları boşaltır (daha önce oluşturulmuş benchmark veritabanı da yeni indeksleri alır).
+    """
+    if db.backend == 'sqlite':
+        # SQLite dosyası/bellek veritabanı Database.configure'da şemayla birlikte açılır
+        db.create_schema()
+        db.migrate()
+        conn = db.connect()
+        try:
+            cursor = conn.cursor()
+            for table_name in TABLES:
+                cursor.execute(f"DELETE FROM {table_name}")
+            conn.commit()
+        finally:
+            conn.close()
+        return
+
+    conn = db.connect(db=None)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{database}` CHARACTER SET utf8mb4")
+        cursor.execute(f"USE `{database}`")
+        for statement in schema_statements('mysql', conn.get_server_info()):
+            cursor.execute(statement)
+        for table_name in TABLES:
+            cursor.execute(f"TRUNCATE TABLE {table_name}")
+        conn.commit()
+    finally:
+        conn.close()
+    db.migrate()
+
+
+def load_scale(data_dir, method='executemany', workers=4, batch_size=5000):
+    """Üretilmiş CSV'leri benchmark veritabanına yükler; (sonuçlar, süre) döndürür."""
+    results, elapsed = run_import(data_dir=data_dir, batch_size=batch_size, workers=workers, method=method,
+                                  progress_interval=10.0)
+    failed = [stats['table'] for stats in results if stats['failed'] or 'error' in stats]
+    if failed:
+        raise RuntimeError(f"Loading failed for: {', '.join(failed)}")
+    result_cache.clear()
+    return results, elapsed
+
+
+# --- Zamanlama ---
+def _result_size(result):
+    """Döndürülen satır sayısı (liste, (satırlar, ...) tuple'ı ya da sayı); bilinmiyorsa None."""
+    if isinstance(result, bool):
+        return None
+    if isinstance(result, int):
+        return result
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, tuple) and result and isinstance(result[0], list):
+        return len(result[0])
+    if isinstance(result, dict):
+        # insert_many / upsert_many
+        return result.get('inserted', result.get('upserted'))
+    return None
+
+
+def _call_once(case, keep_cache):
+    if case.setup is not None:
+        case.setup()
+    if not keep_cache:
+        result_cache.clear()
+    started = time.perf_counter()
+    try:
+        result = case.run()
+    finally:
+        seconds = time.perf_counter() - started
+        if case.teardown is not None:
+            case.teardown()
+    if isinstance(result, str) and result.startswith('Error'):
+        raise RuntimeError(result)
+    return seconds, result
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+def time_case(case, repeat=5, warmup=1, keep_cache=False):
+    first, result = _call_once(case, keep_cache)
+    for _ in range(warmup):
+        _call_once(case, keep_cache)
+    samples = [_call_once(case, keep_cache)[0] for _ in range(repeat)]
+    ordered = sorted(samples)
+    return {
+        'group': case.group,
+        'covers': case.covers,
+        'runs': repeat,
+        'first_ms': _ms(first),
+        'min_ms': _ms(ordered[0]),
+        'median_ms': _ms(statistics.median(ordered)),
+        'mean_ms': _ms(statistics.fmean(ordered)),
+        'p95_ms': _ms(ordered[min(len(ordered) - 1, -(-95 * len(ordered) // 100) - 1)]),
+        'max_ms': _ms(ordered[-1]),
+        'rows': _result_size(result),
+    }
+
+
+def run_cases(cases, repeat=5, warmup=1, keep_cache=False, verbose=True):
+    """{case adı: ölçüm} döndürür. Hata veren case'ler 'error' anahtarıyla kaydedilir."""
+    results = {}
+    for number, case in enumerate(cases, start=1):
+        try:
+            results[case.name] = time_case(case, repeat, warmup, keep_cache)
+        except Exception as e:
+            results[case.name] = {'group': case.group, 'covers': case.covers, 'error': str(e)}
+        if verbose:
+            entry = results[case.name]
+            timing = f"median {entry['median_ms']:>10.3f} ms" if 'error' not in entry else f"ERROR {entry['error']}"
+            print(f"[{number:>3}/{len(cases)}] {case.name:<55} {timing}")
+    return results
+
+
+# --- Sonuçlar ---
+def git_commit():
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True)
+        return output.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(scale_name, counts, repeat, warmup, keep_cache):
+    return {
+        'scale': scale_name,
+        'rows': counts,
+        'repeat': repeat,
+        'warmup': warmup,
+        'keep_cache': keep_cache,
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'backend': db.backend,
+        'database': db.db if db.backend == 'mysql' else db.sqlite_path,
+        'server_version': server_version(),
+        'result_cache': result_cache.stats()['backend'],
+    }
+
+
+def write_results(path, meta, results, uncovered):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'results': results, 'uncovered': uncovered}, f, indent=2, ensure_ascii=False)
+
+
+def compare_results(base, current, metric='median_ms'):
+    """
+    İki sonuç dosyasının (dict) ortak case'leri için [(ad, önceki, şimdiki, oran)] döndürür;
+    oran > 1 yavaşlama demektir. En çok değişen önce.
+    """
+    rows = []
+    for name, entry in current['results'].items():
+        previous = base['results'].get(name)
+        if not previous or metric not in previous or metric not in entry:
+            continue
+        ratio = entry[metric] / previous[metric] if previous[metric] else float('inf')
+        rows.append((name, previous[metric], entry[metric], ratio))
+    rows.sort(key=lambda row: abs(row[3] - 1), reverse=True)
+    return rows
+
+
+def print_comparison(rows, threshold=0.10):
+    print(f"{'case':<55} {'before':>10} {'after':>10} {'change':>9}")
+    for name, before, after, ratio in rows:
+        change = (ratio - 1) * 100
+        flag = '  <- slower' if ratio > 1 + threshold else ('  <- faster' if ratio < 1 - threshold else '')
+        print(f"{name:<55} {before:>10.3f} {after:>10.3f} {change:>+8.1f}%{flag}")
@@ -0,0 +1,13 @@
+-- File: database/migrations/001_fulltext_search.sql
+-- Description: FULLTEXT (ngram) search indexes for databases created before they
+--              were added to schema.sql (see services/search.py). The column list of
+--              each index must match the service's SEARCH_FIELDS "text" entry.
+--              Skipped on SQLite (no FULLTEXT); MariaDB uses the default parser.
+
+CREATE FULLTEXT INDEX ft_players_search ON players (name, player_code, country_of_birth, position) WITH PARSER ngram;
+CREATE FULLTEXT INDEX ft_competitions_search ON competitions (name, country_name) WITH PARSER ngram;
+CREATE FULLTEXT INDEX ft_appearances_search ON appearances (player_name) WITH PARSER ngram;
+CREATE FULLTEXT INDEX ft_clubs_search ON clubs (name, stadium_name, coach_name) WITH PARSER ngram;
+CREATE FULLTEXT INDEX ft_games_search ON games (home_club_name, away_club_name, stadium) WITH PARSER ngram;
+CREATE FULLTEXT INDEX ft_game_events_search ON game_events (description) WITH PARSER ngram;
+CREATE FULLTEXT INDEX ft_club_games_search ON club_games (own_manager_name, opponent_manager_name) WITH PARSER ngram;
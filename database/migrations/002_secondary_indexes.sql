@@ -0,0 +1,33 @@
+-- File: database/migrations/002_secondary_indexes.sql
+-- Description: Secondary and covering indexes for the service queries (same as the
+--              INDEX lines in schema.sql). Filter column first, then the ORDER BY /
+--              keyset sort columns, so the rows come out of the index already sorted.
+
+-- players: get_all_players ORDER BY name
+CREATE INDEX idx_players_name ON players (name, player_id);
+-- competitions.get_competition_total_market_value: JOIN players ON current_club_id,
+-- SUM(market_value_in_eur) read from the index alone (covering)
+CREATE INDEX idx_players_current_club ON players (current_club_id, market_value_in_eur);
+
+-- player_valuations: get_valuations_by_player already uses PRIMARY KEY (player_id, date);
+-- pages and keyset cursors sort by date
+CREATE INDEX idx_player_valuations_date ON player_valuations (date, player_id);
+
+-- appearances: search_appearances_by_player, pages sorted by player_name
+CREATE INDEX idx_appearances_player ON appearances (player_id, date);
+CREATE INDEX idx_appearances_player_name ON appearances (player_name, appearance_id);
+
+-- clubs: search_clubs_by_competition ORDER BY total_market_value DESC
+CREATE INDEX idx_clubs_competition ON clubs (domestic_competition_id, total_market_value);
+
+-- games: pages sorted by date; search_games_by_club (home_club_id OR away_club_id) ORDER BY date
+CREATE INDEX idx_games_date ON games (date, game_id);
+CREATE INDEX idx_games_home_club ON games (home_club_id, date);
+CREATE INDEX idx_games_away_club ON games (away_club_id, date);
+
+-- game_events: search_events_by_game ORDER BY minute, type (the game_event_id tiebreaker
+-- comes with 003_game_event_id)
+CREATE INDEX idx_game_events_game ON game_events (game_id, minute, type);
+
+-- club_games: search_all_club_games_by_club ORDER BY game_id DESC
+CREATE INDEX idx_club_games_club ON club_games (club_id, game_id);
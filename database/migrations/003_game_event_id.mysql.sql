@@ -0,0 +1,10 @@
+-- File: database/migrations/003_game_event_id.mysql.sql
+-- Description: Unique key for game_events. (game_id, minute, type) is not unique (two
+--              substitutions in the same minute), so keyset pages, upserts, the CSV sync
+--              and deletes need game_event_id. Existing rows get a random id.
+--              idx_game_events_game needs no change: InnoDB secondary indexes end with
+--              the primary key, so (game_id, minute, type) already sorts by game_event_id.
+
+ALTER TABLE game_events ADD COLUMN game_event_id VARCHAR(64) FIRST;
+UPDATE game_events SET game_event_id = REPLACE(UUID(), '-', '') WHERE game_event_id IS NULL;
+ALTER TABLE game_events MODIFY game_event_id VARCHAR(64) NOT NULL FIRST, ADD PRIMARY KEY (game_event_id);
@@ -0,0 +1,11 @@
+-- File: database/migrations/003_game_event_id.sqlite.sql
+-- Description: SQLite version of 003_game_event_id.mysql.sql. A primary key cannot be
+--              added to an existing SQLite table, so the new column gets a UNIQUE index
+--              (skipped when schema.sql already made it the primary key). The page/keyset
+--              index gets game_event_id as its last column.
+
+ALTER TABLE game_events ADD COLUMN game_event_id VARCHAR(64);
+UPDATE game_events SET game_event_id = lower(hex(randomblob(16))) WHERE game_event_id IS NULL;
+CREATE UNIQUE INDEX ux_game_events_id ON game_events (game_event_id);
+DROP INDEX IF EXISTS idx_game_events_game;
+CREATE INDEX idx_game_events_game ON game_events (game_id, minute, type, game_event_id);
@@ -1,8 +1,18 @@
 -- File: database/schema.sql
 -- Author: Hasan Özgür Çağan
--- Description: SQL schema for the "Players" table in the Moneyball project.
+-- Description: SQL schema for the Moneyball project tables.
 --              Defines all relational attributes used by the Flask backend model.
---              Each column corresponds directly to attributes in the Players Python class.
+--              Each column corresponds directly to attributes in the Models/ Python classes.
+--              Table names match the names used in services/*.py.
+--
+-- Search: every table searched from the UI has a FULLTEXT index using the
+-- ngram parser (see services/search.py). The column list of each index must
+-- match the "text" entry of the service's SEARCH_FIELDS exactly.
+--
+-- Indexes: every INDEX below serves a service query (filter column first, then
+-- the ORDER BY / keyset sort columns); `python benchmark.py --explain` checks that
+-- each service query uses one. Existing databases get new indexes through
+-- database/migrations/ (python migrate.py).
 
 ------------------------------------------------------------
 -- TABLE: Players
@@ -10,7 +20,7 @@
 --          information, career stats, and market values.
 ------------------------------------------------------------
 
-CREATE TABLE Players (
+CREATE TABLE IF NOT EXISTS players (
     player_id INTEGER PRIMARY KEY,                    -- Unique identifier for each player
     first_name VARCHAR(255),                          -- Player's first name
     last_name VARCHAR(255),                           -- Player's last name
@@ -33,13 +43,16 @@ CREATE TABLE Players (
     image_url TEXT,                                   -- URL to player's image
     url TEXT,                                         -- Profile URL (e.g. Transfermarkt page)
     current_club_domestic_competition_id VARCHAR(50), -- League/competition ID (e.g. GB1, TR1)
-    current_club_name VARCHAR(255)                    -- Name of current club
+    current_club_name VARCHAR(255),                   -- Name of current club
+    INDEX idx_players_name (name, player_id),                       -- get_all_players ORDER BY name
+    INDEX idx_players_current_club (current_club_id, market_value_in_eur),  -- competition market value (covering)
+    FULLTEXT INDEX ft_players_search (name, player_code, country_of_birth, position) WITH PARSER ngram
 );
 
 -- =========================================
 -- TABLE: Competitions
 -- =========================================
-CREATE TABLE IF NOT EXISTS Competitions (
+CREATE TABLE IF NOT EXISTS competitions (
     competition_id        VARCHAR(16) PRIMARY KEY,  -- ör: GB1, CL, IT1 (harf/rakam)
     competition_code      VARCHAR(64),             -- slug: premier-league, cl, ...
     name                  VARCHAR(128),            -- display name
@@ -49,15 +62,16 @@ CREATE TABLE IF NOT EXISTS Competitions (
     country_name          VARCHAR(64),
     domestic_league_code  VARCHAR(16),             -- ör: GB1, ES1
     confederation         VARCHAR(32),             -- UEFA, CONMEBOL, europa (csv’de böyle geçiyor)
-    url                   TEXT
+    url                   TEXT,
+    FULLTEXT INDEX ft_competitions_search (name, country_name) WITH PARSER ngram
 );
 
 -- =========================================
--- TABLE: PlayerValuations
+-- TABLE: player_valuations
 -- Purpose: Historical market values (time series) per player.
 -- PK: (player_id, date)
 -- =========================================
-CREATE TABLE IF NOT EXISTS PlayerValuations (
+CREATE TABLE IF NOT EXISTS player_valuations (
     player_id                             INTEGER      NOT NULL,
     last_season                           INTEGER,
     datetime                              TIMESTAMP,   -- e.g. 2003-12-09 00:00:00
@@ -67,12 +81,16 @@ CREATE TABLE IF NOT EXISTS PlayerValuations (
     n                                     INTEGER,     -- sequence/index in original source
     current_club_id                       INTEGER,
     player_club_domestic_competition_id   VARCHAR(16), -- e.g. TR1, GB1, IT1
-    PRIMARY KEY (player_id, date)
+    PRIMARY KEY (player_id, date),                 -- get_valuations_by_player
+    INDEX idx_player_valuations_date (date, player_id)   -- page/keyset sort by date
     -- FOREIGN KEY (player_id) REFERENCES Players(player_id)
     -- FOREIGN KEY (current_club_id) REFERENCES Clubs(club_id)
 );
 
-CREATE TABLE IF NOT EXISTS Appearances (
+-- =========================================
+-- TABLE: appearances
+-- =========================================
+CREATE TABLE IF NOT EXISTS appearances (
     appearance_id VARCHAR(255) PRIMARY KEY,
     game_id INTEGER,
     player_id INTEGER,
@@ -84,8 +102,106 @@ CREATE TABLE IF NOT EXISTS Appearances (
     yellow_cards INTEGER DEFAULT 0,
     red_cards INTEGER DEFAULT 0,
     assists INTEGER DEFAULT 0,
-    minutes_played INTEGER DEFAULT 0
+    minutes_played INTEGER DEFAULT 0,
+    INDEX idx_appearances_player (player_id, date),                 -- search_appearances_by_player
+    INDEX idx_appearances_player_name (player_name, appearance_id), -- page/keyset sort
+    FULLTEXT INDEX ft_appearances_search (player_name) WITH PARSER ngram
 
     -- FOREIGN KEY (player_id) REFERENCES Players(player_id),
     -- FOREIGN KEY (competition_id) REFERENCES Competitions(competition_id)
 );
+
+-- =========================================
+-- TABLE: clubs
+-- =========================================
+CREATE TABLE IF NOT EXISTS clubs (
+    club_id                  INTEGER PRIMARY KEY,
+    club_code                VARCHAR(255),
+    name                     VARCHAR(255),
+    domestic_competition_id  VARCHAR(16),
+    total_market_value       BIGINT,
+    squad_size               INTEGER,
+    average_age              DECIMAL(4, 1),
+    foreigners_number        INTEGER,
+    foreigners_percentage    DECIMAL(5, 1),
+    national_team_players    INTEGER,
+    stadium_name             VARCHAR(255),
+    stadium_seats            INTEGER,
+    net_transfer_record      VARCHAR(32),      -- e.g. €-450k, +€1.30m
+    coach_name               VARCHAR(255),
+    last_season              INTEGER,
+    url                      TEXT,
+    INDEX idx_clubs_competition (domestic_competition_id, total_market_value),  -- search_clubs_by_competition
+    FULLTEXT INDEX ft_clubs_search (name, stadium_name, coach_name) WITH PARSER ngram
+);
+
+-- =========================================
+-- TABLE: games
+-- =========================================
+CREATE TABLE IF NOT EXISTS games (
+    game_id                  INTEGER PRIMARY KEY,
+    competition_id           VARCHAR(16),
+    season                   INTEGER,
+    round                    VARCHAR(64),
+    date                     DATE,
+    home_club_id             INTEGER,
+    away_club_id             INTEGER,
+    home_club_goals          INTEGER,
+    away_club_goals          INTEGER,
+    home_club_position       INTEGER,
+    away_club_position       INTEGER,
+    home_club_manager_name   VARCHAR(255),
+    away_club_manager_name   VARCHAR(255),
+    stadium                  VARCHAR(255),
+    attendance               INTEGER,
+    referee                  VARCHAR(255),
+    url                      TEXT,
+    home_club_name           VARCHAR(255),
+    away_club_name           VARCHAR(255),
+    aggregate                VARCHAR(16),
+    competition_type         VARCHAR(64),
+    INDEX idx_games_date (date, game_id),                           -- page/keyset sort by date
+    INDEX idx_games_home_club (home_club_id, date),                 -- search_games_by_club
+    INDEX idx_games_away_club (away_club_id, date),                 -- search_games_by_club
+    FULLTEXT INDEX ft_games_search (home_club_name, away_club_name, stadium) WITH PARSER ngram
+);
+
+-- =========================================
+-- TABLE: game_events
+-- PK: game_event_id (from the Transfermarkt dump; generated when a row has none).
+-- (game_id, minute, type) is not unique: two substitutions in the same minute
+-- are two rows.
+-- =========================================
+CREATE TABLE IF NOT EXISTS game_events (
+    game_event_id  VARCHAR(64) PRIMARY KEY,
+    game_id        INTEGER NOT NULL,
+    minute         INTEGER NOT NULL,
+    type           VARCHAR(32) NOT NULL,   -- Goals, Cards, Substitutions, Shootout
+    club_id        INTEGER,
+    player_id      INTEGER,
+    description    TEXT,
+    player_in_id   INTEGER,
+    INDEX idx_game_events_game (game_id, minute, type, game_event_id),  -- search_events_by_game, page/keyset sort
+    FULLTEXT INDEX ft_game_events_search (description) WITH PARSER ngram
+);
+
+-- =========================================
+-- TABLE: club_games
+-- PK: (game_id, club_id) - one row per club per game
+-- =========================================
+CREATE TABLE IF NOT EXISTS club_games (
+    game_id                 INTEGER NOT NULL,
+    club_id                 INTEGER NOT NULL,
+    own_goals               INTEGER,
+    own_position            INTEGER,
+    own_manager_name        VARCHAR(255),
+    opponent_id             INTEGER,
+    opponent_goals          INTEGER,
+    opponent_position       INTEGER,
+    opponent_manager_name   VARCHAR(255),
+    hosting                 VARCHAR(8),     -- Home | Away
+    is_win                  TINYINT,
+    PRIMARY KEY (game_id, club_id),
+    INDEX idx_club_games_club (club_id, game_id),                   -- search_all_club_games_by_club
+    FULLTEXT INDEX ft_club_games_search (own_manager_name, opponent_manager_name) WITH PARSER ngram
+);
@@ -0,0 +1,77 @@
+# File: export_data.py
+# Description: Streams a table (or a filtered view of it) to CSV, Parquet or Arrow.
+#              Rows are read through a server-side cursor and written chunk by chunk,
+#              so memory use does not depend on the table size.
+#
+# Usage:
+#   python export_data.py appearances                              # -> appearances.csv
+#   python export_data.py playervaluations --gzip --where player_id=28003
+#   python export_data.py game_events --format parquet -o events.parquet   # needs pyarrow
+#   python export_data.py games --columns game_id,date,stadium --where season__gte=2020 --sort date
+#
+# Filters use the /api syntax: column=value or column__op=value (op: ne, gt, gte, lt, lte, in).
+
+import argparse
+
+from main import TABLE_REGISTRY
+from services import table_query
+from services.export import FORMATS, export_to_file, file_name
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export a table to CSV, Parquet or Arrow.")
+    parser.add_argument('table', choices=list(TABLE_REGISTRY), help="table to export")
+    parser.add_argument('-o', '--output', help="output file (default: <table>.<format>[.gz])")
+    parser.add_argument('--format', choices=FORMATS, default='csv', help="output format (default: csv)")
+    parser.add_argument('--gzip', action='store_true',
+                        help="gzip the output (Parquet uses the gzip codec instead of snappy)")
+    parser.add_argument('--columns', help="comma separated columns to export (default: all)")
+    parser.add_argument('--where', action='append', default=[], metavar='COLUMN[__OP]=VALUE',
+                        help="filter, may be repeated")
+    parser.add_argument('-q', '--search', default='', help="search term, as in the table view")
+    parser.add_argument('--sort', help="sort column (default: primary key)")
+    parser.add_argument('--order', choices=('asc', 'desc'), default='asc')
+    parser.add_argument('--limit', type=int, help="export at most this many rows")
+    parser.add_argument('--batch-size', type=int, default=5000, help="rows fetched per chunk (default: 5000)")
+    return parser.parse_args(argv)
+
+
+def _where_args(items):
+    where = {}
+    for item in items:
+        name, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f"Expected COLUMN=VALUE, got: {item}")
+        where[name] = value
+    return where
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    services = TABLE_REGISTRY[args.table]
+    try:
+        columns = table_query.parse_columns(args.columns, services['columns'])
+        filters = table_query.parse_filters(_where_args(args.where), services['columns'])
+        if args.sort and args.sort not in services['columns']:
+            raise ValueError(f"Unknown sort column: {args.sort}")
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+
+    output = args.output or file_name(args.table, args.format, args.gzip)
+    batches = services['stream'](
+        columns=columns, filters=filters, search_term=args.search.strip(), sort_by=args.sort,
+        ascending=args.order == 'asc', limit=args.limit, batch_size=args.batch_size,
+    )
+    try:
+        stats = export_to_file(batches, services['table'], table_query.output_columns(services, columns), output,
+                               args.format, args.gzip)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+    print(f"{args.table}: {stats} -> {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+# File: import_data.py
+# Description: Bulk import of the Transfermarkt CSV files in data/ into MySQL.
+#
+# Usage:
+#   python import_data.py                                  # every table found in data/
+#   python import_data.py --tables clubs competitions --batch-size 10000
+#   python import_data.py --method load-data --workers 8   # LOAD DATA LOCAL INFILE
+#   python import_data.py --tables player_valuations --upsert   # re-run over an overlapping snapshot
+#   python import_data.py --tables appearances --parse-workers 8   # parse CSV chunks on 8 processes
+#   python import_data.py --clean --reject-report rejected.csv   # pandas cleaning stage
+#   python import_data.py --sync                           # only write rows changed since the last sync
+#   python import_data.py --sync --dry-run                 # report the diff without writing
+#   python import_data.py --sync --clean                   # clean the rows before diffing them
+#
+# See importer/tables.py for the file -> table mapping.
+
+import argparse
+
+from importer.loader import METHODS, print_summary, run_import
+from importer.sync import STATE_DIR, print_sync_summary, run_sync
+from importer.tables import TABLES
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-load Transfermarkt CSV files into MySQL.")
+    parser.add_argument('--data-dir', default='data', help="directory with the CSV files (default: data)")
+    parser.add_argument('--tables', nargs='+', choices=list(TABLES), help="tables to load (default: all)")
+    parser.add_argument('--batch-size', type=int, default=5000, help="rows per INSERT batch (default: 5000)")
+    parser.add_argument('--workers', type=int, default=4, help="tables loaded in parallel (default: 4)")
+    parser.add_argument('--method', choices=METHODS, default='executemany',
+                        help="executemany (batched INSERT) or load-data (LOAD DATA LOCAL INFILE)")
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="processes parsing CSV chunks for executemany (default: 0, parse in the loader thread)")
+    parser.add_argument('--clean', action='store_true',
+                        help="normalize nulls, money strings, numbers and dates before writing (executemany)")
+    parser.add_argument('--reject-report', default='rejected_rows.csv',
+                        help="with --clean, CSV file for rows that fail cleaning (default: rejected_rows.csv)")
+    parser.add_argument('--upsert', action='store_true',
+                        help="update rows whose primary key already exists instead of failing")
+    parser.add_argument('--sync', action='store_true',
+                        help="incremental sync: insert/update/delete only rows changed since the last sync")
+    parser.add_argument('--state-dir', default=STATE_DIR,
+                        help=f"where --sync keeps its per-table row hashes (default: {STATE_DIR})")
+    parser.add_argument('--dry-run', action='store_true', help="with --sync, report the diff without writing")
+    parser.add_argument('--progress-interval', type=float, default=2.0,
+                        help="seconds between progress lines (default: 2)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.sync:
+        results, elapsed = run_sync(
+            data_dir=args.data_dir,
+            tables=args.tables,
+            state_dir=args.state_dir,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            dry_run=args.dry_run,
+            reject_report=args.reject_report if args.clean else None,
+        )
+        print_sync_summary(results, elapsed)
+        if any(stats['rejected'] for stats in results):
+            print(f"Rejected rows written to {args.reject_report}")
+        return 0 if all('error' not in stats for stats in results) else 1
+
+    results, elapsed = run_import(
+        data_dir=args.data_dir,
+        tables=args.tables,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        method=args.method,
+        progress_interval=args.progress_interval,
+        upsert=args.upsert,
+        parse_workers=args.parse_workers,
+        reject_report=args.reject_report if args.clean else None,
+    )
+    print_summary(results, elapsed)
+    if any(stats['rejected'] for stats in results):
+        print(f"Rejected rows written to {args.reject_report}")
+    return 0 if all(stats['failed'] == 0 and 'error' not in stats for stats in results) else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,186 @@
+# File: importer/cleaning.py
+# Description: Optional cleaning stage of the import pipeline (import_data.py --clean).
+#              Batches read from the CSV files are turned into a DataFrame and fixed
+#              column by column with pandas, instead of cell by cell in Python:
+#                - 'null', 'None', 'nan', '' ... -> NULL
+#                - money shorthand (€-450k, +€1.30m, +-0) -> integer euros
+#                - integer / decimal / date / datetime columns are coerced
+#              Rows with a value that cannot be coerced, or without a primary key, are
+#              rejected and written to a CSV report instead of failing a whole batch.
+#              Headerless files (data/c.csv) are already read positionally in the
+#              Models.ClubGames field order (== CLUB_GAME_COLUMNS) by importer.reader.
+
+import csv
+import json
+import threading
+
+import pandas as pd
+
+from importer.reader import read_range
+from importer.tables import TABLES, generate_keys
+
+NULL_TOKENS = ['', 'null', 'NULL', 'Null', 'None', 'none', 'nan', 'NaN', 'N/A', 'n/a']
+
+MONEY_PATTERN = r'^\+?(-?)\+?(\d+(?:\.\d+)?)(k|m|bn)?$'
+MONEY_UNITS = {'': 1, 'k': 1_000, 'm': 1_000_000, 'bn': 1_000_000_000}
+
+# Metin dışındaki sütunlar; burada olmayan her sütun metin olarak kalır
+COLUMN_TYPES = {
+    'players': {
+        'int': ['player_id', 'last_season', 'current_club_id', 'height_in_cm'],
+        'money': ['market_value_in_eur', 'highest_market_value_in_eur'],
+        'date': ['date_of_birth', 'contract_expiration_date'],
+    },
+    'competitions': {
+        'int': ['country_id'],
+    },
+    'player_valuations': {
+        'int': ['player_id', 'last_season', 'n', 'current_club_id'],
+        'money': ['market_value_in_eur'],
+        'date': ['date', 'dateweek'],
+        'datetime': ['datetime'],
+    },
+    'appearances': {
+        'int': ['game_id', 'player_id', 'player_club_id', 'player_current_club_id',
+                'yellow_cards', 'red_cards', 'assists', 'minutes_played'],
+        'date': ['date'],
+    },
+    'clubs': {
+        'int': ['club_id', 'squad_size', 'foreigners_number', 'national_team_players',
+                'stadium_seats', 'last_season'],
+        'decimal': ['average_age', 'foreigners_percentage'],
+        # net_transfer_record şemada metindir (VARCHAR, '€-450k'); --clean ile de değişmeden kalır
+        'money': ['total_market_value'],
+    },
+    'games': {
+        'int': ['game_id', 'season', 'home_club_id', 'away_club_id', 'home_club_goals',
+                'away_club_goals', 'home_club_position', 'away_club_position', 'attendance'],
+        'date': ['date'],
+    },
+    'game_events': {
+        'int': ['game_id', 'minute', 'club_id', 'player_id', 'player_in_id'],
+    },
+    'club_games': {
+        'int': ['game_id', 'club_id', 'own_goals', 'own_position', 'opponent_id',
+                'opponent_goals', 'opponent_position', 'is_win'],
+    },
+}
+
+
+def normalize_nulls(series):
+    return series.where(~series.isin(NULL_TOKENS) & series.notna(), None)
+
+
+def parse_money(series):
+    """'€-450k', '+€1.30m', '+-0', '1500000' -> tam sayı euro (Int64); okunamayan -> NA."""
+    parts = series.str.replace('€', '', regex=False).str.strip().str.extract(MONEY_PATTERN)
+    amount = pd.to_numeric(parts[1], errors='coerce')
+    unit = parts[2].fillna('').map(MONEY_UNITS)
+    sign = parts[0].map({'-': -1, '': 1})
+    return (sign * amount * unit).round().astype('Int64')
+
+
+def parse_int(series):
+    number = pd.to_numeric(series.str.strip(), errors='coerce')
+    # 3.0 kabul edilir, 2.5 edilmez
+    number = number.where(number % 1 == 0)
+    return number.astype('Int64')
+
+
+def parse_decimal(series):
+    return pd.to_numeric(series.str.strip(), errors='coerce')
+
+
+def parse_date(series, fmt='%Y-%m-%d'):
+    parsed = pd.to_datetime(series.str.strip(), errors='coerce', format='ISO8601')
+    return parsed.dt.strftime(fmt)
+
+
+PARSERS = {
+    'int': parse_int,
+    'decimal': parse_decimal,
+    'money': parse_money,
+    'date': parse_date,
+    'datetime': lambda series: parse_date(series, '%Y-%m-%d %H:%M:%S'),
+}
+
+
+def clean_frame(table_name, frame):
+    """
+    DataFrame'i (tüm sütunlar metin) temizler.
+    (temiz DataFrame, her satır için red sebebi Series'i — '' ise satır geçerli) döndürür.
+    """
+    frame = frame.apply(normalize_nulls)
+    reasons = pd.Series('', index=frame.index, dtype=object)
+    for col in TABLES[table_name]['primary_key']:
+        reasons = reasons.mask(frame[col].isna(), reasons + f"{col}: missing primary key; ")
+
+    for kind, columns in COLUMN_TYPES.get(table_name, {}).items():
+        for col in columns:
+            raw = frame[col]
+            parsed = PARSERS[kind](raw.astype('string'))
+            invalid = raw.notna() & parsed.isna()
+            reasons = reasons.mask(invalid, reasons + f"{col}: invalid {kind}; ")
+            frame[col] = parsed
+
+    return frame, reasons.str.rstrip('; ')
+
+
+def clean_batch(table_name, columns, rows):
+    """
+    read_batches/read_range'den gelen tuple listesini temizler.
+    (temiz tuple listesi, [(sebep, ham satır dict'i)]) döndürür.
+    """
+    if not rows:
+        return [], []
+    frame = pd.DataFrame.from_records(rows, columns=columns).astype(object)
+    frame, reasons = clean_frame(table_name, frame)
+    valid = (reasons == '').to_numpy()
+
+    rejected = [(reasons.iat[i], dict(zip(columns, rows[i]))) for i in (~valid).nonzero()[0]]
+    frame = frame[valid]
+    # numpy/pandas tipleri PyMySQL'in tanıdığı int/float/str/None'a çevrilir
+    values = [frame[col].astype(object).where(frame[col].notna(), None).tolist() for col in columns]
+    return list(zip(*values)), rejected
+
+
+def clean_range(table_name, path, index, start, end, generate_key=False):
+    """read_range + clean_batch; process pool'da çalışır. generate_key: bkz. tables.key_is_generated."""
+    columns = TABLES[table_name]['columns']
+    rows = read_range(path, index, start, end)
+    if generate_key:
+        rows = generate_keys(table_name, rows)
+    return clean_batch(table_name, columns, rows)
+
+
+class RejectReport:
+    """Reddedilen satırları CSV'ye yazar (table, file, reason, values). Thread-safe."""
+
+    def __init__(self, path):
+        self.path = path
+        self.counts = {}
+        self._lock = threading.Lock()
+        self._file = None
+        self._writer = None
+
+    def add(self, table_name, source, rejected):
+        with self._lock:
+            self.counts[table_name] = self.counts.get(table_name, 0) + len(rejected)
+            if not rejected:
+                return
+            if self._writer is None:
+                self._file = open(self.path, 'w', newline='', encoding='utf-8')
+                self._writer = csv.writer(self._file)
+                self._writer.writerow(['table', 'file', 'reason', 'values'])
+            for reason, values in rejected:
+                self._writer.writerow([table_name, source, reason, json.dumps(values, ensure_ascii=False)])
+
+    def count(self, table_name):
+        with self._lock:
+            return self.counts.get(table_name, 0)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
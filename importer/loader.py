@@ -0,0 +1,315 @@
+# File: importer/loader.py
+# Description: Bulk CSV -> database loader used by import_data.py (MySQL, or SQLite
+#              with MONEYBALL_DB_BACKEND=sqlite; see Database.py).
+#              Each table is loaded on its own (unpooled) connection; tables run in
+#              parallel on a thread pool. Two write methods:
+#                - executemany: batched multi-row INSERTs, one commit per batch
+#                - load-data:   LOAD DATA LOCAL INFILE, one statement per file (MySQL only)
+#              With upsert=True existing keys are updated instead of failing
+#              (ON DUPLICATE KEY UPDATE / LOAD DATA ... REPLACE), so re-running an
+#              import over an overlapping snapshot is idempotent. Upsert needs the key
+#              to be a primary key / unique index and every file to carry its columns.
+#              With parse_workers > 0 the executemany path parses each file in
+#              line-aligned byte-range chunks on a shared process pool; parsed chunks
+#              reach the table's writer through a bounded window of pending chunks,
+#              so parsing uses every core while memory stays capped.
+#              With a RejectReport (--clean) every batch goes through the pandas
+#              cleaning stage in importer/cleaning.py first (inside the process pool
+#              when there is one); rejected rows are reported, the rest are written.
+#              Progress is printed while loading, followed by a rows/s summary.
+
+import collections
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import pymysql
+
+from Database import db
+from importer.cleaning import RejectReport, clean_batch, clean_range
+from importer.reader import CHUNK_BYTES, chunk_ranges, read_batches, read_header, read_range
+from importer.tables import TABLES, generate_keys, key_is_generated, table_files
+from services.bulk import require_unique_key, upsert_clause
+from services.cache import result_cache
+
+METHODS = ('executemany', 'load-data')
+
+
+class Progress:
+    """Thread-safe satır sayaçları; en fazla `interval` saniyede bir ilerleme yazar."""
+
+    def __init__(self, interval=2.0):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._started = {}
+        self._last_report = 0.0
+
+    def start(self, table_name):
+        with self._lock:
+            self._rows[table_name] = 0
+            self._started[table_name] = time.monotonic()
+
+    def add(self, table_name, rows):
+        with self._lock:
+            self._rows[table_name] += rows
+            now = time.monotonic()
+            if now - self._last_report < self.interval:
+                return
+            self._last_report = now
+            parts = []
+            for name, count in self._rows.items():
+                elapsed = max(now - self._started[name], 1e-9)
+                parts.append(f"{name}: {count:,} ({count / elapsed:,.0f} rows/s)")
+        print("  " + " | ".join(parts), flush=True)
+
+
+def _insert_query(table_name, columns, primary_key=None):
+    placeholders = ', '.join(['%s'] * len(columns))
+    query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+    if primary_key:
+        query = f"{query} {upsert_clause(table_name, columns, primary_key)}"
+    return query
+
+
+def parallel_chunks(path, columns, parse_pool, parse=read_range, max_pending=None, chunk_bytes=CHUNK_BYTES):
+    """
+    Dosyayı bayt aralıklarına bölüp her aralığı parse_pool'da `parse(path, index, start, end)`
+    ile ayrıştırır ve sonuçları sırayla döndürür. En fazla `max_pending` aralık
+    (varsayılan: 2 × çekirdek) aynı anda bekler (sınırlı kuyruk).
+    """
+    index, ranges = chunk_ranges(path, columns, chunk_bytes)
+    max_pending = max_pending or 2 * (os.cpu_count() or 1)
+    pending = collections.deque()
+    ranges = iter(ranges)
+    while True:
+        for start, end in ranges:
+            pending.append(parse_pool.submit(parse, path, index, start, end))
+            if len(pending) >= max_pending:
+                break
+        if not pending:
+            return
+        yield pending.popleft().result()
+
+
+def _read_batches(table_name, columns, path, batch_size, parse_pool=None, report=None):
+    """
+    Dosyanın `batch_size` satırlık batch'leri: parse_pool varsa paralel ayrıştırılır,
+    report varsa temizlenir ve reddedilen satırlar rapora yazılır. Dosyada anahtar sütunu
+    yoksa (bkz. tables.key_is_generated) satırlara temizlemeden önce anahtar üretilir.
+    """
+    generate = key_is_generated(table_name, path)
+    if parse_pool is not None:
+        parse = partial(clean_range, table_name, generate_key=generate) if report is not None else read_range
+        chunks = parallel_chunks(path, columns, parse_pool, parse)
+    else:
+        chunks = read_batches(path, columns, batch_size)
+        if report is not None:
+            chunks = (clean_batch(table_name, columns, generate_keys(table_name, batch) if generate else batch)
+                      for batch in chunks)
+
+    for rows in chunks:
+        if report is not None:
+            rows, rejected = rows
+            report.add(table_name, path, rejected)
+        elif generate:
+            rows = generate_keys(table_name, rows)
+        for start in range(0, len(rows), batch_size):
+            yield rows[start:start + batch_size]
+
+
+def _insert_batches(conn, table_name, columns, path, batch_size, progress, primary_key=None,
+                    parse_pool=None, report=None):
+    """
+    executemany ile toplu ekleme (primary_key verilirse upsert).
+    Hatalı batch geri alınır ve sayılır, yükleme devam eder.
+    """
+    query = _insert_query(table_name, columns, primary_key)
+    batches = _read_batches(table_name, columns, path, batch_size, parse_pool, report)
+    loaded = failed = 0
+    cursor = conn.cursor()
+    try:
+        for batch in batches:
+            try:
+                cursor.executemany(query, batch)
+                conn.commit()
+                loaded += len(batch)
+            except pymysql.MySQLError as e:
+                conn.rollback()
+                failed += len(batch)
+                print(f"Error ({table_name}, {path}): {e}")
+            progress.add(table_name, len(batch))
+    finally:
+        cursor.close()
+    return loaded, failed
+
+
+def _load_data_query(table_name, columns, path, replace=False):
+    """
+    LOAD DATA LOCAL INFILE sorgusu; CSV sütunları kullanıcı değişkenleriyle tablo sütunlarına eşlenir.
+    Dosyada anahtar sütunu yoksa anahtar tablonun 'key_sql' ifadesiyle üretilir.
+    """
+    header, _ = read_header(path, columns)
+    csv_columns = header if header is not None else columns
+
+    targets, assignments = [], []
+    for i, name in enumerate(csv_columns):
+        name = name.strip()
+        if name in columns:
+            targets.append(f"@c{i}")
+            assignments.append(f"{name} = NULLIF(@c{i}, '')")
+        else:
+            targets.append("@skip")
+    if key_is_generated(table_name, path):
+        assignments.append(f"{TABLES[table_name]['primary_key'][0]} = {TABLES[table_name]['key_sql']}")
+
+    with open(path, 'rb') as f:
+        line_end = '\\r\\n' if f.readline().endswith(b'\r\n') else '\\n'
+
+    return f"""
+        LOAD DATA LOCAL INFILE %s {'REPLACE ' if replace else ''}INTO TABLE {table_name}
+        CHARACTER SET utf8mb4
+        FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"' ESCAPED BY ''
+        LINES TERMINATED BY '{line_end}'
+        IGNORE {1 if header is not None else 0} LINES
+        ({', '.join(targets)})
+        SET {', '.join(assignments)}
+    """
+
+
+def _load_data_infile(conn, table_name, columns, path, progress, replace=False):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(_load_data_query(table_name, columns, path, replace), (path,))
+        loaded = cursor.rowcount
+        conn.commit()
+    except pymysql.MySQLError as e:
+        conn.rollback()
+        print(f"Error ({table_name}, {path}): {e}")
+        return 0, 0
+    finally:
+        cursor.close()
+    progress.add(table_name, loaded)
+    return loaded, 0
+
+
+def load_table(table_name, data_dir, batch_size=5000, method='executemany', progress=None,
+               upsert=False, parse_pool=None, report=None):
+    """
+    Tek bir tablonun tüm CSV dosyalarını yükler. upsert=True ise var olan anahtarlar güncellenir,
+    parse_pool verilirse (executemany) dosyalar o process pool'da ayrıştırılır, report
+    (RejectReport) verilirse satırlar temizlenir.
+    {'table', 'files', 'rows', 'failed', 'rejected', 'seconds'} sözlüğü döndürür.
+    """
+    progress = progress or Progress()
+    spec = TABLES[table_name]
+    paths = table_files(data_dir, table_name)
+    stats = {'table': table_name, 'files': len(paths), 'rows': 0, 'failed': 0, 'rejected': 0, 'seconds': 0.0}
+    if not paths:
+        return stats
+    if upsert:
+        _check_upsert(table_name, data_dir)
+
+    progress.start(table_name)
+    started = time.monotonic()
+    conn = db.connect(local_infile=True) if method == 'load-data' else db.connect()
+    try:
+        for path in paths:
+            if method == 'load-data':
+                loaded, failed = _load_data_infile(conn, table_name, spec['columns'], path, progress,
+                                                   replace=upsert)
+            else:
+                loaded, failed = _insert_batches(conn, table_name, spec['columns'], path, batch_size, progress,
+                                                 spec['primary_key'] if upsert else None, parse_pool, report)
+            stats['rows'] += loaded
+            stats['failed'] += failed
+    finally:
+        conn.close()
+        # Uygulamanın önbellekteki sonuçları yeni veriyi görsün
+        result_cache.invalidate(table_name)
+
+    if report is not None:
+        stats['rejected'] = report.count(table_name)
+    stats['seconds'] = time.monotonic() - started
+    return stats
+
+
+def run_import(data_dir='data', tables=None, batch_size=5000, workers=4, method='executemany',
+               progress_interval=2.0, upsert=False, parse_workers=0, reject_report=None):
+    """
+    Seçilen tabloları (varsayılan: hepsi) `workers` paralel iş parçacığıyla yükler.
+    parse_workers > 0 ise CSV ayrıştırma tüm tablolar için ortak bir process pool'da yapılır.
+    reject_report bir dosya yolu ise satırlar temizlenir, reddedilenler o dosyaya yazılır.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method} (expected one of {', '.join(METHODS)})")
+    if reject_report and method != 'executemany':
+        raise ValueError("The cleaning stage needs the executemany method")
+    if method == 'load-data' and db.backend != 'mysql':
+        raise ValueError(f"The load-data method needs MySQL (database backend: {db.backend})")
+    tables = [name for name in (tables or TABLES) if table_files(data_dir, name)]
+    progress = Progress(progress_interval)
+
+    parse_pool = None
+    if parse_workers > 0 and method == 'executemany':
+        parse_pool = ProcessPoolExecutor(max_workers=parse_workers)
+
+    report = RejectReport(reject_report) if reject_report else None
+
+    started = time.monotonic()
+    try:
+        results = _load_tables(tables, data_dir, batch_size, workers, method, progress, upsert,
+                               parse_pool, report)
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown()
+        if report is not None:
+            report.close()
+    return results, time.monotonic() - started
+
+
+def _check_upsert(table_name, data_dir):
+    """
+    Upsert ancak anahtar tabloda benzersizse ve her dosyada anahtar sütunu varsa satırları
+    günceller; yoksa (üretilen anahtarlar hiç çakışmaz) her satır yeniden eklenirdi. ValueError.
+    """
+    primary_key = TABLES[table_name]['primary_key']
+    require_unique_key(table_name, primary_key)
+    for path in table_files(data_dir, table_name):
+        if key_is_generated(table_name, path):
+            raise ValueError(f"Cannot upsert {path}: the file has no {', '.join(primary_key)} column")
+
+
+def _load_tables(tables, data_dir, batch_size, workers, method, progress, upsert, parse_pool, report):
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [
+            pool.submit(load_table, name, data_dir, batch_size, method, progress, upsert, parse_pool, report)
+            for name in tables
+        ]
+        results = []
+        for name, future in zip(tables, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"Error (load_table {name}): {e}")
+                results.append({'table': name, 'files': 0, 'rows': 0, 'failed': 0, 'rejected': 0,
+                                'seconds': 0.0, 'error': str(e)})
+    return results
+
+
+def print_summary(results, elapsed):
+    print()
+    print(f"{'table':<20}{'rows':>12}{'failed':>10}{'rejected':>10}{'seconds':>10}{'rows/s':>12}")
+    total_rows = total_failed = total_rejected = 0
+    for stats in results:
+        rate = stats['rows'] / stats['seconds'] if stats['seconds'] else 0
+        print(f"{stats['table']:<20}{stats['rows']:>12,}{stats['failed']:>10,}{stats['rejected']:>10,}"
+              f"{stats['seconds']:>10.2f}{rate:>12,.0f}")
+        total_rows += stats['rows']
+        total_failed += stats['failed']
+        total_rejected += stats['rejected']
+    rate = total_rows / elapsed if elapsed else 0
+    print(f"{'total':<20}{total_rows:>12,}{total_failed:>10,}{total_rejected:>10,}"
+          f"{elapsed:>10.2f}{rate:>12,.0f}")
@@ -0,0 +1,109 @@
+# File: importer/reader.py
+# Description: Streams a CSV file as batches of tuples in table column order.
+#              Files with a header are mapped by column name (extra CSV columns are
+#              dropped, missing ones become NULL); headerless files are read
+#              positionally in the table's column order.
+#              chunk_ranges/read_range split a file into line-aligned byte ranges that
+#              can be parsed independently (e.g. in a process pool). Quoted fields
+#              spanning several lines are not supported there; the dumps have none.
+
+import csv
+import io
+import itertools
+import os
+
+CHUNK_BYTES = 8 * 1024 * 1024
+
+
+def read_header(path, columns):
+    """
+    Returns (header, first_row): the CSV header if the file has one, otherwise
+    None and the first data row (so it is not lost).
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        first = next(csv.reader(f), None)
+    if first is None:
+        return None, None
+    if is_header(first, columns):
+        return first, None
+    return None, first
+
+
+def is_header(row, columns):
+    # Başlık satırı tablo sütun adlarından en az birini içerir, veri satırı içermez
+    return bool(set(cell.strip() for cell in row) & set(columns))
+
+
+def column_index(header, columns):
+    """Her tablo sütunu için CSV'deki konumu (başlıksız dosyada sıra aynıdır, yoksa None)."""
+    if header is None:
+        return list(range(len(columns)))
+    positions = {name.strip(): i for i, name in enumerate(header)}
+    return [positions.get(col) for col in columns]
+
+
+def _to_tuples(rows, index):
+    result = []
+    for row in rows:
+        if not row:
+            continue
+        size = len(row)
+        result.append(tuple(
+            row[i] if i is not None and i < size and row[i] != '' else None
+            for i in index
+        ))
+    return result
+
+
+def read_batches(path, columns, batch_size=5000):
+    """CSV dosyasını `batch_size` satırlık tuple listeleri olarak okur. Boş hücre -> None."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        first = next(reader, None)
+        if first is None:
+            return
+
+        if is_header(first, columns):
+            index = column_index(first, columns)
+            rows = reader
+        else:
+            index = column_index(None, columns)
+            rows = itertools.chain([first], reader)
+
+        while True:
+            chunk = list(itertools.islice(rows, batch_size))
+            if not chunk:
+                return
+            batch = _to_tuples(chunk, index)
+            if batch:
+                yield batch
+
+
+def chunk_ranges(path, columns, chunk_bytes=CHUNK_BYTES):
+    """
+    Dosyayı satır başlarına hizalı (start, end) bayt aralıklarına böler; başlık satırı
+    ilk aralığa dahil edilmez. (column_index sonucu, aralıklar) döndürür.
+    """
+    header, _ = read_header(path, columns)
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        start = len(f.readline()) if header is not None else 0
+        ranges = []
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            # Aralık sonu bir sonraki satır başına kaydırılır
+            f.readline()
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return column_index(header, columns), ranges
+
+
+def read_range(path, index, start, end):
+    """[start, end) bayt aralığındaki satırları tuple listesi olarak okur (process pool'da çalışır)."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    # BOM sadece dosya başında olabilir (başlıksız dosyanın ilk aralığı)
+    text = data.decode('utf-8-sig' if start == 0 else 'utf-8')
+    return _to_tuples(csv.reader(io.StringIO(text, newline='')), index)
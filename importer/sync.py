@@ -0,0 +1,230 @@
+# File: importer/sync.py
+# Description: Incremental CSV -> MySQL sync used by import_data.py --sync.
+#              Every row is hashed per primary key and the hashes are kept in a
+#              sidecar file (<state-dir>/<table>.json). The next run compares the
+#              new dump against it and only writes the difference:
+#                - new keys      -> inserted (upsert, so a diverged table is healed)
+#                - changed hash  -> updated  (same upsert statement)
+#                - missing keys  -> deleted
+#              The sidecar is rewritten only after the table's transaction commits,
+#              so a failed run is simply repeated in full next time.
+#              With a reject report (--sync --clean) rows go through the same cleaning
+#              stage as the importer; rejected rows are reported and their keys keep
+#              the previous state (neither updated nor deleted).
+#              The key must be a primary key / unique index of the table and every
+#              file must carry its columns; otherwise rows sharing a key would collapse
+#              in the diff and updates would append, so such tables are refused.
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pymysql
+
+from Database import db
+from importer.cleaning import RejectReport, clean_batch
+from importer.loader import _check_upsert, _insert_query
+from importer.reader import read_batches
+from importer.tables import TABLES, table_files
+from services.cache import result_cache
+
+STATE_DIR = '.sync_state'
+SEPARATOR = '\x1f'
+
+
+def _text(value):
+    return value if isinstance(value, str) else str(value)
+
+
+def row_hash(row):
+    # None ile boş metin ayrı tutulur; değerler read_batches'ten str/None, temizlenmişse int, date ... gelir
+    text = SEPARATOR.join('\x00' if value is None else _text(value) for value in row)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def row_key(row, key_index):
+    return SEPARATOR.join('' if row[i] is None else _text(row[i]) for i in key_index)
+
+
+def state_path(state_dir, table_name):
+    return os.path.join(state_dir, f"{table_name}.json")
+
+
+def load_state(state_dir, table_name, columns, clean=False):
+    """
+    Önceki çalıştırmanın {anahtar: hash} sözlüğü. Dosya yoksa boş sözlük; sütun listesi ya da
+    temizleme (clean) değiştiyse hash'ler karşılaştırılamaz, anahtarlar kalır ama hepsi
+    güncellenecek sayılır.
+    """
+    path = state_path(state_dir, table_name)
+    if not os.path.isfile(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        state = json.load(f)
+    hashes = state.get('rows', {})
+    if state.get('columns') != list(columns) or state.get('clean', False) != clean:
+        return {key: None for key in hashes}
+    return hashes
+
+
+def save_state(state_dir, table_name, columns, hashes, clean=False):
+    os.makedirs(state_dir, exist_ok=True)
+    path = state_path(state_dir, table_name)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'columns': list(columns), 'clean': clean, 'rows': hashes}, f, separators=(',', ':'))
+    # Yarım yazılmış dosya bir sonraki çalıştırmayı bozmasın
+    os.replace(tmp_path, path)
+
+
+def diff_rows(paths, columns, primary_key, previous, batch_size=5000, table_name=None, report=None):
+    """
+    CSV dosyalarını okuyup önceki hash'lerle karşılaştırır.
+    (yeni hash'ler, eklenecek satırlar, güncellenecek satırlar, silinecek anahtarlar) döndürür.
+    Aynı anahtar dosyada birden fazla geçerse sonuncusu geçerlidir. report (RejectReport)
+    verilirse satırlar table_name kurallarıyla temizlenir; reddedilen satırın anahtarı
+    önceki hash'iyle kalır.
+    """
+    key_index = [columns.index(col) for col in primary_key]
+    hashes, changed = {}, {}
+    for path in paths:
+        for batch in read_batches(path, columns, batch_size):
+            if report is not None:
+                batch, rejected = clean_batch(table_name, columns, batch)
+                report.add(table_name, path, rejected)
+                for _, values in rejected:
+                    key = row_key([values[col] for col in columns], key_index)
+                    if key in previous:
+                        hashes.setdefault(key, previous[key])
+            for row in batch:
+                key = row_key(row, key_index)
+                digest = row_hash(row)
+                hashes[key] = digest
+                if previous.get(key) != digest:
+                    changed[key] = row
+                else:
+                    changed.pop(key, None)
+
+    inserts = [row for key, row in changed.items() if key not in previous]
+    updates = [row for key, row in changed.items() if key in previous]
+    deletes = [key.split(SEPARATOR) for key in previous if key not in hashes]
+    return hashes, inserts, updates, deletes
+
+
+def _delete_query(table_name, primary_key, row_count):
+    if len(primary_key) == 1:
+        return f"DELETE FROM {table_name} WHERE {primary_key[0]} IN ({', '.join(['%s'] * row_count)})"
+    row_placeholder = '(' + ', '.join(['%s'] * len(primary_key)) + ')'
+    return (f"DELETE FROM {table_name} WHERE ({', '.join(primary_key)}) IN ("
+            + ', '.join([row_placeholder] * row_count) + ")")
+
+
+def _apply_diff(conn, table_name, columns, primary_key, rows, deletes, batch_size):
+    """Değişen satırları upsert eder, kaybolan anahtarları siler; tek transaction."""
+    cursor = conn.cursor()
+    try:
+        query = _insert_query(table_name, columns, primary_key)
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(query, rows[start:start + batch_size])
+        for start in range(0, len(deletes), batch_size):
+            chunk = deletes[start:start + batch_size]
+            cursor.execute(_delete_query(table_name, primary_key, len(chunk)),
+                           [value for key in chunk for value in key])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def sync_table(table_name, data_dir, state_dir=STATE_DIR, batch_size=5000, dry_run=False, report=None):
+    """
+    Tek tabloyu önceki çalıştırmaya göre senkronlar; report (RejectReport) verilirse satırlar temizlenir.
+    {'table', 'rows', 'inserted', 'updated', 'deleted', 'unchanged', 'rejected', 'seconds'} döndürür;
+    hata olursa 'error' anahtarı eklenir ve sidecar dosyası değişmez. Anahtarı benzersiz
+    olmayan tablolar (bkz. loader._check_upsert) ValueError ile reddedilir.
+    """
+    spec = TABLES[table_name]
+    columns, primary_key = spec['columns'], spec['primary_key']
+    started = time.monotonic()
+    _check_upsert(table_name, data_dir)
+
+    clean = report is not None
+    previous = load_state(state_dir, table_name, columns, clean)
+    hashes, inserts, updates, deletes = diff_rows(
+        table_files(data_dir, table_name), columns, primary_key, previous, batch_size, table_name, report)
+    stats = {
+        'table': table_name,
+        'rows': len(hashes),
+        'inserted': len(inserts),
+        'updated': len(updates),
+        'deleted': len(deletes),
+        'unchanged': len(hashes) - len(inserts) - len(updates),
+        'rejected': report.count(table_name) if clean else 0,
+        'seconds': 0.0,
+    }
+
+    if not dry_run:
+        if inserts or updates or deletes:
+            conn = db.connect()
+            try:
+                _apply_diff(conn, table_name, columns, primary_key, inserts + updates, deletes, batch_size)
+            except pymysql.MySQLError as e:
+                print(f"Error (sync {table_name}): {e}")
+                stats['error'] = str(e)
+            finally:
+                conn.close()
+            result_cache.invalidate(table_name)
+        if 'error' not in stats:
+            save_state(state_dir, table_name, columns, hashes, clean)
+
+    stats['seconds'] = time.monotonic() - started
+    return stats
+
+
+def run_sync(data_dir='data', tables=None, state_dir=STATE_DIR, batch_size=5000, workers=4, dry_run=False,
+             reject_report=None):
+    """
+    Seçilen tabloları (varsayılan: data_dir'de dosyası olanlar) paralel senkronlar.
+    reject_report bir dosya yolu ise satırlar temizlenir, reddedilenler o dosyaya yazılır.
+    """
+    tables = [name for name in (tables or TABLES) if table_files(data_dir, name)]
+    report = RejectReport(reject_report) if reject_report else None
+
+    started = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [
+                pool.submit(sync_table, name, data_dir, state_dir, batch_size, dry_run, report)
+                for name in tables
+            ]
+            results = []
+            for name, future in zip(tables, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"Error (sync_table {name}): {e}")
+                    results.append({'table': name, 'rows': 0, 'inserted': 0, 'updated': 0, 'deleted': 0,
+                                    'unchanged': 0, 'rejected': 0, 'seconds': 0.0, 'error': str(e)})
+    finally:
+        if report is not None:
+            report.close()
+    return results, time.monotonic() - started
+
+
+def print_sync_summary(results, elapsed):
+    print()
+    print(f"{'table':<20}{'rows':>12}{'inserted':>10}{'updated':>10}{'deleted':>10}{'unchanged':>12}"
+          f"{'rejected':>10}{'seconds':>10}")
+    totals = dict.fromkeys(('rows', 'inserted', 'updated', 'deleted', 'unchanged', 'rejected'), 0)
+    for stats in results:
+        print(f"{stats['table']:<20}{stats['rows']:>12,}{stats['inserted']:>10,}{stats['updated']:>10,}"
+              f"{stats['deleted']:>10,}{stats['unchanged']:>12,}{stats['rejected']:>10,}{stats['seconds']:>10.2f}"
+              + ("  (failed)" if 'error' in stats else ""))
+        for name in totals:
+            totals[name] += stats[name]
+    print(f"{'total':<20}{totals['rows']:>12,}{totals['inserted']:>10,}{totals['updated']:>10,}"
+          f"{totals['deleted']:>10,}{totals['unchanged']:>12,}{totals['rejected']:>10,}{elapsed:>10.2f}")
@@ -0,0 +1,90 @@
+# File: importer/tables.py
+# Description: Which CSV files feed which table, and in which column order.
+#              Column lists and primary keys come from the services, so the
+#              importer always writes the same columns the app reads.
+#              File names follow the Transfermarkt dump (players.csv, games.csv, ...);
+#              data/c.csv is a headerless club_games file.
+#              Tables with a 'key_factory' (game_events) get a generated key for files
+#              that have no key column; 'key_sql' is the same for LOAD DATA.
+
+import os
+
+from importer.reader import read_header
+
+from services.appearances import APPEARANCE_COLUMNS, PRIMARY_KEY as APPEARANCE_KEY
+from services.club_games import CLUB_GAME_COLUMNS, PRIMARY_KEY as CLUB_GAME_KEY
+from services.clubs import CLUB_COLUMNS, PRIMARY_KEY as CLUB_KEY
+from services.competitions import COMPETITION_COLUMNS, PRIMARY_KEY as COMPETITION_KEY
+from services.game_events import EVENT_COLUMNS, PRIMARY_KEY as EVENT_KEY, new_event_id
+from services.games import GAME_COLUMNS, PRIMARY_KEY as GAME_KEY
+from services.players import PLAYERS_COLUMNS, PRIMARY_KEY as PLAYER_KEY
+from services.playervaluations import PLAYER_VALUATION_COLUMNS, PRIMARY_KEY as VALUATION_KEY
+
+# Sıra: küçük referans tabloları önce (FK eklenirse de bu sıra geçerli kalır)
+TABLES = {
+    'competitions': {
+        'columns': COMPETITION_COLUMNS,
+        'primary_key': COMPETITION_KEY,
+        'files': ['competitions.csv'],
+    },
+    'clubs': {
+        'columns': CLUB_COLUMNS,
+        'primary_key': CLUB_KEY,
+        'files': ['clubs.csv'],
+    },
+    'players': {
+        'columns': PLAYERS_COLUMNS,
+        'primary_key': PLAYER_KEY,
+        'files': ['players.csv'],
+    },
+    'games': {
+        'columns': GAME_COLUMNS,
+        'primary_key': GAME_KEY,
+        'files': ['games.csv'],
+    },
+    'club_games': {
+        'columns': CLUB_GAME_COLUMNS,
+        'primary_key': CLUB_GAME_KEY,
+        'files': ['club_games.csv', 'c.csv'],
+    },
+    'appearances': {
+        'columns': APPEARANCE_COLUMNS,
+        'primary_key': APPEARANCE_KEY,
+        'files': ['appearances.csv'],
+    },
+    'game_events': {
+        'columns': EVENT_COLUMNS,
+        'primary_key': EVENT_KEY,
+        'files': ['game_events.csv'],
+        'key_factory': new_event_id,
+        'key_sql': "REPLACE(UUID(), '-', '')",
+    },
+    'player_valuations': {
+        'columns': PLAYER_VALUATION_COLUMNS,
+        'primary_key': VALUATION_KEY,
+        'files': ['player_valuations.csv'],
+    },
+}
+
+
+def table_files(data_dir, table_name):
+    """data_dir altında bulunan, bu tabloya ait CSV dosyaları."""
+    paths = [os.path.join(data_dir, name) for name in TABLES[table_name]['files']]
+    return [path for path in paths if os.path.isfile(path)]
+
+
+def key_is_generated(table_name, path):
+    """Dosyada tablonun anahtar sütunu yok ve tablo anahtar üretebiliyor (game_events) mu?"""
+    spec = TABLES[table_name]
+    if 'key_factory' not in spec:
+        return False
+    header, _ = read_header(path, spec['columns'])
+    return header is not None and spec['primary_key'][0] not in {name.strip() for name in header}
+
+
+def generate_keys(table_name, rows):
+    """Anahtarı boş satırlara key_factory ile yeni anahtar verir (tuple satırlar, tablo sütun sırası)."""
+    spec = TABLES[table_name]
+    index = spec['columns'].index(spec['primary_key'][0])
+    factory = spec['key_factory']
+    return [row if row[index] is not None else row[:index] + (factory(),) + row[index + 1:] for row in rows]
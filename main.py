@@ -1,4 +1,9 @@
-from flask import Flask, render_template, request, redirect, url_for
+import csv
+import io
+import json
+from functools import partial
+
+from flask import Flask, Response, render_template, request, redirect, stream_with_context, url_for, jsonify
 from services import appearances as appearance_service
 from services import players as players_service
 from services import games as games_service
@@ -7,6 +12,11 @@ from services import competitions as competitions_service
 from services import playervaluations as playervaluations_service
 from services import club_games as clubgames_service
 from services import clubs as clubs_service
+from services import export as export_service
+from services import instrumentation
+from services import table_query
+from services.cache import result_cache
+from Database import db
 app = Flask(__name__) 
 
 
@@ -79,6 +89,155 @@ TABLE_SCHEMAS = {
 }
 }
 
+# --- Tablo kaydı (registry) ---
+# Her TABLE_SCHEMAS anahtarı için servis fonksiyonları ve anahtar sütunları; route'lar
+# if/elif zinciri yerine buradan O(1) sözlük aramasıyla çağırır. Eksik işlem None'dır.
+#   page:        (page, per_page, search_term, columns=) -> (satırlar, toplam)
+#   keyset:      büyük tablolar için cursor sayfalama (yoksa None, OFFSET kullanılır)
+#   count:       (search_term) -> toplam
+#   insert / insert_many / delete(*key) / update(*key, data)
+# Ayrıca her tablo için services/table_query.py'deki genel okuma işlemleri eklenir:
+#   rows:   keyset sayfası (projeksiyon, filtre, sıralama) -> (satırlar, next_cursor)
+#   stream: sunucu tarafı cursor ile satır parçaları (NDJSON / dışa aktarma)
+TABLE_SERVICES = {
+    'players': dict(
+        service=players_service, table='players',
+        columns=players_service.PLAYERS_COLUMNS,
+        page=players_service.get_all_players_with_total,
+        keyset=None,
+        count=players_service.get_total_player_count,
+        insert=players_service.insert_player,
+        insert_many=players_service.insert_many_players,
+        delete=players_service.delete_player,
+        update=players_service.update_player,
+    ),
+    'clubs': dict(
+        service=clubs_service, table='clubs',
+        columns=clubs_service.CLUB_COLUMNS,
+        page=clubs_service.get_all_clubs_with_total,
+        keyset=None,
+        count=clubs_service.get_total_club_count,
+        insert=clubs_service.insert_club,
+        insert_many=clubs_service.insert_many_clubs,
+        delete=clubs_service.delete_club,
+        update=clubs_service.update_club,
+    ),
+    'competitions': dict(
+        service=competitions_service, table='competitions',
+        columns=competitions_service.COMPETITION_COLUMNS,
+        page=competitions_service.get_all_competitions_with_total,
+        keyset=None,
+        count=competitions_service.get_total_competition_count,
+        insert=competitions_service.insert_competition,
+        insert_many=competitions_service.insert_many_competitions,
+        delete=competitions_service.delete_competition,
+        update=competitions_service.update_competition,
+    ),
+    'appearances': dict(
+        service=appearance_service, table='appearances',
+        columns=appearance_service.APPEARANCE_COLUMNS,
+        page=appearance_service.get_all_appearances_with_total,
+        keyset=appearance_service.get_all_appearances_keyset_with_total,
+        count=appearance_service.get_total_appearance_count,
+        insert=appearance_service.insert_appearance,
+        insert_many=appearance_service.insert_many_appearances,
+        delete=appearance_service.delete_appearance,
+        update=None,
+    ),
+    'club_games': dict(
+        service=clubgames_service, table='club_games',
+        columns=clubgames_service.CLUB_GAME_COLUMNS,
+        page=clubgames_service.get_all_club_games_with_total,
+        keyset=None,
+        count=clubgames_service.get_total_club_game_count,
+        insert=clubgames_service.insert_club_game,
+        insert_many=clubgames_service.insert_many_club_games,
+        delete=clubgames_service.delete_club_game,
+        update=clubgames_service.update_club_game,
+    ),
+    'playervaluations': dict(
+        service=playervaluations_service, table='player_valuations',
+        columns=playervaluations_service.PLAYER_VALUATION_COLUMNS,
+        page=playervaluations_service.get_all_valuations_with_total,
+        keyset=playervaluations_service.get_all_valuations_keyset_with_total,
+        count=playervaluations_service.get_total_valuation_count,
+        insert=playervaluations_service.insert_valuation,
+        insert_many=playervaluations_service.insert_many_valuations,
+        delete=playervaluations_service.delete_valuation,
+        update=playervaluations_service.update_valuation,
+    ),
+    'games': dict(
+        service=games_service, table='games',
+        columns=games_service.GAME_COLUMNS,
+        page=games_service.get_all_games_with_total,
+        keyset=games_service.get_all_games_keyset_with_total,
+        count=games_service.get_total_game_count,
+        insert=games_service.insert_game,
+        insert_many=games_service.insert_many_games,
+        delete=games_service.delete_game,
+        update=games_service.update_game,
+    ),
+    'game_events': dict(
+        service=events_service, table='game_events',
+        columns=events_service.EVENT_COLUMNS,
+        page=events_service.get_all_events_with_total,
+        keyset=events_service.get_all_events_keyset_with_total,
+        count=events_service.get_total_event_count,
+        insert=events_service.insert_event,
+        insert_many=events_service.insert_many_events,
+        delete=events_service.delete_event,
+        update=None,
+    ),
+}
+
+TABLE_OPERATIONS = ('page', 'keyset', 'count', 'insert', 'insert_many', 'delete', 'update', 'rows', 'stream')
+
+# Bileşik anahtarlı kayıtlar URL'de değerleri bu ayraçla birleştirilerek taşınır
+KEY_SEPARATOR = '|'
+
+# hook(table_name, operation, func) -> func; önbellek, zamanlama vb. için tek sarmalama noktası
+TABLE_HOOKS = []
+
+
+def build_table_registry(hooks=()):
+    """TABLE_SERVICES'ten, hook'larla sarılmış {tablo: {işlem: fonksiyon, 'key': (...)}} kurar."""
+    registry = {}
+    for table_name in TABLE_SCHEMAS:
+        entry = TABLE_SERVICES[table_name]
+        spec = {
+            'table': entry['table'],
+            'columns': entry['columns'],
+            'key': entry['service'].PRIMARY_KEY,
+            'search_fields': entry['service'].SEARCH_FIELDS,
+        }
+        entry = dict(entry, rows=partial(table_query.fetch_rows, spec),
+                     stream=partial(table_query.stream_batches, spec))
+        resolved = dict(spec)
+        for operation in TABLE_OPERATIONS:
+            func = entry[operation]
+            if func is not None:
+                for hook in hooks:
+                    func = hook(table_name, operation, func)
+            resolved[operation] = func
+        registry[table_name] = resolved
+    return registry
+
+
+TABLE_REGISTRY = build_table_registry()
+
+
+def add_table_hook(hook):
+    """Hook'u ekler ve kaydı yeniden kurar (uygulama başlarken çağrılmalı)."""
+    TABLE_HOOKS.append(hook)
+    TABLE_REGISTRY.update(build_table_registry(TABLE_HOOKS))
+
+
+@app.template_global()
+def record_id(table_name, row):
+    """Satırın anahtar değerlerini delete URL'inde kullanılacak tek parçaya çevirir."""
+    return KEY_SEPARATOR.join(str(row[col]) for col in TABLE_REGISTRY[table_name]['key'])
+
+
 @app.route('/')
 def index():
     return render_template('index.html', tables=TABLE_SCHEMAS)
@@ -88,61 +247,47 @@ def show_table(table_name):
     if table_name not in TABLE_SCHEMAS:
         return "Tablo bulunamadı", 404
     
-    page = request.args.get('page', 1, type=int) # Hangi sayfadayız? (Varsayılan 1)
+    page = max(request.args.get('page', 1, type=int), 1) # Hangi sayfadayız? (Varsayılan 1)
     per_page = 50 # Sayfa başına 50 kayıt gösterelim
     search_term = request.args.get('q', '').strip()
+    # Keyset sayfalama için cursor token'ları (yoksa page ile OFFSET kullanılır)
+    after = request.args.get('after')
+    before = request.args.get('before')
 
     schema = TABLE_SCHEMAS[table_name]
-    data_objects = []
+    data_rows = []
     total_count=0
+    next_cursor = prev_cursor = None
 
     # 1. Hangi tablo istendiyse onun servisine git
-       # 1. Hangi tablo istendiyse onun servisine git
-    if table_name == 'appearances':
-        data_objects = appearance_service.get_all_appearances(page, per_page, search_term)
-        total_count = appearance_service.get_total_appearance_count(search_term)
-    elif table_name == 'players':   # 'elif' kullanmak daha verimlidir
-        data_objects = players_service.get_all_players(page, per_page, search_term)
-        total_count = players_service.get_total_player_count()
-    elif table_name == 'games':     # YENİ EKLEME: Games Servisi
-        # games_service.get_all_games fonksiyonunun limit=50 alabilmesi gerekir.
-        data_objects = games_service.get_all_games(page, per_page, search_term)
-        total_count = games_service.get_total_game_count(search_term)
-    elif table_name == 'game_events': # YENİ EKLEME: Game Events Servisi
-        # events_service.get_all_game_events fonksiyonu gereklidir.
-        data_objects = events_service.get_all_events(page, per_page, search_term)
-        total_count = events_service.get_total_event_count(search_term)
-    elif table_name == 'competitions':   # 'elif' kullanmak daha verimlidir
-        data_objects = competitions_service.get_all_competitions(page, per_page, search_term)
-        total_count = competitions_service.get_total_competition_count(search_term)
-    elif table_name == 'playervaluations': # 'elif' kullanmak daha verimlidir
-        data_objects = playervaluations_service.get_all_valuations(page, per_page, search_term)
-        total_count = playervaluations_service.get_total_valuation_count(search_term)
-    elif table_name == 'club_games': # 'elif' kullanmak daha verimlidir
-        data_objects = clubgames_service.get_all_club_games(page, per_page, search_term)
-        total_count = clubgames_service.get_total_club_game_count(search_term)
-    elif table_name == 'clubs': # 'elif' kullanmak daha verimlidir
-        data_objects = clubs_service.get_all_clubs(page, per_page, search_term)
-        total_count = clubs_service.get_total_club_count(search_term)
-    # Not: İleride elif table_name == 'players': ... diye gidecek     
-
-    # 2. Template objeleri (row.player_name) okuyabilir ama
-    # generic template (row['player_name']) bekliyorsa dönüşüm yapmalıyız.
-    # Bizim template yapımız row['col'] şeklinde olduğu için objeleri dict'e çeviriyoruz:
+    services = TABLE_REGISTRY[table_name]
+    if services['keyset'] and not search_term:
+        # Derin sayfalar OFFSET yerine son görülen satırın anahtarından devam eder
+        # Sayfa ve toplam sayı, OFFSET yolundaki gibi tek bağlantıda gelir
+        data_rows, next_cursor, prev_cursor, total_count = services['keyset'](
+            per_page, search_term, after, before, page, columns=schema['columns'])
+    else:
+        # Arama sonuçları alaka düzeyine göre sıralandığı için sayfa numarasıyla gezilir.
+        # Sayfa ve toplam sayı tek bağlantıda gelir; sayı arama terimine göre önbellekte tutulur.
+        data_rows, total_count = services['page'](page, per_page, search_term,
+                                                  columns=schema['columns'])
+
+    # 2. Servisler sadece şemadaki sütunları seçip satırları dict olarak döndürür;
+    # template row['col'] ile okuduğu için model nesnesine/vars() kopyasına gerek yok.
     total_pages = (total_count + per_page - 1) // per_page
-    
-    data_dicts = [vars(obj) for obj in data_objects]
 
     return render_template('table.html', 
                          table_name=table_name, 
                          title=schema['title'],
                          columns=schema['columns'],
-                         data=data_dicts,
+                         data=data_rows,
                          current_page=page,
                          total_pages=total_pages,
                          total_count=total_count,
                          per_page=per_page,
-                         search_term=search_term)
+                         search_term=search_term,
+                         next_cursor=next_cursor,
+                         prev_cursor=prev_cursor)
 
 @app.route('/table/<table_name>/add', methods=['GET', 'POST'])
 def add_record(table_name):
@@ -153,29 +298,12 @@ def add_record(table_name):
 
     if request.method == 'POST':
         form_data = request.form.to_dict()
-        
-        # INSERT İşlemi
-        if table_name == 'appearances':
-            result = appearance_service.insert_appearance(form_data)
-        elif table_name == 'players':
-            result = players_service.insert_player(form_data)
-        elif table_name == 'games':        # YENİ EKLEME: Games Insert
-            result = games_service.insert_game(form_data)
-        elif table_name == 'game_events':  # YENİ EKLEME: Game Events Insert
-            result = events_service.insert_event(form_data)
-        elif table_name == 'competitions':  # YENİ EKLEME: Game Events Insert
-            result = competitions_service.insert_competition(form_data)
-        elif table_name == 'playervaluations':  # YENİ EKLEME: Game Events Insert
-            result = playervaluations_service.insert_valuation(form_data)
-        elif table_name == 'club_games':  # YENİ EKLEME: Game Events Insert
-            result = clubgames_service.insert_club_game(form_data)
-        elif table_name == 'clubs':  # YENİ EKLEME: Game Events Insert
-            result = clubs_service.insert_club(form_data)
-        #Insert sonu
-          
-            if "Error" in str(result):
-                return f"Error: {result}"
-                
+
+        # INSERT İşlemi (servisler hata durumunda "Error: ..." döndürür)
+        result = TABLE_REGISTRY[table_name]['insert'](form_data)
+        if str(result).startswith("Error"):
+            return str(result), 400
+
         return redirect(url_for('show_table', table_name=table_name))
 
     return render_template('form.html', 
@@ -183,25 +311,199 @@ def add_record(table_name):
                          title=schema['title'],
                          columns=schema['columns'])
 
-@app.route('/table/<table_name>/delete/<id>', methods=['POST'])
+@app.route('/table/<table_name>/bulk', methods=['POST'])
+def bulk_add_records(table_name):
+    """
+    Toplu ekleme: gövde bir JSON dizi (ya da {"rows": [...]}) veya "file" alanında
+    başlıklı bir CSV dosyası olabilir. Tüm satırlar tek transaction'da eklenir;
+    hatalı satırlar yanıtta sıralarıyla raporlanır.
+    """
+    if table_name not in TABLE_SCHEMAS:
+        return jsonify({'error': 'Tablo bulunamadı'}), 404
+
+    upload = request.files.get('file')
+    if upload is not None:
+        text = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+        rows = [{key: (value if value != '' else None) for key, value in row.items()}
+                for row in csv.DictReader(text)]
+    else:
+        payload = request.get_json(silent=True)
+        rows = payload.get('rows') if isinstance(payload, dict) else payload
+        if not isinstance(rows, list):
+            return jsonify({'error': 'Expected a JSON array of rows or a CSV file'}), 400
+
+    result = TABLE_REGISTRY[table_name]['insert_many'](rows)
+    return jsonify(result), (200 if not result['errors'] else 207)
+
+@app.route('/table/<table_name>/delete/<path:id>', methods=['POST'])
 def delete_record(table_name, id):
     if table_name not in TABLE_SCHEMAS:
         return "No tables found", 404
-    
-    success = False
-
-    if table_name == 'appearances':
-        success = appearance_service.delete_appearance(id)
-        
-    elif table_name == 'players':
-        success = players_service.delete_player(id)
-        
-    # elif table_name == 'clubs':
-    #     success = club_service.delete_club(id)
+
+    # Bileşik anahtar: player_valuations (player_id|date), club_games (game_id|club_id) ...
+    # game_events tek satırı game_event_id ile siler; (game_id, minute, type) benzersiz değildir
+    services = TABLE_REGISTRY[table_name]
+    key_values = id.split(KEY_SEPARATOR, len(services['key']) - 1)
+    if len(key_values) != len(services['key']):
+        return f"Expected key ({', '.join(services['key'])})", 400
+
+    # Servisler hata durumunda "Error: ..." metni döndürür; sadece True başarılıdır
+    success = services['delete'](*key_values) is True
     if success:
         return redirect(url_for('show_table', table_name=table_name))
     else:
         return f"Delete unsuccesful (ID: {id})"
 
+# --- JSON API ---
+# /api/<tablo>?columns=a,b&sort=date&order=desc&limit=100&after=<cursor>&q=<arama>&<sütun>[__op]=<değer>
+# format=ndjson ile tüm eşleşen satırlar (limit verilmediyse) satır satır akıtılır.
+API_PARAMS = ('columns', 'sort', 'order', 'limit', 'after', 'q', 'format')
+API_DEFAULT_LIMIT = 100
+API_MAX_LIMIT = 1000
+
+
+def _api_query(table_name, reserved=API_PARAMS):
+    """İsteğin sorgu parametrelerini çözer; hatalıysa ValueError fırlatır."""
+    services = TABLE_REGISTRY[table_name]
+    args = request.args
+    sort_by = args.get('sort') or services['key'][0]
+    if sort_by not in services['columns']:
+        raise ValueError(f"Unknown sort column: {sort_by}")
+    order = args.get('order', 'asc').lower()
+    if order not in ('asc', 'desc'):
+        raise ValueError("order must be asc or desc")
+    limit = args.get('limit', type=int)
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be positive")
+    return dict(
+        columns=table_query.parse_columns(args.get('columns'), services['columns']),
+        filters=table_query.parse_filters(args, services['columns'], reserved=reserved),
+        search_term=args.get('q', '').strip(),
+        sort_by=sort_by,
+        ascending=order == 'asc',
+        limit=limit,
+    )
+
+
+@app.route('/api/<table_name>')
+def api_table(table_name):
+    if table_name not in TABLE_SCHEMAS:
+        return jsonify({'error': 'Tablo bulunamadı'}), 404
+    try:
+        query = _api_query(table_name)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    services = TABLE_REGISTRY[table_name]
+
+    if request.args.get('format') == 'ndjson':
+        def generate():
+            for rows in services['stream'](**query):
+                yield ''.join(json.dumps(table_query.json_row(row), ensure_ascii=False) + '\n' for row in rows)
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    query['limit'] = min(query['limit'] or API_DEFAULT_LIMIT, API_MAX_LIMIT)
+    rows, next_cursor = services['rows'](after=request.args.get('after'), **query)
+    # jsonify anahtarları sıralar; sütun sırası korunsun diye json.dumps kullanılır
+    body = {
+        'table': table_name,
+        'rows': [table_query.json_row(row) for row in rows],
+        'count': len(rows),
+        'next_cursor': next_cursor,
+    }
+    return Response(json.dumps(body, ensure_ascii=False), mimetype='application/json')
+
+
+# --- Dışa aktarma ---
+# /export/<tablo>?format=csv|parquet|arrow&gzip=1 + /api ile aynı filtre/sıralama parametreleri.
+# Yanıt sunucu tarafı cursor'dan parça parça üretilir; süre ve rows/s sunucu loguna yazılır.
+EXPORT_PARAMS = API_PARAMS + ('gzip',)
+
+
+@app.route('/export/<table_name>')
+def export_table(table_name):
+    if table_name not in TABLE_SCHEMAS:
+        return jsonify({'error': 'Tablo bulunamadı'}), 404
+    fmt = request.args.get('format', 'csv')
+    compress = request.args.get('gzip', '0').lower() in ('1', 'true', 'yes')
+    try:
+        query = _api_query(table_name, reserved=EXPORT_PARAMS)
+        export_service.check_format(fmt)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    services = TABLE_REGISTRY[table_name]
+    columns = table_query.output_columns(services, query['columns'])
+    stats = export_service.ExportStats()
+
+    def generate():
+        yield from export_service.iter_export(services['stream'](**query), services['table'], columns, fmt,
+                                              compress, stats)
+        print(f"Export ({table_name}, {fmt}): {stats}")
+
+    file_name = export_service.file_name(table_name, fmt, compress)
+    return Response(stream_with_context(generate()),
+                    mimetype='application/gzip' if file_name.endswith('.gz') else export_service.MIMETYPES[fmt],
+                    headers={'Content-Disposition': f'attachment; filename="{file_name}"'})
+
+
+# --- Ölçüm (MONEYBALL_INSTRUMENT=1) ---
+# İstek başına SQL sorgu sayısı/süresi ve bağlantı alma süresi Server-Timing başlığına yazılır;
+# sorgu şablonu, servis ve endpoint bazında yüzdelikler /_debug/stats'tan okunur.
+# Ayrıntılar ve diğer ortam değişkenleri için bkz. services/instrumentation.py.
+recorder = instrumentation.recorder_from_env()
+if recorder is not None:
+    db.recorder = recorder
+    add_table_hook(recorder.table_hook)
+
+
+@app.before_request
+def start_request_timing():
+    if recorder is not None:
+        recorder.start_request(request.endpoint or request.path)
+
+
+@app.after_request
+def finish_request_timing(response):
+    if recorder is None:
+        return response
+    if response.is_streamed:
+        # NDJSON/dışa aktarma: sorgular gövde üretilirken çalışır. İstek gövde bitince kapanır;
+        # başlıklar gövdeden önce gittiği için Server-Timing eklenemez.
+        current = recorder.current_request()
+        if current is not None:
+            current['streaming'] = True
+            response.call_on_close(lambda: recorder.finish_request(current))
+        return response
+    timing = recorder.finish_request()
+    if timing is not None:
+        response.headers['Server-Timing'] = (
+            f'sql;dur={timing["sql_ms"]};desc="{timing["queries"]} queries", '
+            f'pool;dur={timing["acquire_ms"]}, total;dur={timing["total_ms"]}'
+        )
+    return response
+
+
+@app.teardown_request
+def close_request_timing(exc):
+    # after_request hiç çalışmadıysa (yakalanmamış hata) istek yine de kapatılır.
+    # Akış yanıtlarının isteği call_on_close ile kapanır.
+    if recorder is not None:
+        current = recorder.current_request()
+        if current is not None and not current.get('streaming'):
+            recorder.finish_request(current)
+
+
+@app.route('/_debug/stats')
+def debug_stats():
+    if recorder is None:
+        return jsonify({'error': 'Ölçüm kapalı (MONEYBALL_INSTRUMENT=1)'}), 404
+    if request.args.get('reset', '0').lower() in ('1', 'true', 'yes'):
+        recorder.reset()
+    stats = recorder.stats()
+    stats['result_cache'] = result_cache.stats()
+    stats['pool'] = db.pool_stats()
+    return Response(json.dumps(stats, default=str), mimetype='application/json')
+
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,57 @@
+# File: migrate.py
+# Description: Brings an existing database up to date with database/migrations/*.sql
+#              (see Database.migrate). Files run in name order and are recorded in the
+#              schema_migrations table, so each one runs once. Indexes that already
+#              exist (e.g. a database created from the current schema.sql) are skipped.
+#
+# Usage:
+#   python migrate.py                        # apply pending migrations
+#   python migrate.py --status               # list applied and pending migrations
+#   python migrate.py --dry-run              # print the statements without running them
+#   python migrate.py --database moneyball_bench
+#   MONEYBALL_DB_BACKEND=sqlite MONEYBALL_SQLITE_PATH=moneyball.sqlite3 python migrate.py
+#
+# New migrations: add database/migrations/NNN_description.sql and put the same
+# change into database/schema.sql for new databases.
+
+import argparse
+
+import pymysql
+
+from Database import db, migration_files
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations.")
+    parser.add_argument('--database', help="MySQL database to migrate (default: the one in Database.py)")
+    parser.add_argument('--status', action='store_true', help="list applied and pending migrations and exit")
+    parser.add_argument('--dry-run', action='store_true', help="print the statements that would run")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.database:
+        db.configure(db.backend, db.sqlite_path, db=args.database)
+    try:
+        if args.status:
+            applied = db.applied_migrations()
+            for version, _ in migration_files(backend=db.backend):
+                print(f"{'applied' if version in applied else 'pending':<10}{version}")
+            return 0
+        results = db.migrate(dry_run=args.dry_run)
+    except pymysql.MySQLError as e:
+        print(f"Error (migrate): {e}")
+        return 1
+
+    if not results:
+        print("No pending migrations")
+    for version, statements in results:
+        print(f"{'Would apply' if args.dry_run else 'Applied'} {version} ({len(statements)} statements)")
+        for statement in statements:
+            print(f"    {' '.join(statement.split())}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,5 +1,13 @@
 from Database import db
 from Models.Appearances import Appearances
+from services.bulk import insert_many, upsert_many
+from services.cache import count_cache, result_cache
+from services.pagination import fetch_keyset_page, keyset_columns, order_by_clause
+from services.query_utils import (
+    build_rows, cached_fetchall, cached_fetchone, fetch_count, keyset_with_total, page_with_total,
+    select_list, tuple_cursor,
+)
+from services.search import build_search, relevance_order
 
 
 APPEARANCE_COLUMNS = [
@@ -11,6 +19,14 @@ APPEARANCE_COLUMNS = [
 SELECT_FIELDS = ', '.join(APPEARANCE_COLUMNS)
 PLACEHOLDERS = ', '.join(['%s'] * len(APPEARANCE_COLUMNS))
 
+SEARCH_FIELDS = {
+    "table": "appearances",
+    "text": ["player_name"],
+    "prefix": ["appearance_id", "competition_id"],
+}
+PRIMARY_KEY = ('appearance_id',)
+SORT_COLUMNS = keyset_columns("player_name", PRIMARY_KEY)
+
 
 # ---(Read)---
 def get_appearance(appearance_key):
@@ -18,14 +34,13 @@ def get_appearance(appearance_key):
 
     conn = db.get_connection()
     try:
-        cursor = conn.cursor()
+        cursor = tuple_cursor(conn)
         query = f"SELECT {SELECT_FIELDS} FROM appearances WHERE appearance_id = %s"
-        cursor.execute(query, (appearance_key,))
-        result = cursor.fetchone()
+        result = cached_fetchone(cursor, "appearances", query, (appearance_key,))
         cursor.close()
 
         if result:
-            return Appearances(*result)
+            return Appearances.from_row(result)
         return None
 
     except Exception as e:
@@ -56,6 +71,7 @@ def insert_appearance(appearance_data: dict):
         new_id = appearance_data.get('appearance_id', cursor.lastrowid)
 
         conn.commit()
+        result_cache.invalidate("appearances")
         cursor.close()
         return new_id
 
@@ -66,6 +82,22 @@ def insert_appearance(appearance_data: dict):
         if conn:
             conn.close()
 
+# --- (Bulk Insert) ---
+def insert_many_appearances(appearances_data: list, batch_size=1000):
+    """
+    Inserts several appearances in one transaction using multi-row INSERTs.
+    Returns {'inserted': n, 'errors': [{'row': index, 'error': message}]} (see services/bulk.py).
+    """
+    return insert_many("appearances", APPEARANCE_COLUMNS, appearances_data, batch_size)
+
+# --- (Bulk Upsert) ---
+def upsert_many_appearances(appearances_data: list, batch_size=1000):
+    """
+    Inserts or updates appearances (keyed on appearance_id) in one transaction using
+    multi-row INSERT ... ON DUPLICATE KEY UPDATE, so re-importing overlapping data is safe.
+    Returns {'upserted': n, 'errors': [...]} (see services/bulk.py).
+    """
+    return upsert_many("appearances", APPEARANCE_COLUMNS, PRIMARY_KEY, appearances_data, batch_size)
 
 # ---(Delete)---
 def delete_appearance(appearance_key):
@@ -80,6 +112,7 @@ def delete_appearance(appearance_key):
         rows_affected = cursor.rowcount
 
         conn.commit()
+        result_cache.invalidate("appearances")
         cursor.close()
         return rows_affected > 0
 
@@ -95,19 +128,14 @@ def delete_appearance(appearance_key):
 def search_appearances_by_player(player_id):
 
     conn = db.get_connection()
-    results_list = []
     try:
-        cursor = conn.cursor()
+        cursor = tuple_cursor(conn)
 
         query = f"SELECT {SELECT_FIELDS} FROM appearances WHERE player_id = %s"
-        cursor.execute(query, (player_id,))
-        results = cursor.fetchall()
+        results = cached_fetchall(cursor, "appearances", query, (player_id,))
         cursor.close()
 
-        for row in results:
-            results_list.append(Appearances(*row))
-
-        return results_list
+        return Appearances.from_rows(results)
 
     except Exception as e:
         print(f"Error (search_appearances): {e}")
@@ -117,29 +145,20 @@ def search_appearances_by_player(player_id):
             conn.close()
 
 # ---(List All)---
+def _count_appearances(cursor, search_term=""):
+    # Arama terimi varsa, toplam sayıyı da filtreleyerek hesaplamalıyız
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+    return fetch_count(cursor, "appearances", where_clause, query_params)
+
+
 def get_total_appearance_count(search_term=""):
     conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        
-        # Arama terimi varsa, toplam sayıyı da filtreleyerek hesaplamalıyız
-        where_clause = ""
-        query_params = []
-        
-        if search_term:
-            search_like = f"%{search_term}%"
-            search_cols = ["player_name", "appearance_id", "competition_id"]
-            where_conditions = [f"{col} LIKE %s" for col in search_cols]
-            where_clause = " WHERE " + " OR ".join(where_conditions)
-            query_params = [search_like] * len(search_cols)
-
-        query = f"SELECT COUNT(*) FROM appearances {where_clause}"
-        cursor.execute(query, tuple(query_params))
-        result = cursor.fetchone()
-        
-        # DictCursor kullandığımız için anahtarı 'COUNT(*)' olacaktır.
-        return result['COUNT(*)'] if result else 0 
-        
+        return count_cache.get_or_load(
+            "appearances", search_term, lambda: _count_appearances(cursor, search_term)
+        )
+
     except Exception as e:
         print(f"Error (get_total_appearance_count): {e}")
         return 0
@@ -147,52 +166,106 @@ def get_total_appearance_count(search_term=""):
         if conn: conn.close()
 
 
-# --- Search and Pagination support for get_all_appearances ---
-def get_all_appearances(page=1, per_page=50, search_term=""):
-    conn = db.get_connection()
-    results_list = []
-    
+def _fetch_appearance_page(cursor, page, per_page, search_term, columns=None):
     offset = (page - 1) * per_page
-    
-    where_clause = ""
-    query_params = []
-    
-    if search_term:
-        search_like = f"%{search_term}%"
-        search_cols = ["player_name", "appearance_id", "competition_id"]
-        where_conditions = [f"{col} LIKE %s" for col in search_cols]
-        where_clause = " WHERE " + " OR ".join(where_conditions)
-        query_params = [search_like] * len(search_cols)
+
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+
+    # Rank search results by relevance first
+    order_by = order_by_clause(SORT_COLUMNS, True)
+    relevance, relevance_params = relevance_order(SEARCH_FIELDS, search_term)
+    if relevance:
+        order_by = f"{relevance}, {order_by}"
+        query_params.extend(relevance_params)
 
     # Append LIMIT and OFFSET parameters to the end
     query_params.extend([per_page, offset])
 
+    query = f"""
+        SELECT {select_list(APPEARANCE_COLUMNS, columns, SORT_COLUMNS)} FROM appearances
+        {where_clause}
+        ORDER BY {order_by}
+        LIMIT %s OFFSET %s
+    """
+
+    results = cached_fetchall(cursor, "appearances", query, query_params)
+
+    return build_rows(results, Appearances, columns)
+
+
+# --- Search and Pagination support for get_all_appearances ---
+def get_all_appearances(page=1, per_page=50, search_term="", columns=None):
+    conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        
-        query = f"""
-            SELECT {SELECT_FIELDS} FROM appearances
-            {where_clause}
-            ORDER BY player_name ASC 
-            LIMIT %s OFFSET %s
-        """
-        
-        cursor.execute(query, tuple(query_params))       
-        results = cursor.fetchall()
-        
-        for row in results:
-            try:
-                # Assuming Appearances class handles all fields correctly
-                obj = Appearances(**row)
-                results_list.append(obj)
-            except TypeError as e:
-                # This should be checked and fixed if encountered!
-                print(f"Model conversion error (Row skipped): {e}") 
-
-        return results_list
+        return _fetch_appearance_page(cursor, page, per_page, search_term, columns=columns)
 
     except Exception as e:
         print(f"Error (get_all_appearances): {e}")
         return []
     finally:
-        if conn: conn.close()
\ No newline at end of file
+        if conn: conn.close()
+
+
+def get_all_appearances_with_total(page=1, per_page=50, search_term="", columns=None):
+    """Returns (appearances, total_count) for one page using a single connection."""
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return page_with_total(
+            "appearances", page, per_page, search_term,
+            lambda: _fetch_appearance_page(cursor, page, per_page, search_term, columns=columns),
+            lambda: _count_appearances(cursor, search_term),
+        )
+
+    except Exception as e:
+        print(f"Error (get_all_appearances_with_total): {e}")
+        return [], 0
+    finally:
+        if conn: conn.close()
+
+
+def _fetch_appearances_keyset(cursor, per_page, search_term, after, before, page, columns):
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+    return fetch_keyset_page(
+        cursor, f"SELECT {select_list(APPEARANCE_COLUMNS, columns, SORT_COLUMNS)} FROM appearances", where_clause, query_params,
+        "player_name", SORT_COLUMNS, True, per_page, after, before,
+        offset=(page - 1) * per_page, build=None if columns else lambda row: Appearances(**row),
+        table_name="appearances",
+    )
+
+
+def get_all_appearances_keyset(per_page=50, search_term="", after=None, before=None, page=1, columns=None):
+    """
+    Cursor-based pagination ordered by (player_name, appearance_id).
+    Without a cursor, `page` jumps straight to that page via OFFSET.
+    Returns (appearances, next_cursor, prev_cursor); deep pages cost the same as the first one.
+    """
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return _fetch_appearances_keyset(cursor, per_page, search_term, after, before, page, columns)
+
+    except Exception as e:
+        print(f"Error (get_all_appearances_keyset): {e}")
+        return [], None, None
+    finally:
+        if conn: conn.close()
+
+
+def get_all_appearances_keyset_with_total(per_page=50, search_term="", after=None, before=None, page=1, columns=None):
+    """get_all_appearances_keyset + total count on the same connection: (appearances, next_cursor, prev_cursor, total_count)."""
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return keyset_with_total(
+            "appearances", search_term,
+            lambda: _fetch_appearances_keyset(cursor, per_page, search_term, after, before, page, columns),
+            lambda: _count_appearances(cursor, search_term),
+        )
+
+    except Exception as e:
+        print(f"Error (get_all_appearances_keyset_with_total): {e}")
+        return [], None, None, 0
+    finally:
+        if conn: conn.close()
@@ -0,0 +1,127 @@
+# Toplu yazma yardımcıları: servislerin insert_many_* fonksiyonları bunları kullanır.
+# Satırlar tek bağlantı ve tek transaction içinde, çok satırlı INSERT'lerle yazılır.
+# Bir batch hata verirse savepoint'e dönülür ve o batch satır satır denenir; böylece
+# hatalı satırlar raporlanır, geri kalanı yine de eklenir.
+# upsert_many aynı yolu INSERT ... ON DUPLICATE KEY UPDATE ile kullanır: aynı anahtarla
+# tekrar gelen satırlar güncellenir, böylece örtüşen snapshot'lar tek geçişte yazılır.
+# Anahtar tabloda birincil anahtar ya da benzersiz indeks değilse upsert reddedilir:
+# çakışma olmayacağından her satır sessizce yeniden eklenirdi.
+
+from Database import db
+from services.cache import result_cache
+
+
+def multi_row_insert(table_name, columns, row_count, suffix=""):
+    row_placeholder = '(' + ', '.join(['%s'] * len(columns)) + ')'
+    query = (f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES "
+             + ', '.join([row_placeholder] * row_count))
+    return f"{query} {suffix}" if suffix else query
+
+
+def require_unique_key(table_name, primary_key):
+    """primary_key tabloda birincil anahtar ya da benzersiz indeks değilse ValueError."""
+    if not db.has_unique_key(table_name, primary_key):
+        raise ValueError(f"Cannot upsert into {table_name}: ({', '.join(primary_key)}) is not a primary key"
+                         f" or unique index of the table (run python migrate.py)")
+
+
+def upsert_clause(table_name, columns, primary_key):
+    """
+    Anahtar dışındaki sütunları gelen değerle güncelleyen ON DUPLICATE KEY UPDATE.
+    VALUES(col) MySQL 8'de eskimiş sayılsa da MariaDB ve MySQL 5.7 ile de çalışır.
+    SQLite'ta karşılığı hedefsiz ON CONFLICT DO UPDATE (3.35+); MySQL gibi herhangi bir
+    benzersiz anahtar çakışmasında güncellenir. Anahtar tabloda benzersiz değilse ValueError.
+    """
+    require_unique_key(table_name, primary_key)
+    updates = [col for col in columns if col not in primary_key]
+    if db.backend == 'sqlite':
+        if not updates:
+            return "ON CONFLICT DO NOTHING"
+        return "ON CONFLICT DO UPDATE SET " + ', '.join(f"{col} = excluded.{col}" for col in updates)
+    if not updates:
+        # Sadece anahtardan oluşan tablo: tekrar gelen satır olduğu gibi kalır
+        return f"ON DUPLICATE KEY UPDATE {primary_key[0]} = {primary_key[0]}"
+    return "ON DUPLICATE KEY UPDATE " + ', '.join(f"{col} = VALUES({col})" for col in updates)
+
+
+def _write_rows_one_by_one(cursor, table_name, columns, chunk, suffix):
+    """Hatalı batch'in satırlarını tek tek dener. (yazılan satır sayısı, hatalar) döndürür."""
+    query = multi_row_insert(table_name, columns, 1, suffix)
+    written, errors = 0, []
+    for index, values in chunk:
+        cursor.execute("SAVEPOINT bulk_row")
+        try:
+            cursor.execute(query, values)
+            written += 1
+        except Exception as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT bulk_row")
+            errors.append({'row': index, 'error': str(e)})
+    return written, errors
+
+
+def insert_many(table_name, columns, rows, batch_size=1000):
+    """
+    `rows` (dict listesi) tablosuna toplu ekler. Eksik sütunlar NULL olur, bilinmeyen
+    anahtarlar yok sayılır. {'inserted': n, 'errors': [{'row': index, 'error': mesaj}]}
+    döndürür; 'row' girdideki satırın sırasıdır (bağlantı hatasında None).
+    """
+    written, errors = _write_many(table_name, columns, rows, batch_size)
+    return {'inserted': written, 'errors': errors}
+
+
+def upsert_many(table_name, columns, primary_key, rows, batch_size=1000):
+    """
+    insert_many gibi, fakat birincil anahtarı var olan satırlar güncellenir.
+    {'upserted': n, 'errors': [...]} döndürür (n: eklenen ya da güncellenen satır).
+    Anahtar tabloda benzersiz değilse hiçbir satır yazılmaz, hata 'row': None ile döner.
+    """
+    try:
+        suffix = upsert_clause(table_name, columns, primary_key)
+    except ValueError as e:
+        return {'upserted': 0, 'errors': [{'row': None, 'error': str(e)}]}
+    written, errors = _write_many(table_name, columns, rows, batch_size, suffix)
+    return {'upserted': written, 'errors': errors}
+
+
+def _write_many(table_name, columns, rows, batch_size, suffix=""):
+    errors = []
+    prepared = []
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors.append({'row': index, 'error': "Row must be an object"})
+            continue
+        prepared.append((index, tuple(row.get(col) for col in columns)))
+
+    conn = db.get_connection()
+    written = 0
+    try:
+        cursor = conn.cursor()
+        for start in range(0, len(prepared), batch_size):
+            chunk = prepared[start:start + batch_size]
+            params = [value for _, values in chunk for value in values]
+
+            cursor.execute("SAVEPOINT bulk_batch")
+            try:
+                cursor.execute(multi_row_insert(table_name, columns, len(chunk), suffix), params)
+                written += len(chunk)
+            except Exception:
+                cursor.execute("ROLLBACK TO SAVEPOINT bulk_batch")
+                chunk_written, chunk_errors = _write_rows_one_by_one(cursor, table_name, columns, chunk, suffix)
+                written += chunk_written
+                errors.extend(chunk_errors)
+
+        conn.commit()
+        if written:
+            result_cache.invalidate(table_name)
+        cursor.close()
+
+    except Exception as e:
+        print(f"Error (bulk write {table_name}): {e}")
+        errors.append({'row': None, 'error': str(e)})
+        written = 0
+    finally:
+        if conn:
+            conn.close()
+
+    errors.sort(key=lambda error: -1 if error['row'] is None else error['row'])
+    return written, errors
@@ -0,0 +1,450 @@
+# Servislerin okuma sonuçları için paylaşımlı önbellek.
+# Anahtar (veritabanı, tablo, sorgu, parametreler); bir tabloya yazan servis fonksiyonu commit'ten
+# sonra result_cache.invalidate(tablo) çağırır ve o tablonun tüm sonuçları geçersizleşir.
+#
+# Varsayılan arka uç yerel bir SQLite dosyasıdır; böylece aynı makinedeki tüm worker
+# süreçleri (gunicorn vb.) hem sonuçları hem de tablo "nesil" sayaçlarını paylaşır.
+# Bir süreçte yapılan yazma, diğerlerinin önbelleğini de anında geçersiz kılar.
+#
+# Varsayılan dosya kullanıcıya özel bir dizindedir (<tmp>/moneyball-<uid>, 0700; dosya 0600)
+# ve değerler JSON olarak saklanır: dosyaya yazabilen biri en fazla yanlış sonuç
+# döndürtebilir, kod çalıştıramaz.
+#
+# Ortam değişkenleri:
+#   MONEYBALL_CACHE_BACKEND  sqlite (varsayılan) | memory | none
+#   MONEYBALL_CACHE_PATH     SQLite dosyası (varsayılan: <tmp>/moneyball-<uid>/cache.sqlite3)
+
+import base64
+import hashlib
+import json
+import os
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, time as clock_time, timedelta
+from decimal import Decimal
+
+
+class MemoryBackend:
+    """Süreç içi LRU. Worker'lar arasında paylaşılmaz; tek süreçli kurulumlar içindir."""
+
+    name = 'memory'
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (table, generation, expires_at, value)
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, table_name, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            entry_table, generation, expires_at, value = entry
+            if expires_at <= now or generation != self._generations.get(entry_table, 0):
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, table_name, generation, expires_at, value):
+        with self._lock:
+            self._entries[key] = (table_name, generation, expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generation(self, table_name):
+        with self._lock:
+            return self._generations.get(table_name, 0)
+
+    def bump(self, table_name):
+        with self._lock:
+            self._generations[table_name] = self._generations.get(table_name, 0) + 1
+            for key in [k for k, e in self._entries.items() if e[0] == table_name]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self):
+        with self._lock:
+            return len(self._entries)
+
+
+# --- Değer kodlaması ---
+# Önbellekteki değerler satır listeleri (tuple ya da dict) ve sayılardır. JSON'un
+# karşılamadığı tipler tek anahtarlı etiketli nesnelere çevrilir; dict'ler de
+# (anahtar, değer) çiftleri olarak etiketlenir, böylece her JSON nesnesi bir etikettir.
+_DECODERS = {
+    '$tuple': tuple,
+    '$dict': dict,
+    '$datetime': datetime.fromisoformat,
+    '$date': date.fromisoformat,
+    '$time': clock_time.fromisoformat,
+    '$timedelta': lambda seconds: timedelta(seconds=seconds),
+    '$decimal': Decimal,
+    '$bytes': base64.b64decode,
+}
+
+
+def _encode(value):
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, tuple):
+        return {'$tuple': [_encode(item) for item in value]}
+    if isinstance(value, dict):
+        return {'$dict': [[key, _encode(item)] for key, item in value.items()]}
+    # datetime, date'in alt sınıfıdır; önce kontrol edilmeli
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, date):
+        return {'$date': value.isoformat()}
+    if isinstance(value, clock_time):
+        return {'$time': value.isoformat()}
+    if isinstance(value, timedelta):
+        return {'$timedelta': value.total_seconds()}
+    if isinstance(value, Decimal):
+        return {'$decimal': str(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {'$bytes': base64.b64encode(value).decode('ascii')}
+    raise TypeError(f"Cannot cache a value of type {type(value).__name__}")
+
+
+def _decode_object(obj):
+    (tag, payload), = obj.items()
+    return _DECODERS[tag](payload)
+
+
+def dumps(value):
+    return json.dumps(_encode(value), separators=(',', ':'))
+
+
+def loads(text):
+    return json.loads(text, object_hook=_decode_object)
+
+
+class SQLiteBackend:
+    """
+    Yerel SQLite dosyasında tutulan, süreçler arası paylaşılan önbellek.
+    Değerler JSON ile saklanır (bkz. dumps). Her tablo için bir nesil sayacı tutulur; kayıt
+    yazıldığı andaki nesil güncel değilse geçersiz sayılır. LRU için last_used kullanılır,
+    kayıt sayısı max_entries'i aşınca en eskiler silinir. İsabetlerde last_used hemen
+    yazılmaz: dokunulan anahtarlar bellekte biriktirilir ve TOUCH_EVERY anahtarda bir ya da
+    budamadan önce tek transaction'da yazılır (okuma yolunda yazma kilidi alınmaz).
+    """
+
+    name = 'sqlite'
+    PRUNE_EVERY = 64
+    TOUCH_EVERY = 64
+    # Dosyadaki değer biçimi; farklıysa (ör. eski pickle kayıtları) entries yeniden kurulur
+    FORMAT = 2
+
+    def __init__(self, path, max_entries=1024):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._sets = 0
+        self._touched = {}
+        self._touch_lock = threading.Lock()
+        _create_private_file(path)
+        self._setup()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        # fork sonrası ebeveynin bağlantısı kullanılmamalı
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _setup(self):
+        conn = self._connection()
+        if conn.execute("PRAGMA user_version").fetchone()[0] != self.FORMAT:
+            conn.execute("DROP TABLE IF EXISTS entries")
+            conn.execute(f"PRAGMA user_version = {self.FORMAT}")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS generations ("
+            " table_name TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, table_name TEXT NOT NULL, generation INTEGER NOT NULL,"
+            " expires_at REAL NOT NULL, last_used REAL NOT NULL, value TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_table ON entries (table_name)")
+
+    def get(self, key, table_name, now):
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT e.value FROM entries e"
+            " LEFT JOIN generations g ON g.table_name = e.table_name"
+            " WHERE e.key = ? AND e.expires_at > ? AND e.generation = COALESCE(g.generation, 0)",
+            (key, now),
+        ).fetchone()
+        if row is None:
+            return False, None
+        with self._touch_lock:
+            self._touched[key] = now
+            flush = len(self._touched) >= self.TOUCH_EVERY
+        if flush:
+            self._flush_touches(conn)
+        return True, loads(row[0])
+
+    def _flush_touches(self, conn):
+        """Biriken isabetlerin last_used değerlerini tek transaction'da yazar."""
+        with self._touch_lock:
+            touched, self._touched = self._touched, {}
+        if not touched:
+            return
+        conn.execute("BEGIN")
+        try:
+            conn.executemany("UPDATE entries SET last_used = MAX(last_used, ?) WHERE key = ?",
+                             [(used, key) for key, used in touched.items()])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def set(self, key, table_name, generation, expires_at, value):
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, table_name, generation, expires_at, last_used, value)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (key, table_name, generation, expires_at, time.time(), dumps(value)),
+        )
+        self._sets += 1
+        if self._sets % self.PRUNE_EVERY == 0:
+            self._prune(conn)
+
+    def _prune(self, conn):
+        self._flush_touches(conn)
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM entries WHERE key IN ("
+            " SELECT key FROM entries ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def generation(self, table_name):
+        row = self._connection().execute(
+            "SELECT generation FROM generations WHERE table_name = ?", (table_name,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, table_name):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO generations (table_name, generation) VALUES (?, 1)"
+                " ON CONFLICT(table_name) DO UPDATE SET generation = generation + 1",
+                (table_name,),
+            )
+            conn.execute("DELETE FROM entries WHERE table_name = ?", (table_name,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def clear(self):
+        with self._touch_lock:
+            self._touched.clear()
+        self._connection().execute("DELETE FROM entries")
+
+    def size(self):
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def _check_private(path, mode_mask):
+    """path bu kullanıcıya ait değilse ya da başkalarına mode_mask izinleri açıksa OSError."""
+    info = os.lstat(path)
+    if stat.S_ISLNK(info.st_mode):
+        raise OSError(f"{path} is a symbolic link")
+    if hasattr(os, 'getuid') and info.st_uid != os.getuid():
+        raise OSError(f"{path} is owned by another user")
+    if info.st_mode & mode_mask:
+        raise OSError(f"{path} is accessible by other users (mode {stat.S_IMODE(info.st_mode):o})")
+
+
+def _create_private_file(path):
+    """Önbellek dosyasını 0600 ile oluşturur; var olan dosyanın sahibini ve izinlerini kontrol eder."""
+    flags = os.O_RDWR | os.O_CREAT | getattr(os, 'O_NOFOLLOW', 0)
+    os.close(os.open(path, flags, 0o600))
+    _check_private(path, 0o022)
+
+
+def private_cache_dir():
+    """<tmp>/moneyball-<uid>: sadece bu kullanıcının erişebildiği (0700) önbellek dizini."""
+    user = os.getuid() if hasattr(os, 'getuid') else os.environ.get('USERNAME', 'user')
+    path = os.path.join(tempfile.gettempdir(), f"moneyball-{user}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    _check_private(path, 0o077)
+    return path
+
+
+class ResultCache:
+    """
+    (tablo, sorgu, parametreler) -> sonuç önbelleği; TTL + LRU, isabet/ıska sayaçları.
+    Arka uç hatası (ör. kilitli dosya) önbelleği devre dışı bırakmaz, o çağrı
+    doğrudan veritabanına gider.
+    """
+
+    def __init__(self, backend=None, ttl=300):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'sets': 0, 'invalidations': 0, 'errors': 0}
+        # Bağlı veritabanının kimliği (Database.configure ayarlar); aynı önbellek dosyasını
+        # kullanan farklı veritabanlarının sonuçları karışmaz
+        self.namespace = ''
+
+    def _key(self, table_name, query, params):
+        raw = repr((self.namespace, table_name, ' '.join(query.split()), tuple(params)))
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _bump(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _error(self, fn, e):
+        self._bump('errors')
+        print(f"Error (ResultCache.{fn}): {e}")
+
+    def get(self, table_name, query, params=(), default=None):
+        if self.backend is None:
+            return default
+        try:
+            found, value = self.backend.get(self._key(table_name, query, params), table_name, time.time())
+        except Exception as e:
+            self._error('get', e)
+            found, value = False, None
+        self._bump('hits' if found else 'misses')
+        return value if found else default
+
+    def set(self, table_name, query, params, value, generation=None):
+        if self.backend is None:
+            return
+        try:
+            if generation is None:
+                generation = self.backend.generation(table_name)
+            self.backend.set(self._key(table_name, query, params), table_name,
+                             generation, time.time() + self.ttl, value)
+            self._bump('sets')
+        except Exception as e:
+            self._error('set', e)
+
+    def get_or_load(self, table_name, query, params, loader):
+        """Önbellekte yoksa loader() çağrılır ve sonucu saklanır. loader'ın hataları yukarı iletilir."""
+        if self.backend is None:
+            return loader()
+        missing = object()
+        value = self.get(table_name, query, params, default=missing)
+        if value is not missing:
+            return value
+
+        # Nesil yüklemeden ÖNCE okunur: yükleme sırasında tabloya yazılırsa
+        # sonuç zaten eski nesille saklanır ve bir sonraki okumada geçersiz sayılır.
+        generation = self.generation(table_name)
+        value = loader()
+        self.set(table_name, query, params, value, generation=generation)
+        return value
+
+    def generation(self, table_name):
+        """Tablonun nesil sayacı; her invalidate() ile artar (PlayerStore da bunu izler)."""
+        if self.backend is None:
+            return 0
+        try:
+            return self.backend.generation(table_name)
+        except Exception as e:
+            self._error('generation', e)
+            return 0
+
+    def invalidate(self, table_name):
+        """Yazma işlemlerinden sonra çağrılır; tablonun tüm süreçlerdeki sonuçlarını geçersiz kılar."""
+        if self.backend is None:
+            return
+        try:
+            self.backend.bump(table_name)
+            self._bump('invalidations')
+        except Exception as e:
+            self._error('invalidate', e)
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters['hits'] + counters['misses']
+        try:
+            entries = self.backend.size() if self.backend is not None else 0
+        except Exception:
+            entries = None
+        return {
+            'backend': self.backend.name if self.backend is not None else 'none',
+            'entries': entries,
+            'hit_ratio': counters['hits'] / lookups if lookups else 0.0,
+            **counters,
+        }
+
+
+class CountCache:
+    """
+    (tablo, arama terimi) -> COUNT(*) sonucu; result_cache üzerinde bir görünüm.
+    Sayfalar arasında gezinirken aynı filtre için tabloyu her sayfada yeniden
+    saymamak için kullanılır.
+    """
+
+    QUERY = 'COUNT(*)'
+
+    def __init__(self, results):
+        self._results = results
+
+    def get(self, table_name, search_term):
+        return self._results.get(table_name, self.QUERY, (search_term or "",))
+
+    def set(self, table_name, search_term, value, generation=None):
+        """generation: sayım başlamadan önce okunan tablo nesli (bkz. ResultCache.get_or_load)."""
+        self._results.set(table_name, self.QUERY, (search_term or "",), value, generation=generation)
+
+    def generation(self, table_name):
+        return self._results.generation(table_name)
+
+    def get_or_load(self, table_name, search_term, loader):
+        return self._results.get_or_load(table_name, self.QUERY, (search_term or "",), loader)
+
+    def invalidate(self, table_name):
+        self._results.invalidate(table_name)
+
+
+def _default_backend(max_entries=1024):
+    kind = os.environ.get('MONEYBALL_CACHE_BACKEND', 'sqlite').lower()
+    if kind == 'none':
+        return None
+    if kind == 'sqlite':
+        path = os.environ.get('MONEYBALL_CACHE_PATH')
+        try:
+            path = path or os.path.join(private_cache_dir(), 'cache.sqlite3')
+            return SQLiteBackend(path, max_entries=max_entries)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Önbellek dosyası açılamadı ({path}), bellek içi önbellek kullanılıyor: {e}")
+    return MemoryBackend(max_entries=max_entries)
+
+
+result_cache = ResultCache(_default_backend())
+count_cache = CountCache(result_cache)
@@ -1,5 +1,12 @@
 from Database import db
 from Models.ClubGames import ClubGames
+from services.bulk import insert_many, upsert_many
+from services.cache import count_cache, result_cache
+from services.query_utils import (
+    build_rows, cached_fetchall, cached_fetchone, fetch_count, page_with_total, select_list,
+    tuple_cursor,
+)
+from services.search import build_search, relevance_order
 
 # ClubGames Sınıfının tüm alanlarını listeleyelim
 CLUB_GAME_COLUMNS = [
@@ -9,7 +16,13 @@ CLUB_GAME_COLUMNS = [
 ]
 
 # Arama için kullanılabilecek sütunlar
-SEARCHABLE_CLUB_GAME_COLUMNS = ["own_manager_name", "opponent_manager_name", "opponent_id", "hosting"]
+SEARCH_FIELDS = {
+    "table": "club_games",
+    "text": ["own_manager_name", "opponent_manager_name"],
+    "prefix": ["hosting"],
+    "number": ["opponent_id"],
+}
+PRIMARY_KEY = ('game_id', 'club_id')
 
 SELECT_FIELDS = ', '.join(CLUB_GAME_COLUMNS)
 PLACEHOLDERS = ', '.join(['%s'] * len(CLUB_GAME_COLUMNS))
@@ -23,14 +36,13 @@ def get_club_game(game_id, club_id):
     """Belirtilen game_id ve club_id'ye sahip kulüp oyununu veritabanından getirir."""
     conn = db.get_connection()
     try:
-        cursor = conn.cursor()
+        cursor = tuple_cursor(conn)
         query = f"SELECT {SELECT_FIELDS} FROM {TABLE_NAME} WHERE game_id = %s AND club_id = %s"
-        cursor.execute(query, (game_id, club_id))
-        result = cursor.fetchone()
+        result = cached_fetchone(cursor, TABLE_NAME, query, (game_id, club_id))
         cursor.close()
 
         if result:
-            return ClubGames(**result)
+            return ClubGames.from_row(result)
         return None
 
     except Exception as e:
@@ -59,6 +71,7 @@ def insert_club_game(club_game_data: dict):
         new_keys = (club_game_data.get('game_id'), club_game_data.get('club_id'))
 
         conn.commit()
+        result_cache.invalidate(TABLE_NAME)
         cursor.close()
         return new_keys
 
@@ -69,6 +82,24 @@ def insert_club_game(club_game_data: dict):
         if conn:
             conn.close()
 
+# --- (Bulk Insert) ---
+def insert_many_club_games(club_games_data: list, batch_size=1000):
+    """
+    Birden fazla kulüp maçı kaydını tek transaction içinde, çok satırlı INSERT'lerle ekler.
+    {'inserted': n, 'errors': [{'row': sıra, 'error': mesaj}]} döndürür (bkz. services/bulk.py).
+    """
+    return insert_many(TABLE_NAME, CLUB_GAME_COLUMNS, club_games_data, batch_size)
+
+# --- (Bulk Upsert) ---
+def upsert_many_club_games(club_games_data: list, batch_size=1000):
+    """
+    Kulüp maçı kayıtlarını (game_id, club_id) anahtarına göre ekler ya da günceller
+    (çok satırlı INSERT ... ON DUPLICATE KEY UPDATE, tek transaction).
+    Örtüşen snapshot'ları yeniden yüklemek güvenlidir.
+    {'upserted': n, 'errors': [...]} döndürür (bkz. services/bulk.py).
+    """
+    return upsert_many(TABLE_NAME, CLUB_GAME_COLUMNS, PRIMARY_KEY, club_games_data, batch_size)
+
 # --- (Delete) ---
 def delete_club_game(game_id, club_id):
     """Belirtilen game_id ve club_id'ye sahip kaydı veritabanından siler."""
@@ -82,6 +113,7 @@ def delete_club_game(game_id, club_id):
         rows_affected = cursor.rowcount
 
         conn.commit()
+        result_cache.invalidate(TABLE_NAME)
         cursor.close()
         return rows_affected > 0
 
@@ -123,6 +155,7 @@ def update_club_game(game_id, club_id, update_data: dict):
         rows_affected = cursor.rowcount
 
         conn.commit()
+        result_cache.invalidate(TABLE_NAME)
         cursor.close()
         return rows_affected
 
@@ -138,23 +171,18 @@ def update_club_game(game_id, club_id, update_data: dict):
 def search_all_club_games_by_club(club_id):
     """Belirtilen kulübün (club_id) tüm maç kayıtlarını getirir."""
     conn = db.get_connection()
-    results_list = []
     try:
-        cursor = conn.cursor()
+        cursor = tuple_cursor(conn)
 
         query = f"""
         SELECT {SELECT_FIELDS} FROM {TABLE_NAME}
         WHERE club_id = %s
         ORDER BY game_id DESC
         """
-        cursor.execute(query, (club_id,))
-        results = cursor.fetchall()
+        results = cached_fetchall(cursor, TABLE_NAME, query, (club_id,))
         cursor.close()
 
-        for row in results:
-            results_list.append(ClubGames(**row))
-
-        return results_list
+        return ClubGames.from_rows(results)
 
     except Exception as e:
         print(f"Error (search_all_club_games_by_club): {e}")
@@ -164,28 +192,20 @@ def search_all_club_games_by_club(club_id):
             conn.close()
 
 # --- (List All with Pagination) ---
+def _count_club_games(cursor, search_term=""):
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+    return fetch_count(cursor, TABLE_NAME, where_clause, query_params)
+
+
 def get_total_club_game_count(search_term=""):
     """Filtrelenmiş veya tüm ClubGames kayıtlarının toplam sayısını döndürür."""
     conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        
-        where_clause = ""
-        query_params = []
-        
-        if search_term:
-            search_like = f"%{search_term}%"
-            search_cols = SEARCHABLE_CLUB_GAME_COLUMNS
-            where_conditions = [f"{col} LIKE %s" for col in search_cols]
-            where_clause = " WHERE " + " OR ".join(where_conditions)
-            query_params = [search_like] * len(search_cols)
-
-        query = f"SELECT COUNT(*) FROM {TABLE_NAME} {where_clause}"
-        cursor.execute(query, tuple(query_params))
-        result = cursor.fetchone()
-        
-        return result[0] if isinstance(result, tuple) else (result['COUNT(*)'] if result else 0)
-        
+        return count_cache.get_or_load(
+            TABLE_NAME, search_term, lambda: _count_club_games(cursor, search_term)
+        )
+
     except Exception as e:
         print(f"Error (get_total_club_game_count): {e}")
         return 0
@@ -193,55 +213,65 @@ def get_total_club_game_count(search_term=""):
         if conn: conn.close()
 
 
-def get_all_club_games(page=1, per_page=50, search_term="", sort_by="game_id", sort_order="ASC"):
-    """ClubGames kayıtlarını sayfalama, arama ve sıralama terimlerine göre listeler."""
-    conn = db.get_connection()
-    results_list = []
-    
+def _fetch_club_games_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=None):
     offset = (page - 1) * per_page
-    
-    where_clause = ""
-    query_params = []
-    
-    if search_term:
-        search_like = f"%{search_term}%"
-        search_cols = SEARCHABLE_CLUB_GAME_COLUMNS
-        where_conditions = [f"{col} LIKE %s" for col in search_cols]
-        where_clause = " WHERE " + " OR ".join(where_conditions)
-        query_params = [search_like] * len(search_cols)
-        
+
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+
     # Sıralama parametrelerini güvenli hale getir
     safe_sort_order = sort_order.upper() if sort_order.upper() in ["ASC", "DESC"] else "ASC"
     if sort_by not in CLUB_GAME_COLUMNS:
         sort_by = "game_id"
+    order_by = f"{sort_by} {safe_sort_order}"
+
+    # Arama varsa sonuçlar önce alaka düzeyine göre sıralanır
+    relevance, relevance_params = relevance_order(SEARCH_FIELDS, search_term)
+    if relevance:
+        order_by = f"{relevance}, {order_by}"
+        query_params.extend(relevance_params)
 
     # LIMIT ve OFFSET parametrelerini en sona ekle
     query_params.extend([per_page, offset])
 
+    query = f"""
+        SELECT {select_list(CLUB_GAME_COLUMNS, columns, (sort_by,) + PRIMARY_KEY)} FROM {TABLE_NAME}
+        {where_clause}
+        ORDER BY {order_by}
+        LIMIT %s OFFSET %s
+    """
+
+    results = cached_fetchall(cursor, TABLE_NAME, query, query_params)
+
+    return build_rows(results, ClubGames, columns)
+
+
+def get_all_club_games(page=1, per_page=50, search_term="", sort_by="game_id", sort_order="ASC", columns=None):
+    """ClubGames kayıtlarını sayfalama, arama ve sıralama terimlerine göre listeler."""
+    conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        
-        query = f"""
-            SELECT {SELECT_FIELDS} FROM {TABLE_NAME}
-            {where_clause}
-            ORDER BY {sort_by} {safe_sort_order}
-            LIMIT %s OFFSET %s
-        """
-        
-        cursor.execute(query, tuple(query_params))       
-        results = cursor.fetchall()
-        
-        for row in results:
-            try:
-                obj = ClubGames(**row) 
-                results_list.append(obj)
-            except TypeError as e:
-                print(f"Model conversion error (Row skipped): {e}") 
-
-        return results_list
+        return _fetch_club_games_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=columns)
 
     except Exception as e:
         print(f"Error (get_all_club_games): {e}")
         return []
     finally:
-        if conn: conn.close()
\ No newline at end of file
+        if conn: conn.close()
+
+
+def get_all_club_games_with_total(page=1, per_page=50, search_term="", sort_by="game_id", sort_order="ASC", columns=None):
+    """Returns (club_games, total_count) for one page using a single connection."""
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return page_with_total(
+            TABLE_NAME, page, per_page, search_term,
+            lambda: _fetch_club_games_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=columns),
+            lambda: _count_club_games(cursor, search_term),
+        )
+
+    except Exception as e:
+        print(f"Error (get_all_club_games_with_total): {e}")
+        return [], 0
+    finally:
+        if conn: conn.close()
@@ -1,5 +1,12 @@
 from Database import db
 from Models.Clubs import Clubs
+from services.bulk import insert_many
+from services.cache import count_cache, result_cache
+from services.query_utils import (
+    build_rows, cached_fetchall, cached_fetchone, fetch_count, page_with_total, select_list,
+    tuple_cursor,
+)
+from services.search import build_search, relevance_order
 
 # Clubs Sınıfının tüm alanlarını listeleyelim
 CLUB_COLUMNS = [
@@ -13,6 +20,14 @@ SELECT_FIELDS = ', '.join(CLUB_COLUMNS)
 PLACEHOLDERS = ', '.join(['%s'] * len(CLUB_COLUMNS))
 TABLE_NAME = "clubs" # Clubs tablosu varsayımı
 
+# Arama için uygun sütunlar: İsim, Stadyum, Menajer
+SEARCH_FIELDS = {
+    "table": "clubs",
+    "text": ["name", "stadium_name", "coach_name"],
+    "prefix": ["domestic_competition_id"],
+}
+PRIMARY_KEY = ('club_id',)
+
 ## Clubs Veritabanı İşlemleri
 # -----------------------------
 
@@ -21,14 +36,13 @@ def get_club(club_id):
     """Belirtilen club_id'ye sahip kulübü veritabanından getirir."""
     conn = db.get_connection()
     try:
-        cursor = conn.cursor()
+        cursor = tuple_cursor(conn)
         query = f"SELECT {SELECT_FIELDS} FROM {TABLE_NAME} WHERE club_id = %s"
-        cursor.execute(query, (club_id,))
-        result = cursor.fetchone()
+        result = cached_fetchone(cursor, TABLE_NAME, query, (club_id,))
         cursor.close()
 
         if result:
-            return Clubs(**result)
+            return Clubs.from_row(result)
         return None
 
     except Exception as e:
@@ -59,6 +73,7 @@ def insert_club(club_data: dict):
         new_id = club_data.get('club_id', cursor.lastrowid)
 
         conn.commit()
+        result_cache.invalidate(TABLE_NAME)
         cursor.close()
         return new_id
 
@@ -69,6 +84,14 @@ def insert_club(club_data: dict):
         if conn:
             conn.close()
 
+# --- (Bulk Insert) ---
+def insert_many_clubs(clubs_data: list, batch_size=1000):
+    """
+    Birden fazla kulübü tek transaction içinde, çok satırlı INSERT'lerle ekler.
+    {'inserted': n, 'errors': [{'row': sıra, 'error': mesaj}]} döndürür (bkz. services/bulk.py).
+    """
+    return insert_many(TABLE_NAME, CLUB_COLUMNS, clubs_data, batch_size)
+
 # --- (Delete) ---
 def delete_club(club_id):
     """Belirtilen club_id'ye sahip kulübü veritabanından siler."""
@@ -82,6 +105,7 @@ def delete_club(club_id):
         rows_affected = cursor.rowcount
 
         conn.commit()
+        result_cache.invalidate(TABLE_NAME)
         cursor.close()
         return rows_affected > 0
 
@@ -121,6 +145,7 @@ def update_club(club_id, update_data: dict):
         rows_affected = cursor.rowcount
 
         conn.commit()
+        result_cache.invalidate(TABLE_NAME)
         cursor.close()
         return rows_affected
 
@@ -135,23 +160,18 @@ def update_club(club_id, update_data: dict):
 def search_clubs_by_competition(competition_id):
     """Belirtilen lige (domestic_competition_id) ait tüm kulüpleri getirir."""
     conn = db.get_connection()
-    results_list = []
     try:
-        cursor = conn.cursor()
+        cursor = tuple_cursor(conn)
 
         query = f"""
         SELECT {SELECT_FIELDS} FROM {TABLE_NAME} 
         WHERE domestic_competition_id = %s
         ORDER BY total_market_value DESC
         """
-        cursor.execute(query, (competition_id,))
-        results = cursor.fetchall()
+        results = cached_fetchall(cursor, TABLE_NAME, query, (competition_id,))
         cursor.close()
 
-        for row in results:
-            results_list.append(Clubs(**row))
-
-        return results_list
+        return Clubs.from_rows(results)
 
     except Exception as e:
         print(f"Error (search_clubs_by_competition): {e}")
@@ -161,29 +181,20 @@ def search_clubs_by_competition(competition_id):
             conn.close()
 
 # --- (List All with Pagination) ---
+def _count_clubs(cursor, search_term=""):
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+    return fetch_count(cursor, TABLE_NAME, where_clause, query_params)
+
+
 def get_total_club_count(search_term=""):
     """Filtrelenmiş veya tüm kulüplerin toplam sayısını döndürür."""
     conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        
-        where_clause = ""
-        query_params = []
-        
-        if search_term:
-            search_like = f"%{search_term}%"
-            # Arama için uygun sütunlar: İsim, Stadyum, Menajer
-            search_cols = ["name", "stadium_name", "coach_name", "domestic_competition_id"]
-            where_conditions = [f"{col} LIKE %s" for col in search_cols]
-            where_clause = " WHERE " + " OR ".join(where_conditions)
-            query_params = [search_like] * len(search_cols)
-
-        query = f"SELECT COUNT(*) FROM {TABLE_NAME} {where_clause}"
-        cursor.execute(query, tuple(query_params))
-        result = cursor.fetchone()
-        
-        return result[0] if isinstance(result, tuple) else (result['COUNT(*)'] if result else 0)
-        
+        return count_cache.get_or_load(
+            TABLE_NAME, search_term, lambda: _count_clubs(cursor, search_term)
+        )
+
     except Exception as e:
         print(f"Error (get_total_club_count): {e}")
         return 0
@@ -191,55 +202,65 @@ def get_total_club_count(search_term=""):
         if conn: conn.close()
 
 
-def get_all_clubs(page=1, per_page=50, search_term="", sort_by="club_id", sort_order="ASC"):
-    """Kulüpleri sayfalama, arama ve sıralama terimlerine göre listeler."""
-    conn = db.get_connection()
-    results_list = []
-    
+def _fetch_clubs_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=None):
     offset = (page - 1) * per_page
-    
-    where_clause = ""
-    query_params = []
-    
-    if search_term:
-        search_like = f"%{search_term}%"
-        search_cols = ["name", "stadium_name", "coach_name", "domestic_competition_id"]
-        where_conditions = [f"{col} LIKE %s" for col in search_cols]
-        where_clause = " WHERE " + " OR ".join(where_conditions)
-        query_params = [search_like] * len(search_cols)
-        
+
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+
     # Sıralama parametrelerini güvenli hale getir
     safe_sort_order = sort_order.upper() if sort_order.upper() in ["ASC", "DESC"] else "ASC"
     if sort_by not in CLUB_COLUMNS:
         sort_by = "club_id"
+    order_by = f"{sort_by} {safe_sort_order}"
+
+    # Arama varsa sonuçlar önce alaka düzeyine göre sıralanır
+    relevance, relevance_params = relevance_order(SEARCH_FIELDS, search_term)
+    if relevance:
+        order_by = f"{relevance}, {order_by}"
+        query_params.extend(relevance_params)
 
     # LIMIT ve OFFSET parametrelerini en sona ekle
     query_params.extend([per_page, offset])
 
+    query = f"""
+        SELECT {select_list(CLUB_COLUMNS, columns, (sort_by,) + PRIMARY_KEY)} FROM {TABLE_NAME}
+        {where_clause}
+        ORDER BY {order_by}
+        LIMIT %s OFFSET %s
+    """
+
+    results = cached_fetchall(cursor, TABLE_NAME, query, query_params)
+
+    return build_rows(results, Clubs, columns)
+
+
+def get_all_clubs(page=1, per_page=50, search_term="", sort_by="club_id", sort_order="ASC", columns=None):
+    """Kulüpleri sayfalama, arama ve sıralama terimlerine göre listeler."""
+    conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        
-        query = f"""
-            SELECT {SELECT_FIELDS} FROM {TABLE_NAME}
-            {where_clause}
-            ORDER BY {sort_by} {safe_sort_order}
-            LIMIT %s OFFSET %s
-        """
-        
-        cursor.execute(query, tuple(query_params))       
-        results = cursor.fetchall()
-        
-        for row in results:
-            try:
-                obj = Clubs(**row) 
-                results_list.append(obj)
-            except TypeError as e:
-                print(f"Model conversion error (Row skipped): {e}") 
-
-        return results_list
+        return _fetch_clubs_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=columns)
 
     except Exception as e:
         print(f"Error (get_all_clubs): {e}")
         return []
     finally:
-        if conn: conn.close()
\ No newline at end of file
+        if conn: conn.close()
+
+
+def get_all_clubs_with_total(page=1, per_page=50, search_term="", sort_by="club_id", sort_order="ASC", columns=None):
+    """Returns (clubs, total_count) for one page using a single connection."""
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return page_with_total(
+            TABLE_NAME, page, per_page, search_term,
+            lambda: _fetch_clubs_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=columns),
+            lambda: _count_clubs(cursor, search_term),
+        )
+
+    except Exception as e:
+        print(f"Error (get_all_clubs_with_total): {e}")
+        return [], 0
+    finally:
+        if conn: conn.close()
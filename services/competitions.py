@@ -1,5 +1,12 @@
 from Database import db
 from Models.Competitions import Competitions # 'Models.Competitions' varsayılıyor
+from services.bulk import insert_many
+from services.cache import count_cache, result_cache
+from services.query_utils import (
+    build_rows, cached_fetchall, cached_fetchone, fetch_count, page_with_total, select_list,
+    tuple_cursor,
+)
+from services.search import build_search, relevance_order
 
 # Competitions Sınıfının tüm alanlarını listeleyelim
 # YENİ VE DÜZELTİLMİŞ TANIM
@@ -12,6 +19,14 @@ COMPETITION_COLUMNS = [
 SELECT_FIELDS = ', '.join(COMPETITION_COLUMNS)
 PLACEHOLDERS = ', '.join(['%s'] * len(COMPETITION_COLUMNS))
 
+# Arama sütunları competitions tablosu için ayarlandı
+SEARCH_FIELDS = {
+    "table": "competitions",
+    "text": ["name", "country_name"],
+    "prefix": ["competition_id", "domestic_league_code"],
+}
+PRIMARY_KEY = ('competition_id',)
+
 ## Competitions Veritabanı İşlemleri
 # ----------------------------------
 
@@ -20,15 +35,14 @@ def get_competition(competition_id):
     """Belirtilen competition_id'ye sahip ligi/müsabakayı veritabanından getirir."""
     conn = db.get_connection()
     try:
-        cursor = conn.cursor()
+        cursor = tuple_cursor(conn)
         query = f"SELECT {SELECT_FIELDS} FROM competitions WHERE competition_id = %s"
-        cursor.execute(query, (competition_id,))
-        result = cursor.fetchone()
+        result = cached_fetchone(cursor, "competitions", query, (competition_id,))
         cursor.close()
 
         if result:
             # Result'u Models.Competitions sınıfına dönüştürerek döndür
-            return Competitions(**result) 
+            return Competitions.from_row(result) 
         return None
 
     except Exception as e:
@@ -59,6 +73,7 @@ def insert_competition(competition_data: dict):
         new_id = competition_data.get('competition_id', cursor.lastrowid) 
 
         conn.commit()
+        result_cache.invalidate("competitions")
         cursor.close()
         return new_id
 
@@ -69,6 +84,14 @@ def insert_competition(competition_data: dict):
         if conn:
             conn.close()
 
+# --- (Bulk Insert) ---
+def insert_many_competitions(competitions_data: list, batch_size=1000):
+    """
+    Birden fazla ligi/müsabakayı tek transaction içinde, çok satırlı INSERT'lerle ekler.
+    {'inserted': n, 'errors': [{'row': sıra, 'error': mesaj}]} döndürür (bkz. services/bulk.py).
+    """
+    return insert_many("competitions", COMPETITION_COLUMNS, competitions_data, batch_size)
+
 # --- (Delete) ---
 def delete_competition(competition_id):
     """Belirtilen competition_id'ye sahip ligi/müsabakayı veritabanından siler."""
@@ -82,6 +105,7 @@ def delete_competition(competition_id):
         rows_affected = cursor.rowcount
 
         conn.commit()
+        result_cache.invalidate("competitions")
         cursor.close()
         return rows_affected > 0
 
@@ -121,6 +145,7 @@ def update_competition(competition_id, update_data: dict):
         rows_affected = cursor.rowcount
 
         conn.commit()
+        result_cache.invalidate("competitions")
         cursor.close()
         return rows_affected
 
@@ -160,30 +185,20 @@ def get_competition_total_market_value(competition_id):
             conn.close()
 
 # --- (List All with Pagination) ---
+def _count_competitions(cursor, search_term=""):
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+    return fetch_count(cursor, "competitions", where_clause, query_params)
+
+
 def get_total_competition_count(search_term=""):
     """Filtrelenmiş veya tüm liglerin/müsabakaların toplam sayısını döndürür."""
     conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        
-        where_clause = ""
-        query_params = []
-        
-        if search_term:
-            search_like = f"%{search_term}%"
-            # Arama sütunları competitions tablosu için ayarlandı
-            search_cols = ["name", "country_name", "domestic_league_code", "competition_id"]
-            where_conditions = [f"{col} LIKE %s" for col in search_cols]
-            where_clause = " WHERE " + " OR ".join(where_conditions)
-            query_params = [search_like] * len(search_cols)
-
-        query = f"SELECT COUNT(*) FROM competitions {where_clause}"
-        cursor.execute(query, tuple(query_params))
-        result = cursor.fetchone()
-        
-        # Sonuç formatı games.py'deki ile aynı tutulmuştur.
-        return result[0] if isinstance(result, tuple) else (result['COUNT(*)'] if result else 0)
-        
+        return count_cache.get_or_load(
+            "competitions", search_term, lambda: _count_competitions(cursor, search_term)
+        )
+
     except Exception as e:
         print(f"Error (get_total_competition_count): {e}")
         return 0
@@ -191,56 +206,65 @@ def get_total_competition_count(search_term=""):
         if conn: conn.close()
 
 
-def get_all_competitions(page=1, per_page=50, search_term="", sort_by="competition_id", sort_order="ASC"):
-    """Ligleri/müsabakaları sayfalama, arama ve sıralama terimlerine göre listeler."""
-    conn = db.get_connection()
-    results_list = []
-    
+def _fetch_competitions_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=None):
     offset = (page - 1) * per_page
-    
-    where_clause = ""
-    query_params = []
-    
-    if search_term:
-        search_like = f"%{search_term}%"
-        search_cols = ["name", "country_name", "domestic_league_code", "competition_id"]
-        where_conditions = [f"{col} LIKE %s" for col in search_cols]
-        where_clause = " WHERE " + " OR ".join(where_conditions)
-        query_params = [search_like] * len(search_cols)
-        
+
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+
     # Sıralama parametrelerini güvenli hale getir
     safe_sort_order = sort_order.upper() if sort_order.upper() in ["ASC", "DESC"] else "ASC"
     if sort_by not in COMPETITION_COLUMNS:
         sort_by = "competition_id"
+    order_by = f"{sort_by} {safe_sort_order}"
+
+    # Arama varsa sonuçlar önce alaka düzeyine göre sıralanır
+    relevance, relevance_params = relevance_order(SEARCH_FIELDS, search_term)
+    if relevance:
+        order_by = f"{relevance}, {order_by}"
+        query_params.extend(relevance_params)
 
     # LIMIT ve OFFSET parametrelerini en sona ekle
     query_params.extend([per_page, offset])
 
+    query = f"""
+        SELECT {select_list(COMPETITION_COLUMNS, columns, (sort_by,) + PRIMARY_KEY)} FROM competitions
+        {where_clause}
+        ORDER BY {order_by}
+        LIMIT %s OFFSET %s
+    """
+
+    results = cached_fetchall(cursor, "competitions", query, query_params)
+
+    return build_rows(results, Competitions, columns)
+
+
+def get_all_competitions(page=1, per_page=50, search_term="", sort_by="competition_id", sort_order="ASC", columns=None):
+    """Ligleri/müsabakaları sayfalama, arama ve sıralama terimlerine göre listeler."""
+    conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        
-        query = f"""
-            SELECT {SELECT_FIELDS} FROM competitions
-            {where_clause}
-            ORDER BY {sort_by} {safe_sort_order}
-            LIMIT %s OFFSET %s
-        """
-        
-        cursor.execute(query, tuple(query_params))       
-        results = cursor.fetchall()
-        
-        for row in results:
-            try:
-                # Row'u Models.Competitions sınıfına dönüştürerek listeye ekle
-                obj = Competitions(**row) 
-                results_list.append(obj)
-            except TypeError as e:
-                print(f"Model conversion error (Row skipped): {e}") 
-
-        return results_list
+        return _fetch_competitions_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=columns)
 
     except Exception as e:
         print(f"Error (get_all_competitions): {e}")
         return []
     finally:
         if conn: conn.close()
+
+
+def get_all_competitions_with_total(page=1, per_page=50, search_term="", sort_by="competition_id", sort_order="ASC", columns=None):
+    """Returns (competitions, total_count) for one page using a single connection."""
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return page_with_total(
+            "competitions", page, per_page, search_term,
+            lambda: _fetch_competitions_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=columns),
+            lambda: _count_competitions(cursor, search_term),
+        )
+
+    except Exception as e:
+        print(f"Error (get_all_competitions_with_total): {e}")
+        return [], 0
+    finally:
+        if conn: conn.close()
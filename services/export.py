@@ -0,0 +1,200 @@
+# Tabloların dışa aktarımı: /export/<tablo> ve export_data.py bunu kullanır.
+# Satırlar table_query.stream_batches'ten (sunucu tarafı cursor) parça parça gelir ve
+# her parça hemen kodlanıp çıktıya yazılır; bellek kullanımı tablo boyutundan bağımsızdır.
+#   csv     -> başlıklı CSV (compress=True ise gzip akışı)
+#   parquet -> parça başına bir row group (compress=True ise gzip codec, yoksa snappy)
+#   arrow   -> Arrow IPC stream (compress=True ise gzip akışı)
+# parquet/arrow için pyarrow gerekir; yüklü değilse sadece csv kullanılabilir.
+# parquet/arrow şeması ilk parçadan çıkarılmaz, schema.sql'deki sütun tiplerinden kurulur:
+# ilk parçada hep NULL olan bir sütun sonraki parçalarda akışı yarıda kesmez.
+
+import csv
+import io
+import re
+import time
+import zlib
+
+from Database import schema_column_types
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+FORMATS = ('csv', 'parquet', 'arrow')
+EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet', 'arrow': '.arrow'}
+MIMETYPES = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+
+def available_formats():
+    return FORMATS if pa is not None else ('csv',)
+
+
+def file_name(table_name, fmt, compress=False):
+    gz = compress and fmt != 'parquet'
+    return f"{table_name}{EXTENSIONS[fmt]}{'.gz' if gz else ''}"
+
+
+class ExportStats:
+    """Yazılan satır sayısı ve süre; iter_export ilerledikçe güncellenir."""
+
+    def __init__(self):
+        self.rows = 0
+        self.started = time.monotonic()
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return f"{self.rows:,} rows in {self.seconds:.2f}s ({self.rows_per_second:,.0f} rows/s)"
+
+
+def _csv_chunks(batches, columns, stats):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows([row[col] for col in columns] for row in rows)
+        stats.rows += len(rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+class _ChunkSink:
+    """pyarrow'un yazdığı baytları toplayan, sırayla okunabilen (seek'siz) çıktı."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def writable(self):
+        return True
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_type(sql_type):
+    """schema.sql tipinin Arrow karşılığı; bilinmeyen tipler metin olarak yazılır."""
+    name = re.match(r'\w+', sql_type).group().upper() if sql_type else ''
+    if name in ('INT', 'INTEGER', 'BIGINT', 'SMALLINT', 'TINYINT', 'MEDIUMINT'):
+        return pa.int64()
+    if name in ('FLOAT', 'DOUBLE', 'REAL'):
+        return pa.float64()
+    if name == 'DECIMAL':
+        precision, scale = (int(n) for n in re.findall(r'\d+', sql_type)[:2])
+        return pa.decimal128(precision, scale)
+    if name == 'DATE':
+        return pa.date32()
+    if name in ('TIMESTAMP', 'DATETIME'):
+        return pa.timestamp('us')
+    return pa.string()
+
+
+def _arrow_schema(table_name, columns):
+    """Sütun tipleri schema.sql'den; tabloda olmayan sütunlar metin."""
+    types = schema_column_types().get(table_name, {})
+    return pa.schema([pa.field(col, _arrow_type(types.get(col))) for col in columns])
+
+
+def _arrow_batch(rows, schema):
+    arrays = []
+    for field in schema:
+        values = [row[field.name] for row in rows]
+        if field.type == pa.string():
+            values = [value if value is None or isinstance(value, str) else str(value) for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _arrow_chunks(batches, table_name, columns, stats, fmt, compress):
+    sink = _ChunkSink()
+    schema = _arrow_schema(table_name, columns)
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(sink, schema, compression='gzip' if compress else 'snappy')
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    for rows in batches:
+        writer.write_table(_arrow_batch(rows, schema))
+        stats.rows += len(rows)
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+def _gzip_stream(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip başlığı
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_export(batches, table_name, columns, fmt='csv', compress=False, stats=None):
+    """
+    `table_name` tablosunun satır parçalarını (dict listeleri) seçilen biçimde bayt parçalarına
+    çevirir; parquet/arrow şeması tablonun schema.sql tiplerinden kurulur.
+    `stats` (ExportStats) verilirse satır sayısı ve süre orada tutulur.
+    Biçim hemen (ilk parçayı beklemeden) doğrulanır; geçersizse ValueError.
+    """
+    check_format(fmt)
+    return _export_chunks(batches, table_name, columns, fmt, compress, stats or ExportStats())
+
+
+def check_format(fmt):
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt} (expected one of {', '.join(FORMATS)})")
+    if fmt != 'csv' and pa is None:
+        raise ValueError(f"{fmt} export needs pyarrow")
+
+
+def _export_chunks(batches, table_name, columns, fmt, compress, stats):
+    if fmt == 'csv':
+        chunks = _csv_chunks(batches, columns, stats)
+    else:
+        chunks = _arrow_chunks(batches, table_name, columns, stats, fmt, compress)
+    if compress and fmt != 'parquet':
+        chunks = _gzip_stream(chunks)
+
+    for chunk in chunks:
+        if chunk:
+            yield chunk
+    stats.seconds = time.monotonic() - stats.started
+
+
+def export_to_file(batches, table_name, columns, path, fmt='csv', compress=False):
+    """Dışa aktarımı dosyaya yazar, ExportStats döndürür."""
+    stats = ExportStats()
+    chunks = iter_export(batches, table_name, columns, fmt, compress, stats)
+    with open(path, 'wb') as f:
+        for chunk in chunks:
+            f.write(chunk)
+    return stats
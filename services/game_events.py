@@ -1,31 +1,75 @@
+import uuid
+
 from Database import db
 from Models.GameEvents import GameEvents
+from services.bulk import insert_many
+from services.cache import count_cache, result_cache
+from services.pagination import fetch_keyset_page, keyset_columns, order_by_clause
+from services.query_utils import (
+    build_rows, cached_fetchall, cached_fetchone, fetch_count, keyset_with_total, page_with_total,
+    select_list, tuple_cursor,
+)
+from services.search import build_search, relevance_order
 
 # GameEvents Sınıfının tüm alanlarını listeleyelim
 EVENT_COLUMNS = [
-    'game_id', 'minute', 'type', 'club_id', 'player_id', 'description', 'player_in_id'
+    'game_event_id', 'game_id', 'minute', 'type', 'club_id', 'player_id', 'description', 'player_in_id'
 ]
 
 SELECT_FIELDS = ', '.join(EVENT_COLUMNS)
 PLACEHOLDERS = ', '.join(['%s'] * len(EVENT_COLUMNS))
 
+SEARCH_FIELDS = {
+    "table": "game_events",
+    "text": ["description"],
+    "prefix": ["type"],
+}
+PRIMARY_KEY = ('game_event_id',)
+# (game_id, minute, type) benzersiz değildir (aynı dakikada iki oyuncu değişikliği);
+# sayfalarda bu sıraya game_event_id eklenerek her satır tekil sıralanır
+SORT_KEY = ('game_id', 'minute', 'type', 'game_event_id')
+
+
+def new_event_id():
+    """game_event_id verilmemiş olaylar için dökümdekiyle aynı biçimde (32 hex) yeni id."""
+    return uuid.uuid4().hex
+
+
+def _with_event_id(event_data):
+    if not isinstance(event_data, dict) or event_data.get('game_event_id'):
+        return event_data
+    return dict(event_data, game_event_id=new_event_id())
+
 ## GameEvents Veritabanı İşlemleri
 # -----------------------------
 
 # --- (Read) ---
-def get_event(game_id, minute, event_type):
-    """Belirtilen oyun (game_id), dakika ve tür (type) ile eşleşen olayı getirir."""
+# game_event_id'den önce olaylar (game_id, minute, type) ile aranıyordu; bu çağrılar hâlâ
+# çalışır, fakat bu üçlü benzersiz değildir (aynı dakikada iki oyuncu değişikliği)
+def _event_condition(function_name, key):
+    if len(key) == 1:
+        return "game_event_id = %s", tuple(key)
+    if len(key) == 3:
+        return "game_id = %s AND minute = %s AND type = %s", tuple(key)
+    raise TypeError(f"{function_name}() takes game_event_id or (game_id, minute, event_type)")
+
+
+def get_event(*key):
+    """
+    get_event(game_event_id) olayı getirir. Eski get_event(game_id, minute, event_type)
+    biçimi de desteklenir; birden fazla olay eşleşirse game_event_id sırasında ilki döner.
+    """
+    condition, params = _event_condition("get_event", key)
     conn = db.get_connection()
     try:
-        cursor = conn.cursor()
-        query = f"SELECT {SELECT_FIELDS} FROM game_events WHERE game_id = %s AND minute = %s AND type = %s"
-        cursor.execute(query, (game_id, minute, event_type))
-        result = cursor.fetchone()
+        cursor = tuple_cursor(conn)
+        query = f"SELECT {SELECT_FIELDS} FROM game_events WHERE {condition} ORDER BY game_event_id LIMIT 1"
+        result = cached_fetchone(cursor, "game_events", query, params)
         cursor.close()
 
         if result:
             # DictCursor uyumu için **result kullanıldı
-            return GameEvents(**result)
+            return GameEvents.from_row(result)
         return None
 
     except Exception as e:
@@ -37,7 +81,8 @@ def get_event(game_id, minute, event_type):
 
 # --- (Insert) ---
 def insert_event(event_data: dict):
-    """Yeni bir oyun olayını veritabanına ekler."""
+    """Yeni bir oyun olayını veritabanına ekler; game_event_id yoksa üretilir. Olayın id'sini döndürür."""
+    event_data = _with_event_id(event_data)
     conn = db.get_connection()
     try:
         cursor = conn.cursor()
@@ -51,9 +96,10 @@ def insert_event(event_data: dict):
 
         cursor.execute(query, tuple(insert_values))
 
-        new_id = event_data.get('game_id', cursor.lastrowid) 
+        new_id = event_data['game_event_id']
 
         conn.commit()
+        result_cache.invalidate("game_events")
         cursor.close()
         return new_id
 
@@ -64,19 +110,33 @@ def insert_event(event_data: dict):
         if conn:
             conn.close()
 
+# --- (Bulk Insert) ---
+def insert_many_events(events_data: list, batch_size=1000):
+    """
+    Birden fazla maç olayını tek transaction içinde, çok satırlı INSERT'lerle ekler
+    (game_event_id'si olmayanlara yeni id verilir).
+    {'inserted': n, 'errors': [{'row': sıra, 'error': mesaj}]} döndürür (bkz. services/bulk.py).
+    """
+    return insert_many("game_events", EVENT_COLUMNS, [_with_event_id(row) for row in events_data], batch_size)
+
 # --- (Delete) ---
-def delete_event(game_id, minute, event_type):
-    """Belirtilen oyundaki (game_id, minute, type) olayı siler."""
+def delete_event(*key):
+    """
+    delete_event(game_event_id) tek olayı siler. Eski delete_event(game_id, minute, event_type)
+    biçimi eskisi gibi eşleşen tüm olayları siler; tek satır için game_event_id kullanılmalıdır.
+    """
+    condition, params = _event_condition("delete_event", key)
     conn = db.get_connection()
     try:
         cursor = conn.cursor()
 
-        query = "DELETE FROM game_events WHERE game_id = %s AND minute = %s AND type = %s"
-        cursor.execute(query, (game_id, minute, event_type))
+        query = f"DELETE FROM game_events WHERE {condition}"
+        cursor.execute(query, params)
 
         rows_affected = cursor.rowcount
 
         conn.commit()
+        result_cache.invalidate("game_events")
         cursor.close()
         return rows_affected > 0 
 
@@ -91,24 +151,18 @@ def delete_event(game_id, minute, event_type):
 def search_events_by_game(game_id):
     """Belirtilen oyuna ait tüm olayları (game_id) dakika sırasına göre getirir."""
     conn = db.get_connection()
-    results_list = []
     try:
-        cursor = conn.cursor()
+        cursor = tuple_cursor(conn)
 
         query = f"""
         SELECT {SELECT_FIELDS} FROM game_events 
         WHERE game_id = %s
-        ORDER BY minute ASC, type ASC
+        ORDER BY minute ASC, type ASC, game_event_id ASC
         """
-        cursor.execute(query, (game_id,))
-        results = cursor.fetchall()
+        results = cached_fetchall(cursor, "game_events", query, (game_id,))
         cursor.close()
 
-        for row in results:
-            # DictCursor uyumu için **row kullanıldı
-            results_list.append(GameEvents(**row))
-
-        return results_list
+        return GameEvents.from_rows(results)
 
     except Exception as e:
         print(f"Error (search_events_by_game): {e}")
@@ -118,28 +172,20 @@ def search_events_by_game(game_id):
             conn.close()
 
 # --- (List All with Pagination) ---
+def _count_events(cursor, search_term=""):
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+    return fetch_count(cursor, "game_events", where_clause, query_params)
+
+
 def get_total_event_count(search_term=""):
     """Filtrelenmiş veya tüm olayların toplam sayısını döndürür."""
     conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        
-        where_clause = ""
-        query_params = []
-        
-        if search_term:
-            search_like = f"%{search_term}%"
-            search_cols = ["type", "description"]
-            where_conditions = [f"{col} LIKE %s" for col in search_cols]
-            where_clause = " WHERE " + " OR ".join(where_conditions)
-            query_params = [search_like] * len(search_cols)
-
-        query = f"SELECT COUNT(*) FROM game_events {where_clause}"
-        cursor.execute(query, tuple(query_params))
-        result = cursor.fetchone()
-        
-        return result[0] if isinstance(result, tuple) else (result['COUNT(*)'] if result else 0)
-        
+        return count_cache.get_or_load(
+            "game_events", search_term, lambda: _count_events(cursor, search_term)
+        )
+
     except Exception as e:
         print(f"Error (get_total_event_count): {e}")
         return 0
@@ -147,56 +193,117 @@ def get_total_event_count(search_term=""):
         if conn: conn.close()
 
 
-def get_all_events(page=1, per_page=50, search_term="", sort_by="game_id", sort_order="ASC"): # <-- DEĞİŞTİ
-    """Oyun olaylarını sayfalama, arama ve sıralama terimlerine göre listeler."""
-    conn = db.get_connection()
-    results_list = []
-    
+def _fetch_events_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=None):
     offset = (page - 1) * per_page
-    
-    where_clause = ""
-    query_params = []
-    
-    if search_term:
-        search_like = f"%{search_term}%"
-        search_cols = ["type", "description"]
-        where_conditions = [f"{col} LIKE %s" for col in search_cols]
-        where_clause = " WHERE " + " OR ".join(where_conditions)
-        query_params = [search_like] * len(search_cols)
+
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
 
     # Sıralama parametrelerini güvenli hale getir
-    safe_sort_order = sort_order.upper() if sort_order.upper() in ["ASC", "DESC"] else "ASC" # <-- DEĞİŞTİ
+    safe_sort_order = sort_order.upper() if sort_order.upper() in ["ASC", "DESC"] else "ASC"
     if sort_by not in EVENT_COLUMNS:
-        sort_by = "game_id" # <-- DEĞİŞTİ
-    
+        sort_by = "game_id"
+
+    # Eşit değerlerde sıranın sabit kalması için birincil anahtar da sıralamaya eklenir
+    order_by = order_by_clause(keyset_columns(sort_by, SORT_KEY), safe_sort_order == "ASC")
+
+    # Arama varsa sonuçlar önce alaka düzeyine göre sıralanır
+    relevance, relevance_params = relevance_order(SEARCH_FIELDS, search_term)
+    if relevance:
+        order_by = f"{relevance}, {order_by}"
+        query_params.extend(relevance_params)
+
     # LIMIT ve OFFSET parametrelerini en sona ekle
     query_params.extend([per_page, offset])
 
+    query = f"""
+        SELECT {select_list(EVENT_COLUMNS, columns, keyset_columns(sort_by, SORT_KEY))} FROM game_events
+        {where_clause}
+        ORDER BY {order_by}
+        LIMIT %s OFFSET %s
+    """
+
+    results = cached_fetchall(cursor, "game_events", query, query_params)
+
+    return build_rows(results, GameEvents, columns)
+
+
+def get_all_events(page=1, per_page=50, search_term="", sort_by="game_id", sort_order="ASC", columns=None):
+    """Oyun olaylarını sayfalama, arama ve sıralama terimlerine göre listeler."""
+    conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        
-        query = f"""
-            SELECT {SELECT_FIELDS} FROM game_events
-            {where_clause}
-            ORDER BY {sort_by} {safe_sort_order}
-            LIMIT %s OFFSET %s
-        """
-        
-        cursor.execute(query, tuple(query_params))       
-        results = cursor.fetchall()
-        
-        for row in results:
-            try:
-                # DictCursor uyumu için **row kullanıldı
-                obj = GameEvents(**row) 
-                results_list.append(obj)
-            except TypeError as e:
-                print(f"Model conversion error (Row skipped): {e}") 
-
-        return results_list
+        return _fetch_events_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=columns)
 
     except Exception as e:
         print(f"Error (get_all_events): {e}")
         return []
     finally:
-        if conn: conn.close()
\ No newline at end of file
+        if conn: conn.close()
+
+
+def get_all_events_with_total(page=1, per_page=50, search_term="", sort_by="game_id", sort_order="ASC", columns=None):
+    """Returns (events, total_count) for one page using a single connection."""
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return page_with_total(
+            "game_events", page, per_page, search_term,
+            lambda: _fetch_events_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=columns),
+            lambda: _count_events(cursor, search_term),
+        )
+
+    except Exception as e:
+        print(f"Error (get_all_events_with_total): {e}")
+        return [], 0
+    finally:
+        if conn: conn.close()
+
+
+def _fetch_events_keyset(cursor, per_page, search_term, after, before, page, sort_by, sort_order, columns):
+    if sort_by not in EVENT_COLUMNS:
+        sort_by = "game_id"
+    safe_sort_order = sort_order.upper() if sort_order.upper() in ["ASC", "DESC"] else "ASC"
+
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+    return fetch_keyset_page(
+        cursor, f"SELECT {select_list(EVENT_COLUMNS, columns, keyset_columns(sort_by, SORT_KEY))} FROM game_events", where_clause, query_params,
+        sort_by, keyset_columns(sort_by, SORT_KEY), safe_sort_order == "ASC", per_page, after, before,
+        offset=(page - 1) * per_page, build=None if columns else lambda row: GameEvents(**row),
+        table_name="game_events",
+    )
+
+
+def get_all_events_keyset(per_page=50, search_term="", after=None, before=None, page=1, sort_by="game_id", sort_order="ASC", columns=None):
+    """
+    Cursor-based pagination ordered by sort_by plus SORT_KEY (game_id, minute, type, game_event_id).
+    Without a cursor, `page` jumps straight to that page via OFFSET.
+    Returns (events, next_cursor, prev_cursor); deep pages cost the same as the first one.
+    """
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return _fetch_events_keyset(cursor, per_page, search_term, after, before, page, sort_by, sort_order, columns)
+
+    except Exception as e:
+        print(f"Error (get_all_events_keyset): {e}")
+        return [], None, None
+    finally:
+        if conn: conn.close()
+
+
+def get_all_events_keyset_with_total(per_page=50, search_term="", after=None, before=None, page=1, sort_by="game_id", sort_order="ASC", columns=None):
+    """get_all_events_keyset + total count on the same connection: (events, next_cursor, prev_cursor, total_count)."""
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return keyset_with_total(
+            "game_events", search_term,
+            lambda: _fetch_events_keyset(cursor, per_page, search_term, after, before, page, sort_by, sort_order, columns),
+            lambda: _count_events(cursor, search_term),
+        )
+
+    except Exception as e:
+        print(f"Error (get_all_events_keyset_with_total): {e}")
+        return [], None, None, 0
+    finally:
+        if conn: conn.close()
@@ -1,5 +1,13 @@
 from Database import db
 from Models.Games import Games
+from services.bulk import insert_many
+from services.cache import count_cache, result_cache
+from services.pagination import fetch_keyset_page, keyset_columns, order_by_clause
+from services.query_utils import (
+    build_rows, cached_fetchall, cached_fetchone, fetch_count, keyset_with_total, page_with_total,
+    select_list, tuple_cursor,
+)
+from services.search import build_search, relevance_order
 
 # Games Sınıfının tüm alanlarını listeleyelim
 GAME_COLUMNS = [
@@ -13,6 +21,13 @@ GAME_COLUMNS = [
 SELECT_FIELDS = ', '.join(GAME_COLUMNS)
 PLACEHOLDERS = ', '.join(['%s'] * len(GAME_COLUMNS))
 
+SEARCH_FIELDS = {
+    "table": "games",
+    "text": ["home_club_name", "away_club_name", "stadium"],
+    "prefix": ["competition_id"],
+}
+PRIMARY_KEY = ('game_id',)
+
 ## Games Veritabanı İşlemleri
 # -----------------------------
 
@@ -21,14 +36,13 @@ def get_game(game_id):
     """Belirtilen game_id'ye sahip oyunu veritabanından getirir."""
     conn = db.get_connection()
     try:
-        cursor = conn.cursor()
+        cursor = tuple_cursor(conn)
         query = f"SELECT {SELECT_FIELDS} FROM games WHERE game_id = %s"
-        cursor.execute(query, (game_id,))
-        result = cursor.fetchone()
+        result = cached_fetchone(cursor, "games", query, (game_id,))
         cursor.close()
 
         if result:
-            return Games(**result)
+            return Games.from_row(result)
         return None
 
     except Exception as e:
@@ -57,6 +71,7 @@ def insert_game(game_data: dict):
         new_id = game_data.get('game_id', cursor.lastrowid)
 
         conn.commit()
+        result_cache.invalidate("games")
         cursor.close()
         return new_id
 
@@ -67,6 +82,14 @@ def insert_game(game_data: dict):
         if conn:
             conn.close()
 
+# --- (Bulk Insert) ---
+def insert_many_games(games_data: list, batch_size=1000):
+    """
+    Birden fazla maçı tek transaction içinde, çok satırlı INSERT'lerle ekler.
+    {'inserted': n, 'errors': [{'row': sıra, 'error': mesaj}]} döndürür (bkz. services/bulk.py).
+    """
+    return insert_many("games", GAME_COLUMNS, games_data, batch_size)
+
 # --- (Delete) ---
 def delete_game(game_id):
     """Belirtilen game_id'ye sahip oyunu veritabanından siler."""
@@ -80,6 +103,7 @@ def delete_game(game_id):
         rows_affected = cursor.rowcount
 
         conn.commit()
+        result_cache.invalidate("games")
         cursor.close()
         return rows_affected > 0
 
@@ -119,6 +143,7 @@ def update_game(game_id, update_data: dict):
         rows_affected = cursor.rowcount
 
         conn.commit()
+        result_cache.invalidate("games")
         cursor.close()
         return rows_affected
 
@@ -134,23 +159,18 @@ def update_game(game_id, update_data: dict):
 def search_games_by_club(club_id):
     """Belirtilen kulübün (ev sahibi veya deplasman) oynadığı tüm maçları getirir."""
     conn = db.get_connection()
-    results_list = []
     try:
-        cursor = conn.cursor()
+        cursor = tuple_cursor(conn)
 
         query = f"""
         SELECT {SELECT_FIELDS} FROM games 
         WHERE home_club_id = %s OR away_club_id = %s
         ORDER BY date DESC
         """
-        cursor.execute(query, (club_id, club_id))
-        results = cursor.fetchall()
+        results = cached_fetchall(cursor, "games", query, (club_id, club_id))
         cursor.close()
 
-        for row in results:
-            results_list.append(Games(**row))
-
-        return results_list
+        return Games.from_rows(results)
 
     except Exception as e:
         print(f"Error (search_games_by_club): {e}")
@@ -160,28 +180,20 @@ def search_games_by_club(club_id):
             conn.close()
 
 # --- (List All with Pagination) ---
+def _count_games(cursor, search_term=""):
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+    return fetch_count(cursor, "games", where_clause, query_params)
+
+
 def get_total_game_count(search_term=""):
     """Filtrelenmiş veya tüm oyunların toplam sayısını döndürür."""
     conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        
-        where_clause = ""
-        query_params = []
-        
-        if search_term:
-            search_like = f"%{search_term}%"
-            search_cols = ["home_club_name", "away_club_name", "competition_id", "stadium"]
-            where_conditions = [f"{col} LIKE %s" for col in search_cols]
-            where_clause = " WHERE " + " OR ".join(where_conditions)
-            query_params = [search_like] * len(search_cols)
-
-        query = f"SELECT COUNT(*) FROM games {where_clause}"
-        cursor.execute(query, tuple(query_params))
-        result = cursor.fetchone()
-        
-        return result[0] if isinstance(result, tuple) else (result['COUNT(*)'] if result else 0)
-        
+        return count_cache.get_or_load(
+            "games", search_term, lambda: _count_games(cursor, search_term)
+        )
+
     except Exception as e:
         print(f"Error (get_total_game_count): {e}")
         return 0
@@ -189,55 +201,117 @@ def get_total_game_count(search_term=""):
         if conn: conn.close()
 
 
-def get_all_games(page=1, per_page=50, search_term="", sort_by="game_id", sort_order="ASC"): # <-- DEĞİŞTİ
-    """Oyunları sayfalama, arama ve sıralama terimlerine göre listeler."""
-    conn = db.get_connection()
-    results_list = []
-    
+def _fetch_games_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=None):
     offset = (page - 1) * per_page
-    
-    where_clause = ""
-    query_params = []
-    
-    if search_term:
-        search_like = f"%{search_term}%"
-        search_cols = ["home_club_name", "away_club_name", "competition_id", "stadium"]
-        where_conditions = [f"{col} LIKE %s" for col in search_cols]
-        where_clause = " WHERE " + " OR ".join(where_conditions)
-        query_params = [search_like] * len(search_cols)
-        
+
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+
     # Sıralama parametrelerini güvenli hale getir
-    safe_sort_order = sort_order.upper() if sort_order.upper() in ["ASC", "DESC"] else "ASC" # <-- DEĞİŞTİ
+    safe_sort_order = sort_order.upper() if sort_order.upper() in ["ASC", "DESC"] else "ASC"
     if sort_by not in GAME_COLUMNS:
-        sort_by = "game_id" # <-- DEĞİŞTİ
+        sort_by = "game_id"
+
+    # Eşit değerlerde sıranın sabit kalması için birincil anahtar da sıralamaya eklenir
+    order_by = order_by_clause(keyset_columns(sort_by, PRIMARY_KEY), safe_sort_order == "ASC")
+
+    # Arama varsa sonuçlar önce alaka düzeyine göre sıralanır
+    relevance, relevance_params = relevance_order(SEARCH_FIELDS, search_term)
+    if relevance:
+        order_by = f"{relevance}, {order_by}"
+        query_params.extend(relevance_params)
 
     # LIMIT ve OFFSET parametrelerini en sona ekle
     query_params.extend([per_page, offset])
 
+    query = f"""
+        SELECT {select_list(GAME_COLUMNS, columns, keyset_columns(sort_by, PRIMARY_KEY))} FROM games
+        {where_clause}
+        ORDER BY {order_by}
+        LIMIT %s OFFSET %s
+    """
+
+    results = cached_fetchall(cursor, "games", query, query_params)
+
+    return build_rows(results, Games, columns)
+
+
+def get_all_games(page=1, per_page=50, search_term="", sort_by="game_id", sort_order="ASC", columns=None):
+    """Oyunları sayfalama, arama ve sıralama terimlerine göre listeler."""
+    conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        
-        query = f"""
-            SELECT {SELECT_FIELDS} FROM games
-            {where_clause}
-            ORDER BY {sort_by} {safe_sort_order}
-            LIMIT %s OFFSET %s
-        """
-        
-        cursor.execute(query, tuple(query_params))       
-        results = cursor.fetchall()
-        
-        for row in results:
-            try:
-                obj = Games(**row) 
-                results_list.append(obj)
-            except TypeError as e:
-                print(f"Model conversion error (Row skipped): {e}") 
-
-        return results_list
+        return _fetch_games_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=columns)
 
     except Exception as e:
         print(f"Error (get_all_games): {e}")
         return []
     finally:
-        if conn: conn.close()
\ No newline at end of file
+        if conn: conn.close()
+
+
+def get_all_games_with_total(page=1, per_page=50, search_term="", sort_by="game_id", sort_order="ASC", columns=None):
+    """Returns (games, total_count) for one page using a single connection."""
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return page_with_total(
+            "games", page, per_page, search_term,
+            lambda: _fetch_games_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=columns),
+            lambda: _count_games(cursor, search_term),
+        )
+
+    except Exception as e:
+        print(f"Error (get_all_games_with_total): {e}")
+        return [], 0
+    finally:
+        if conn: conn.close()
+
+
+def _fetch_games_keyset(cursor, per_page, search_term, after, before, page, sort_by, sort_order, columns):
+    if sort_by not in GAME_COLUMNS:
+        sort_by = "game_id"
+    safe_sort_order = sort_order.upper() if sort_order.upper() in ["ASC", "DESC"] else "ASC"
+
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+    return fetch_keyset_page(
+        cursor, f"SELECT {select_list(GAME_COLUMNS, columns, keyset_columns(sort_by, PRIMARY_KEY))} FROM games", where_clause, query_params,
+        sort_by, keyset_columns(sort_by, PRIMARY_KEY), safe_sort_order == "ASC", per_page, after, before,
+        offset=(page - 1) * per_page, build=None if columns else lambda row: Games(**row),
+        table_name="games",
+    )
+
+
+def get_all_games_keyset(per_page=50, search_term="", after=None, before=None, page=1, sort_by="game_id", sort_order="ASC", columns=None):
+    """
+    Cursor-based pagination ordered by sort_by plus the primary key (game_id).
+    Without a cursor, `page` jumps straight to that page via OFFSET.
+    Returns (games, next_cursor, prev_cursor); deep pages cost the same as the first one.
+    """
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return _fetch_games_keyset(cursor, per_page, search_term, after, before, page, sort_by, sort_order, columns)
+
+    except Exception as e:
+        print(f"Error (get_all_games_keyset): {e}")
+        return [], None, None
+    finally:
+        if conn: conn.close()
+
+
+def get_all_games_keyset_with_total(per_page=50, search_term="", after=None, before=None, page=1, sort_by="game_id", sort_order="ASC", columns=None):
+    """get_all_games_keyset + total count on the same connection: (games, next_cursor, prev_cursor, total_count)."""
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return keyset_with_total(
+            "games", search_term,
+            lambda: _fetch_games_keyset(cursor, per_page, search_term, after, before, page, sort_by, sort_order, columns),
+            lambda: _count_games(cursor, search_term),
+        )
+
+    except Exception as e:
+        print(f"Error (get_all_games_keyset_with_total): {e}")
+        return [], None, None, 0
+    finally:
+        if conn: conn.close()
@@ -0,0 +1,377 @@
+# SQL zamanlama ve profil ölçümleri. MONEYBALL_INSTRUMENT=1 ile açılır (bkz. main.py).
+# Açıkken db.get_connection() ve db.connect(record=True) bağlantıyı sarar; cursor'ların her
+# execute'u için süre, dönen satır sayısı ve sorguyu çalıştıran servis fonksiyonu kaydedilir.
+# Sunucu tarafı (SS) cursor'larda süreye fetch'ler de eklenir ve sorgu cursor ya da bağlantı
+# kapanınca okunan satır sayısıyla kaydedilir (dışa aktarım, NDJSON akışı). Kayıtlar:
+#   - sorgu şablonu başına (parametreler %s, IN/VALUES listeleri tek öğeye indirgenir)
+#   - Flask isteği başına (sorgu sayısı, SQL süresi, havuzdan bağlantı alma süresi)
+#   - registry hook'u ile servis çağrısı başına (tablo.işlem)
+# Eşikten yavaş sorgular yazdırılır ve son 100 tanesi saklanır; /_debug/stats hepsini
+# yüzdelikleriyle gösterir. MONEYBALL_PROFILE_SAMPLE > 0 ise isteklerin o oranı
+# cProfile ile ölçülüp MONEYBALL_PROFILE_DIR altına .prof dosyası olarak yazılır.
+#
+# Ortam değişkenleri:
+#   MONEYBALL_INSTRUMENT      1 ise açık (varsayılan: kapalı)
+#   MONEYBALL_SLOW_QUERY_MS   yavaş sorgu eşiği, ms (varsayılan: 200)
+#   MONEYBALL_PROFILE_SAMPLE  profillenecek istek oranı, 0-1 (varsayılan: 0)
+#   MONEYBALL_PROFILE_DIR     .prof dosyaları (varsayılan: <tmp>/moneyball_profiles)
+
+import cProfile
+import functools
+import itertools
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+
+import pymysql
+
+MAX_SAMPLES = 1000
+PERCENTILES = (50, 95, 99)
+
+# Sorguyu çağıran servisi ararken atlanan ortak yardımcılar
+_HELPER_MODULES = {'instrumentation', 'query_utils', 'pagination', 'cache', 'bulk'}
+_SERVICES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@functools.lru_cache(maxsize=4096)
+def query_template(query):
+    """Sorguyu gruplanabilir şablona indirger: boşluklar tekleşir, %s listeleri kısalır."""
+    template = ' '.join(query.split())
+    template = re.sub(r'%s(?:\s*,\s*%s)+', '%s, ...', template)
+    template = re.sub(r'\((%s(?:, \.\.\.)?)\)(?:\s*,\s*\(\1\))+', r'(\1), ...', template)
+    return template
+
+
+def percentiles(samples):
+    """En yakın sıra yöntemiyle p50/p95/p99 (ms)."""
+    if not samples:
+        return {f"p{p}": None for p in PERCENTILES}
+    ordered = sorted(samples)
+    return {
+        f"p{p}": round(ordered[min(len(ordered) - 1, max(0, -(-p * len(ordered) // 100) - 1))] * 1000, 3)
+        for p in PERCENTILES
+    }
+
+
+def _caller():
+    """Sorguyu çalıştıran services/ fonksiyonu ('games.get_all_games_keyset' gibi)."""
+    frame = sys._getframe(3)
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if os.path.dirname(os.path.abspath(path)) == _SERVICES_DIR:
+            module = os.path.splitext(os.path.basename(path))[0]
+            if module not in _HELPER_MODULES:
+                return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+class Timings:
+    """İsim başına sayaç, toplam/en uzun süre, satır sayısı ve son MAX_SAMPLES süre."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def add(self, name, seconds, rows=None, caller=None):
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                entry = self._entries[name] = {
+                    'count': 0, 'total': 0.0, 'max': 0.0, 'rows': 0,
+                    'samples': deque(maxlen=MAX_SAMPLES), 'callers': set(),
+                }
+            entry['count'] += 1
+            entry['total'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+            entry['samples'].append(seconds)
+            if rows is not None and rows > 0:
+                entry['rows'] += rows
+            if caller:
+                entry['callers'].add(caller)
+
+    def summary(self):
+        with self._lock:
+            entries = {name: dict(entry, samples=list(entry['samples']), callers=sorted(entry['callers']))
+                       for name, entry in self._entries.items()}
+        result = {}
+        for name, entry in sorted(entries.items(), key=lambda item: -item[1]['total']):
+            result[name] = {
+                'count': entry['count'],
+                'total_ms': round(entry['total'] * 1000, 3),
+                'mean_ms': round(entry['total'] / entry['count'] * 1000, 3),
+                'max_ms': round(entry['max'] * 1000, 3),
+                **percentiles(entry['samples']),
+                'rows': entry['rows'],
+            }
+            if entry['callers']:
+                result[name]['callers'] = entry['callers']
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class InstrumentedCursor:
+    """
+    Cursor sarmalayıcı; execute/executemany süresini Recorder'a bildirir. streaming=True
+    (SS cursor) ise rowcount bilinmez ve satırlar fetch ile gelir: sorgu, fetch süreleri ve
+    okunan satırlarla birlikte flush()'ta (close, sonraki execute ya da bağlantı kapanışı) yazılır.
+    """
+
+    def __init__(self, cursor, recorder, streaming=False):
+        self._cursor = cursor
+        self._recorder = recorder
+        self._streaming = streaming
+        self._pending = None  # [sorgu, saniye, satır]
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def execute(self, query, args=None):
+        self.flush()
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(query) if args is None else self._cursor.execute(query, args)
+        finally:
+            seconds = time.perf_counter() - started
+            if self._streaming:
+                self._pending = [query, seconds, 0]
+            else:
+                self._recorder.record_query(query, seconds, self._cursor.rowcount)
+
+    def _fetch(self, method, *args):
+        started = time.perf_counter()
+        result = method(*args)
+        if self._pending is not None:
+            self._pending[1] += time.perf_counter() - started
+            self._pending[2] += (result is not None) if method == self._cursor.fetchone else len(result)
+        return result
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone)
+
+    def fetchmany(self, size=None):
+        return self._fetch(self._cursor.fetchmany, size)
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+    def flush(self):
+        """Akış cursor'ının bekleyen sorgusunu kaydeder."""
+        if self._pending is not None:
+            query, seconds, rows = self._pending
+            self._pending = None
+            self._recorder.record_query(query, seconds, rows)
+
+    def close(self):
+        try:
+            return self._cursor.close()
+        finally:
+            self.flush()
+
+    def executemany(self, query, args):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, args)
+        finally:
+            self._recorder.record_query(query, time.perf_counter() - started, self._cursor.rowcount)
+
+
+class InstrumentedConnection:
+    """Bağlantı sarmalayıcı; cursor() ölçülen cursor döndürür, gerisi aynen iletilir."""
+
+    def __init__(self, conn, recorder):
+        self._conn = conn
+        self._recorder = recorder
+        self._streams = []
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        cursorclass = args[0] if args else kwargs.get('cursor')
+        streaming = cursorclass is not None and issubclass(cursorclass, pymysql.cursors.SSCursor)
+        cursor = InstrumentedCursor(self._conn.cursor(*args, **kwargs), self._recorder, streaming)
+        if streaming:
+            self._streams.append(cursor)
+        return cursor
+
+    def close(self):
+        # Akış okuyucuları cursor'ı kapatmadan bağlantıyı kapatabilir (bkz. table_query.stream_batches)
+        for cursor in self._streams:
+            cursor.flush()
+        self._streams = []
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class Recorder:
+    def __init__(self, slow_query_ms=200.0, profile_sample=0.0, profile_dir=None):
+        self.slow_query_ms = slow_query_ms
+        self.profile_sample = profile_sample
+        self.profile_dir = profile_dir or os.path.join(tempfile.gettempdir(), 'moneyball_profiles')
+        self.queries = Timings()
+        self.requests = Timings()
+        self.services = Timings()
+        self.acquire = Timings()
+        self.slow_queries = deque(maxlen=100)
+        self.profiles = deque(maxlen=100)
+        self._local = threading.local()
+        # cProfile aynı anda tek bir profilleyiciye izin verir
+        self._profile_lock = threading.Lock()
+        # Aynı saniyede aynı endpoint'in profilleri çakışmasın diye dosya adına eklenir
+        self._profile_ids = itertools.count(1)
+
+    # --- Bağlantı / sorgu ---
+    def wrap_connection(self, conn, acquire_seconds=None):
+        """acquire_seconds: havuzdan alma süresi; havuzsuz bağlantılarda (db.connect) None."""
+        if acquire_seconds is not None:
+            self.acquire.add('get_connection', acquire_seconds)
+            request = self.current_request()
+            if request is not None:
+                request['acquire_seconds'] += acquire_seconds
+        return InstrumentedConnection(conn, self)
+
+    def record_query(self, query, seconds, rows):
+        template = query_template(query)
+        caller = _caller()
+        self.queries.add(template, seconds, rows, caller)
+
+        request = self.current_request()
+        if request is not None:
+            request['queries'] += 1
+            request['sql_seconds'] += seconds
+            if rows is not None and rows > 0:
+                request['rows'] += rows
+
+        elapsed_ms = seconds * 1000
+        if elapsed_ms >= self.slow_query_ms:
+            entry = {
+                'ms': round(elapsed_ms, 3),
+                'query': template,
+                'caller': caller,
+                'request': request['name'] if request is not None else None,
+                'at': time.time(),
+            }
+            self.slow_queries.append(entry)
+            print(f"Slow query ({elapsed_ms:.1f} ms, {caller or '?'}): {template}")
+
+    def table_hook(self, table_name, operation, func):
+        """main.add_table_hook için: her registry çağrısını 'tablo.işlem' adıyla ölçer."""
+        name = f"{table_name}.{operation}"
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.services.add(name, time.perf_counter() - started)
+        return timed
+
+    # --- İstek ---
+    def current_request(self):
+        return getattr(self._local, 'request', None)
+
+    def start_request(self, name):
+        request = {
+            'name': name, 'started': time.perf_counter(), 'queries': 0, 'rows': 0,
+            'sql_seconds': 0.0, 'acquire_seconds': 0.0, 'profiler': None,
+        }
+        if self.profile_sample > 0 and random.random() < self.profile_sample \
+                and self._profile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                request['profiler'] = profiler
+            except ValueError:
+                # Başka bir profilleyici (ör. debugger) zaten açık
+                self._profile_lock.release()
+        self._local.request = request
+        return request
+
+    def finish_request(self, request=None):
+        """
+        İsteği (verilmezse bu thread'in isteğini) kapatır; {'queries', 'rows', 'sql_ms',
+        'acquire_ms', 'total_ms'} döndürür. Kapanmış bir istek için None.
+        """
+        if request is None:
+            request = self.current_request()
+        if request is None or request.get('finished'):
+            return None
+        request['finished'] = True
+        if self.current_request() is request:
+            self._local.request = None
+        seconds = time.perf_counter() - request['started']
+        self.requests.add(request['name'], seconds, request['rows'])
+
+        profiler = request['profiler']
+        if profiler is not None:
+            try:
+                profiler.disable()
+                self._dump_profile(profiler, request['name'])
+            finally:
+                self._profile_lock.release()
+
+        return {
+            'queries': request['queries'],
+            'rows': request['rows'],
+            'sql_ms': round(request['sql_seconds'] * 1000, 3),
+            'acquire_ms': round(request['acquire_seconds'] * 1000, 3),
+            'total_ms': round(seconds * 1000, 3),
+        }
+
+    def _dump_profile(self, profiler, name):
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_') or 'request'
+            path = os.path.join(self.profile_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{safe_name}-{os.getpid()}"
+                                                  f"-{next(self._profile_ids)}.prof")
+            profiler.dump_stats(path)
+            self.profiles.append(path)
+        except OSError as e:
+            print(f"Error (profile dump): {e}")
+
+    # --- Rapor ---
+    def stats(self):
+        return {
+            'slow_query_ms': self.slow_query_ms,
+            'queries': self.queries.summary(),
+            'requests': self.requests.summary(),
+            'services': self.services.summary(),
+            'get_connection': self.acquire.summary().get('get_connection'),
+            'slow_queries': list(self.slow_queries),
+            'profiles': list(self.profiles),
+        }
+
+    def reset(self):
+        for timings in (self.queries, self.requests, self.services, self.acquire):
+            timings.reset()
+        self.slow_queries.clear()
+        self.profiles.clear()
+
+
+def recorder_from_env():
+    """MONEYBALL_INSTRUMENT=1 ise ortam değişkenlerine göre bir Recorder, değilse None."""
+    if os.environ.get('MONEYBALL_INSTRUMENT', '0').lower() not in ('1', 'true', 'yes'):
+        return None
+    return Recorder(
+        slow_query_ms=float(os.environ.get('MONEYBALL_SLOW_QUERY_MS', 200)),
+        profile_sample=float(os.environ.get('MONEYBALL_PROFILE_SAMPLE', 0)),
+        profile_dir=os.environ.get('MONEYBALL_PROFILE_DIR'),
+    )
@@ -0,0 +1,167 @@
+# Keyset (seek) sayfalama yardımcıları.
+# OFFSET ile derin sayfalarda MySQL atlanan tüm satırları okuyup atmak zorunda;
+# burada son görülen satırın sıralama anahtarından devam ediyoruz:
+#   WHERE (sort_col, pk) > (son_değerler) ORDER BY sort_col, pk LIMIT n
+# Cursor token'ı, o satırın anahtar değerlerini taşıyan base64 bir JSON'dur.
+
+import base64
+import json
+
+from services.query_utils import cached_fetchall
+
+
+def keyset_columns(sort_by, primary_key):
+    """Sıralama sütunu + (tekrarlanmayan) birincil anahtar sütunları; satırları tekil sıralar."""
+    return [sort_by] + [col for col in primary_key if col != sort_by]
+
+
+def encode_cursor(sort_by, values):
+    payload = json.dumps({"s": sort_by, "v": list(values)}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token, sort_by, key_count):
+    """Token'ı çözer; bozuksa ya da başka bir sıralamaya aitse None döner."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("s") != sort_by:
+        return None
+    values = payload.get("v")
+    if not isinstance(values, list) or len(values) != key_count:
+        return None
+    return values
+
+
+def row_key(row, columns):
+    if isinstance(row, dict):
+        return [row.get(col) for col in columns]
+    return [getattr(row, col, None) for col in columns]
+
+
+def _greater(col, value, ascending):
+    # MySQL'de NULL en küçük değer gibi sıralanır (ASC'de başta, DESC'de sonda).
+    if ascending:
+        if value is None:
+            return f"{col} IS NOT NULL", []
+        return f"{col} > %s", [value]
+    if value is None:
+        return "1 = 0", []
+    return f"({col} < %s OR {col} IS NULL)", [value]
+
+
+def _equal(col, value):
+    if value is None:
+        return f"{col} IS NULL", []
+    return f"{col} = %s", [value]
+
+
+def keyset_condition(columns, values, ascending):
+    """
+    Sıralamada (columns, values) satırından SONRA gelen satırlar için koşul:
+    c1 > v1 OR (c1 = v1 AND c2 > v2) OR ...
+    Satır-değer karşılaştırması yerine açık hali kullanılıyor; indeks kullanımı daha öngörülebilir.
+    """
+    disjuncts = []
+    params = []
+    for i, col in enumerate(columns):
+        parts = []
+        for prev_col, prev_value in zip(columns[:i], values[:i]):
+            clause, clause_params = _equal(prev_col, prev_value)
+            parts.append(clause)
+            params.extend(clause_params)
+        clause, clause_params = _greater(col, values[i], ascending)
+        parts.append(clause)
+        params.extend(clause_params)
+        disjuncts.append("(" + " AND ".join(parts) + ")")
+    return "(" + " OR ".join(disjuncts) + ")", params
+
+
+def order_by_clause(columns, ascending):
+    direction = "ASC" if ascending else "DESC"
+    return ", ".join(f"{col} {direction}" for col in columns)
+
+
+def add_condition(where_clause, query_params, condition, condition_params):
+    """Mevcut WHERE'e AND ile koşul ekler (where_clause boş olabilir)."""
+    if where_clause:
+        where_clause = f"{where_clause} AND {condition}"
+    else:
+        where_clause = f" WHERE {condition}"
+    return where_clause, list(query_params) + list(condition_params)
+
+
+def fetch_keyset_page(cursor, select_sql, where_clause, query_params, sort_by, columns,
+                      ascending, per_page, after=None, before=None, offset=0, build=None,
+                      table_name=None):
+    """
+    Tek bir keyset sayfası çeker.
+    `select_sql` "SELECT ... FROM tablo" kısmıdır; `build` her satırı modele çevirir.
+    Cursor verilmemişse `offset` ile belirli bir sayfaya atlanabilir (eski OFFSET yolu),
+    dönen cursor'larla oradan itibaren keyset ile devam edilir.
+    `table_name` verilirse sayfa result_cache üzerinden okunur.
+    (results_list, next_cursor, prev_cursor) döndürür.
+    """
+    after_values = decode_cursor(after, sort_by, len(columns))
+    before_values = None if after_values else decode_cursor(before, sort_by, len(columns))
+
+    # Geriye giderken sıralamayı ters çevirip sonra sonucu düzeltiyoruz
+    backward = before_values is not None
+    scan_ascending = ascending != backward
+    if after_values is not None:
+        condition, condition_params = keyset_condition(columns, after_values, scan_ascending)
+        where_clause, query_params = add_condition(where_clause, query_params, condition, condition_params)
+    elif backward:
+        condition, condition_params = keyset_condition(columns, before_values, scan_ascending)
+        where_clause, query_params = add_condition(where_clause, query_params, condition, condition_params)
+
+    limit_clause = "LIMIT %s"
+    limit_params = (per_page + 1,)
+    if after_values is None and not backward and offset > 0:
+        limit_clause = "LIMIT %s OFFSET %s"
+        limit_params = (per_page + 1, offset)
+    else:
+        offset = 0
+
+    query = f"""
+        {select_sql}
+        {where_clause}
+        ORDER BY {order_by_clause(columns, scan_ascending)}
+        {limit_clause}
+    """
+    if table_name:
+        rows = cached_fetchall(cursor, table_name, query, tuple(query_params) + limit_params)
+    else:
+        cursor.execute(query, tuple(query_params) + limit_params)
+        rows = list(cursor.fetchall())
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backward:
+        rows.reverse()
+
+    results_list = []
+    for row in rows:
+        if build is None:
+            results_list.append(row)
+            continue
+        try:
+            results_list.append(build(row))
+        except TypeError as e:
+            print(f"Model conversion error (Row skipped): {e}")
+
+    next_cursor = prev_cursor = None
+    if results_list:
+        first = encode_cursor(sort_by, row_key(results_list[0], columns))
+        last = encode_cursor(sort_by, row_key(results_list[-1], columns))
+        if backward:
+            next_cursor = last
+            prev_cursor = first if has_more else None
+        else:
+            next_cursor = last if has_more else None
+            prev_cursor = first if after_values is not None or offset > 0 else None
+    return results_list, next_cursor, prev_cursor
@@ -0,0 +1,385 @@
+# File: services/player_store.py
+# Description: In-memory, column-oriented copy of the "players" table.
+#              players tablosu bir kez okunur ve NumPy/pandas sütunlarında tutulur;
+#              oyuncu filtreleri satır satır Python döngüsü yerine vektörel maskelerle çalışır.
+#              db.players üzerinden erişilir (bkz. Database.py).
+
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from Models.Players import Players
+from services.cache import result_cache
+from services.query_utils import tuple_cursor
+
+# Düşük kardinaliteli metin sütunları pandas Categorical olarak tutulur
+CATEGORICAL_COLUMNS = [
+    'position', 'sub_position', 'foot', 'country_of_citizenship',
+    'country_of_birth', 'current_club_domestic_competition_id',
+]
+# Bu sütunlar için her değere ait bir bitmap tutulur (bkz. BitmapIndex)
+BITMAP_COLUMNS = [
+    'position', 'sub_position', 'foot', 'country_of_citizenship',
+    'current_club_domestic_competition_id',
+]
+DATE_COLUMNS = ['date_of_birth', 'contract_expiration_date']
+VALUE_COLUMNS = ['market_value_in_eur', 'highest_market_value_in_eur']
+ID_COLUMNS = ['player_id', 'current_club_id']
+# Diğer süreçlerin yazmalarını görmek için tablo nesli en fazla bu sıklıkla (saniye) kontrol edilir.
+# Bu süreçteki yazmalar bu aralığı beklemez: servisler commit'ten sonra invalidate() çağırır.
+GENERATION_CHECK_INTERVAL = 1.0
+# Başarısız bir yüklemeden sonra bu kadar saniye yeniden denenmez; yoksa her erişim
+# (top_n/screen tek istekte birkaç kez erişir) tabloyu baştan okumaya çalışırdı
+LOAD_RETRY_INTERVAL = 5.0
+
+
+class BitmapIndex:
+    """
+    Kategorik bir sütun için değer başına sıkıştırılmış bitmap (np.packbits, satır başına 1 bit).
+    Çok kriterli sorgular bitmap'ler üzerinde bitwise AND/OR ile, satırlara hiç
+    dokunmadan çözülür.
+    """
+
+    def __init__(self, categorical):
+        codes = categorical.codes
+        self.size = len(codes)
+        self._bitmaps = {}
+        self._by_lower = {}
+        for code, value in enumerate(categorical.categories):
+            self._bitmaps[value] = np.packbits(codes == code)
+            self._by_lower.setdefault(str(value).lower(), []).append(value)
+        self._empty = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def bitmap(self, value, case_sensitive=False):
+        """value ile eşleşen satırların bitmap'i (eşleşme yoksa boş bitmap)."""
+        if case_sensitive:
+            return self._bitmaps.get(value, self._empty)
+        result = self._empty
+        for original in self._by_lower.get(str(value).lower(), []):
+            result = result | self._bitmaps[original]
+        return result
+
+    def any_of(self, values, case_sensitive=False):
+        result = self._empty
+        for value in values:
+            result = result | self.bitmap(value, case_sensitive)
+        return result
+
+    def to_mask(self, bitmap):
+        return np.unpackbits(bitmap, count=self.size).astype(bool)
+
+
+class PlayerStore:
+    """
+    players tablosunun sütunlu kopyası.
+    - ids / current_club_id: int64 (eksik kulüp -1)
+    - tarihler: datetime64[ns] (geçersiz/eksik -> NaT)
+    - piyasa değerleri: int64 (eksik -> 0)
+    - kategorik sütunlar: pandas.Categorical
+    Veri ilk erişimde yüklenir; refresh() ile yeniden okunur, invalidate() ile
+    bir sonraki erişimde yeniden okunmak üzere işaretlenir. players'a yazan servisler
+    invalidate() çağırır, böylece yazma aynı süreçte önbellek arka ucundan bağımsız olarak
+    hemen görülür. Diğer süreçlerin yazmaları result_cache'teki tablo neslinden izlenir
+    (en geç GENERATION_CHECK_INTERVAL saniyede; MONEYBALL_CACHE_BACKEND=none ile izlenemez).
+    """
+
+    def __init__(self, database):
+        self._db = database
+        self._lock = threading.RLock()
+        self._loaded = False
+        self.loaded_at = None
+        self._records = []
+        self._objects = []
+        self._positions = {}
+        self.columns = {}
+        self.bitmaps = {}
+        self._age_order = np.array([], dtype='int64')
+        self._sorted_birth_days = np.array([], dtype='int32')
+        self._id_order = np.array([], dtype='int64')
+        self._valuations = None
+        self._generation = None
+        self._valuations_generation = None
+        self._checked_at = 0.0
+        self._retry_at = 0.0
+        self._valuations_retry_at = 0.0
+
+    # --- Yükleme ---
+    def refresh(self):
+        """players tablosunu veritabanından yeniden okur; okunamazsa False döner."""
+        from services.players import PLAYERS_COLUMNS, SELECT_FIELDS
+
+        generation = result_cache.generation('players')
+        conn = None
+        loaded = True
+        try:
+            conn = self._db.get_connection()
+            cursor = tuple_cursor(conn)
+            cursor.execute(f"SELECT {SELECT_FIELDS} FROM players ORDER BY player_id")
+            records = list(cursor.fetchall())
+            cursor.close()
+        except Exception as e:
+            print(f"Error (PlayerStore.refresh): {e}")
+            if self._loaded:
+                return False  # Eski veriyle devam et
+            records, loaded = [], False
+        finally:
+            if conn:
+                conn.close()
+
+        frame = pd.DataFrame.from_records(records, columns=PLAYERS_COLUMNS)
+        columns = {}
+        for col in ID_COLUMNS:
+            columns[col] = pd.to_numeric(frame[col], errors='coerce').fillna(-1).astype('int64').to_numpy()
+        for col in VALUE_COLUMNS:
+            columns[col] = pd.to_numeric(frame[col], errors='coerce').fillna(0).astype('int64').to_numpy()
+        for col in DATE_COLUMNS:
+            columns[col] = pd.to_datetime(frame[col], errors='coerce', format='ISO8601').to_numpy(dtype='datetime64[ns]')
+        for col in CATEGORICAL_COLUMNS:
+            columns[col] = pd.Categorical(frame[col])
+
+        # Yaş indeksi: doğum tarihi 1970'ten beri gün (int32) olarak, sıralı halde.
+        # Yaş aralığı sorguları bu dizi üzerinde ikili arama ile çözülür.
+        dob = columns['date_of_birth']
+        birth_days = dob.astype('datetime64[D]').astype('int64')
+        known = np.flatnonzero(~np.isnat(dob))
+        age_order = known[np.argsort(birth_days[known], kind='stable')]
+        columns['birth_days'] = np.where(np.isnat(dob), np.iinfo(np.int32).min, birth_days).astype('int32')
+
+        with self._lock:
+            self._records = records
+            self._objects = [None] * len(records)
+            self._positions = {int(pid): i for i, pid in enumerate(columns['player_id'])}
+            self.columns = columns
+            self._age_order = age_order
+            self.bitmaps = {col: BitmapIndex(columns[col]) for col in BITMAP_COLUMNS}
+            self._sorted_birth_days = columns['birth_days'][age_order]
+            self._id_order = np.argsort(columns['player_id'], kind='stable')
+            self._loaded = loaded
+            self._generation = generation
+            self.loaded_at = datetime.now()
+        return loaded
+
+    def invalidate(self):
+        """Bir sonraki erişimde tablo yeniden yüklenir (yazma işlemlerinden sonra çağrılır)."""
+        with self._lock:
+            self._loaded = False
+            self._checked_at = 0.0
+            self._retry_at = 0.0
+
+    def invalidate_valuations(self):
+        """player_valuations değiştiğinde çağrılır; değer geçmişi bir sonraki erişimde yeniden okunur."""
+        with self._lock:
+            self._valuations = None
+            self._valuations_retry_at = 0.0
+
+    def _is_stale(self):
+        """self._lock tutulurken çağrılır."""
+        now = time.monotonic()
+        if now - self._checked_at < GENERATION_CHECK_INTERVAL:
+            return False
+        self._checked_at = now
+        return result_cache.generation('players') != self._generation
+
+    def _ensure_loaded(self):
+        # Kilitsiz hızlı yol: yüklü ve nesil yakın zamanda kontrol edilmiş
+        if self._loaded and time.monotonic() - self._checked_at < GENERATION_CHECK_INTERVAL:
+            return
+        with self._lock:
+            if self._loaded and not self._is_stale():
+                return
+            if time.monotonic() < self._retry_at:
+                return  # Son yükleme başarısız oldu: eski (ya da boş) veriyle devam edilir
+            if not self.refresh():
+                self._retry_at = time.monotonic() + LOAD_RETRY_INTERVAL
+
+    # --- Erişim ---
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self._records)
+
+    def column(self, name):
+        self._ensure_loaded()
+        return self.columns[name]
+
+    def all(self):
+        """Tüm oyuncular, Players nesneleri olarak."""
+        self._ensure_loaded()
+        return self.rows(np.arange(len(self._records)))
+
+    def get(self, player_id):
+        self._ensure_loaded()
+        try:
+            position = self._positions.get(int(player_id))
+        except (TypeError, ValueError):
+            return None
+        if position is None:
+            return None
+        return self.rows([position])[0]
+
+    def rows(self, selection):
+        """
+        Maske (bool dizisi) ya da konum listesi için Players nesneleri döndürür.
+        Nesneler sadece ihtiyaç duyulduğunda oluşturulur ve saklanır.
+        """
+        self._ensure_loaded()
+        selection = np.asarray(selection)
+        if selection.dtype == bool:
+            selection = np.flatnonzero(selection)
+
+        records, objects = self._records, self._objects
+        result = []
+        for i in selection.tolist():
+            obj = objects[i]
+            if obj is None:
+                obj = objects[i] = Players.from_row(records[i])
+            result.append(obj)
+        return result
+
+    # --- Vektörel maskeler ---
+    def bitmap_index(self, name):
+        self._ensure_loaded()
+        return self.bitmaps[name]
+
+    def equals(self, name, value, case_sensitive=True):
+        """Kategorik sütun == value maskesi; karşılaştırma kategoriler üzerinde yapılır."""
+        self._ensure_loaded()
+        if name in self.bitmaps:
+            index = self.bitmaps[name]
+            return index.to_mask(index.bitmap(value, case_sensitive))
+
+        categorical = self.column(name)
+        categories = categorical.categories
+        if case_sensitive:
+            matches = categories == value
+        else:
+            matches = categories.astype(str).str.lower() == str(value).lower()
+        return np.isin(categorical.codes, np.flatnonzero(matches))
+
+    def top_n(self, name, n, mask=None):
+        """
+        `name` sütununa göre en yüksek n oyuncu (azalan sırada).
+        Tüm listeyi sıralamak yerine argpartition ile O(N) seçim yapılır,
+        sadece seçilen n değer sıralanır.
+        """
+        values = self.column(name)
+        candidates = np.arange(len(values)) if mask is None else np.flatnonzero(mask)
+        if n <= 0 or candidates.size == 0:
+            return []
+
+        subset = values[candidates]
+        if n < subset.size:
+            chosen = np.argpartition(-subset, n - 1)[:n]
+        else:
+            chosen = np.arange(subset.size)
+        chosen = chosen[np.argsort(-subset[chosen], kind='stable')]
+        return self.rows(candidates[chosen])
+
+    def born_between(self, after=None, until=None):
+        """
+        after < date_of_birth <= until olan oyuncuların konumları (artan sırada).
+        Sınırlar date nesneleridir, None ise o taraf açıktır. Doğum tarihi
+        bilinmeyen oyuncular hiçbir aralığa girmez.
+        """
+        self._ensure_loaded()
+        sorted_days = self._sorted_birth_days
+        lo, hi = 0, len(sorted_days)
+        if after is not None:
+            lo = np.searchsorted(sorted_days, _epoch_days(after), side='right')
+        if until is not None:
+            hi = np.searchsorted(sorted_days, _epoch_days(until), side='right')
+        if lo >= hi:
+            return np.array([], dtype='int64')
+        return np.sort(self._age_order[lo:hi])
+
+
+    # --- Değer geçmişi (player_valuations) ---
+    def _load_valuations(self):
+        """player_valuations'tan (player_id, gün, değer) sütunlarını (player_id, tarih) sırasında okur."""
+        conn = None
+        try:
+            conn = self._db.get_connection()
+            cursor = tuple_cursor(conn)
+            cursor.execute("SELECT player_id, date, market_value_in_eur FROM player_valuations")
+            records = list(cursor.fetchall())
+            cursor.close()
+        except Exception as e:
+            print(f"Error (PlayerStore._load_valuations): {e}")
+            return None
+        finally:
+            if conn:
+                conn.close()
+
+        frame = pd.DataFrame.from_records(records, columns=['player_id', 'date', 'market_value_in_eur'])
+        player_ids = pd.to_numeric(frame['player_id'], errors='coerce').fillna(-1).astype('int64').to_numpy()
+        dates = pd.to_datetime(frame['date'], errors='coerce', format='ISO8601').to_numpy(dtype='datetime64[ns]')
+        values = pd.to_numeric(frame['market_value_in_eur'], errors='coerce').fillna(0).astype('int64').to_numpy()
+
+        known = ~np.isnat(dates)
+        days = dates[known].astype('datetime64[D]').astype('int64')
+        player_ids, values = player_ids[known], values[known]
+        order = np.lexsort((days, player_ids))
+        return {'player_id': player_ids[order], 'days': days[order], 'value': values[order]}
+
+    def _ensure_valuations(self):
+        generation = result_cache.generation('player_valuations')
+        with self._lock:
+            stale = self._valuations is None or generation != self._valuations_generation
+            if stale and time.monotonic() >= self._valuations_retry_at:
+                valuations = self._load_valuations()
+                if valuations is None:
+                    # Başarısız okuma saklanmaz; LOAD_RETRY_INTERVAL sonra yeniden denenir
+                    self._valuations_retry_at = time.monotonic() + LOAD_RETRY_INTERVAL
+                else:
+                    self._valuations = valuations
+                    self._valuations_generation = generation
+            valuations = self._valuations
+        if valuations is None:
+            empty = np.array([], dtype='int64')
+            return {'player_id': empty, 'days': empty, 'value': empty}
+        return valuations
+
+    def value_trend(self, start, end):
+        """
+        Her oyuncu için (start, end] aralığındaki piyasa değeri değişimi, oran olarak
+        (0.25 = %25 artış). Başlangıç değeri start'taki son kayıt, yoksa aralıktaki
+        ilk kayıttır. Aralıkta kaydı olmayan oyuncular için NaN.
+        Sonuç oyuncu konumlarıyla hizalı bir float dizisidir.
+        """
+        self._ensure_loaded()
+        valuations = self._ensure_valuations()
+        start_day, end_day = _epoch_days(start), _epoch_days(end)
+        trend = np.full(len(self._records), np.nan)
+
+        keep = valuations['days'] <= end_day
+        player_ids = valuations['player_id'][keep]
+        days, values = valuations['days'][keep], valuations['value'][keep]
+        if player_ids.size == 0:
+            return trend
+
+        # Her oyuncunun kayıtları ardışık ve tarihe göre sıralı
+        starts = np.flatnonzero(np.r_[True, player_ids[1:] != player_ids[:-1]])
+        ends = np.r_[starts[1:], player_ids.size] - 1
+        before = np.add.reduceat((days <= start_day).astype('int64'), starts)
+        base = values[np.where(before > 0, starts + before - 1, starts)]
+        latest = values[ends]
+
+        ok = (base > 0) & (days[ends] > start_day)
+        change = np.divide(latest - base, base, out=np.full(base.size, np.nan), where=ok)
+
+        # player_id -> oyuncu konumu
+        store_ids = self.columns['player_id']
+        if store_ids.size == 0:
+            return trend
+        found = np.searchsorted(store_ids, player_ids[starts], sorter=self._id_order)
+        found = np.minimum(found, store_ids.size - 1)
+        positions = self._id_order[found]
+        matched = store_ids[positions] == player_ids[starts]
+        trend[positions[matched]] = change[matched]
+        return trend
+
+
+def _epoch_days(value):
+    return int(np.datetime64(value, 'D').astype('int64'))
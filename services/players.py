@@ -4,8 +4,17 @@
 #              Provides backend functions to retrieve and process player data
 #              using the database connection (db).
 
+import calendar
+from datetime import date, datetime
+
+import numpy as np
+
 from Database import db
 from Models.Players import Players
+from services.bulk import insert_many
+from services.cache import count_cache, result_cache
+from services.query_utils import build_rows, cached_fetchall, fetch_count, page_with_total, select_list
+from services.search import build_search, relevance_order
 
 PLAYERS_COLUMNS = [
     'player_id', 
@@ -36,6 +45,14 @@ PLAYERS_COLUMNS = [
 SELECT_FIELDS = ', '.join(PLAYERS_COLUMNS)
 PLACEHOLDERS = ', '.join(['%s'] * len(PLAYERS_COLUMNS))
 
+# Arama yapılacak alanlar (bkz. services/search.py); "text" FULLTEXT indeksiyle aynı sırada
+SEARCH_FIELDS = {
+    "table": "players",
+    "text": ["name", "player_code", "country_of_birth", "position"],
+    "number": ["player_id"],
+}
+PRIMARY_KEY = ('player_id',)
+
 
 def get_player(player_id):
     """
@@ -45,67 +62,61 @@ def get_player(player_id):
     return db.players.get(player_id)
 
 
-def get_total_player_count():
+def _count_players(cursor, search_term=""):
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+    return fetch_count(cursor, "players", where_clause, query_params)
+
+
+def get_total_player_count(search_term=""):
     conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        query = "SELECT COUNT(*) FROM players"
-        cursor.execute(query)
-        result = cursor.fetchone()
-        return result['COUNT(*)'] if result else 0
+        return count_cache.get_or_load(
+            "players", search_term, lambda: _count_players(cursor, search_term)
+        )
     except Exception as e:
         print(f"Hata (get_total_player_count): {e}")
         return 0
     finally:
         if conn: conn.close()
 
-# --- Search ve Pagination Desteği için get_all_players fonksiyonunu güncelle ---
-def get_all_players(page=1, per_page=50, search_term=""):
-    conn = db.get_connection()
-    results_list = []
-    
+
+def _fetch_player_page(cursor, page, per_page, search_term, columns=None):
+
     # Sayfalama için offset hesaplama
     offset = (page - 1) * per_page
-    
+
     # Arama terimi için WHERE koşulu oluşturma
-    where_clause = ""
-    query_params = [per_page, offset]
-    
-    if search_term:
-        search_like = f"%{search_term}%"
-        # Not: Arama yapılacak sütunları burada listelemelisin (name, position, country_of_birth gibi)
-        search_cols = ["name", "position", "country_of_birth", "player_code"]
-        
-        where_conditions = [f"{col} LIKE %s" for col in search_cols]
-        where_clause = " WHERE " + " OR ".join(where_conditions)
-        
-        # LIMIT ve OFFSET'ten önce arama parametrelerini eklemeliyiz
-        query_params = [search_like] * len(search_cols) + [per_page, offset]
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+
+    # Arama varsa sonuçlar önce alaka düzeyine göre sıralanır
+    order_by = "name ASC"
+    relevance, relevance_params = relevance_order(SEARCH_FIELDS, search_term)
+    if relevance:
+        order_by = f"{relevance}, {order_by}"
+        query_params.extend(relevance_params)
+
+    # LIMIT ve OFFSET parametreleri query_params'ın sonunda olmalı.
+    query_params.extend([per_page, offset])
+
+    query = f"""
+        SELECT {select_list(PLAYERS_COLUMNS, columns, PRIMARY_KEY + ('name',))} FROM players
+        {where_clause}
+        ORDER BY {order_by}
+        LIMIT %s OFFSET %s
+    """
 
+    results = cached_fetchall(cursor, "players", query, query_params)
 
+    return build_rows(results, Players, columns)
+
+
+# --- Search ve Pagination Desteği için get_all_players fonksiyonunu güncelle ---
+def get_all_players(page=1, per_page=50, search_term="", columns=None):
+    conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        
-        
-        query = f"""
-            SELECT {SELECT_FIELDS} FROM players
-            {where_clause}
-            ORDER BY name ASC 
-            LIMIT %s OFFSET %s
-        """
-        
-        # LIMIT ve OFFSET parametreleri query_params'ın sonunda olmalı.
-        cursor.execute(query, tuple(query_params))       
-        results = cursor.fetchall()
-        
-        for row in results:
-            try:
-                obj = Players(**row)
-                results_list.append(obj)
-            except TypeError as e:
-                print(f"Model çevrim hatası (Satır atlandı): {e}")
-
-        return results_list
+        return _fetch_player_page(cursor, page, per_page, search_term, columns=columns)
 
     except Exception as e:
         print(f"Hata (get_all_players): {e}")
@@ -114,17 +125,90 @@ def get_all_players(page=1, per_page=50, search_term=""):
         if conn: conn.close()
 
 
-def get_top_players(limit=10):
+def get_all_players_with_total(page=1, per_page=50, search_term="", columns=None):
+    """Returns (players, total_count) for one page using a single connection."""
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return page_with_total(
+            "players", page, per_page, search_term,
+            lambda: _fetch_player_page(cursor, page, per_page, search_term, columns=columns),
+            lambda: _count_players(cursor, search_term),
+        )
+
+    except Exception as e:
+        print(f"Hata (get_all_players_with_total): {e}")
+        return [], 0
+    finally:
+        if conn: conn.close()
+
+
+# get_top_players için sıralama ölçütleri
+TOP_PLAYER_METRICS = {
+    'market_value': 'market_value_in_eur',
+    'peak_value': 'highest_market_value_in_eur',
+}
+
+def get_top_players(limit=10, by='market_value', position=None, competition_id=None, club_id=None):
     """
     Retrieve the top N players ranked by their market value (descending order).
     Default is 10 players.
+    by: 'market_value' (current) or 'peak_value' (highest market value).
+    Optional filters: position, competition_id (current club's league), club_id.
+    """
+    metric = TOP_PLAYER_METRICS.get(by, 'market_value_in_eur')
+
+    mask = None
+    if position is not None:
+        mask = db.players.equals('position', position)
+    if competition_id is not None:
+        league_mask = db.players.equals('current_club_domestic_competition_id', competition_id)
+        mask = league_mask if mask is None else mask & league_mask
+    if club_id is not None:
+        club_mask = db.players.column('current_club_id') == int(club_id)
+        mask = club_mask if mask is None else mask & club_mask
+
+    return db.players.top_n(metric, limit, mask)
+
+# find_players için kısa filtre adları
+FIND_PLAYERS_ALIASES = {
+    'country': 'country_of_citizenship',
+    'competition_id': 'current_club_domestic_competition_id',
+}
+
+def find_players(match='all', **filters):
+    """
+    Multi-criteria player search over the in-memory bitmap indexes.
+    Filters: position, sub_position, foot, country_of_citizenship (alias: country),
+    current_club_domestic_competition_id (alias: competition_id).
+    A filter value may be a single value or a list (any of them matches).
+    match='all' ANDs the filters, match='any' ORs them. Case-insensitive.
+    Example: find_players(foot='left', country='Brazil', position='Defender', competition_id='GB1')
     """
-    players = db.players.all()
-    return sorted(
-        players,
-        key=lambda p: float(p.market_value_in_eur or 0),
-        reverse=True
-    )[:limit]
+    from services.player_store import BITMAP_COLUMNS
+
+    if match not in ('all', 'any'):
+        raise ValueError(f"match must be 'all' or 'any', got {match!r}")
+
+    result = None
+    for name, value in filters.items():
+        column = FIND_PLAYERS_ALIASES.get(name, name)
+        if column not in BITMAP_COLUMNS:
+            raise ValueError(f"Unsupported filter: {name}")
+
+        index = db.players.bitmap_index(column)
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        bitmap = index.any_of(values)
+        if result is None:
+            result = bitmap
+        elif match == 'all':
+            result = result & bitmap
+        else:
+            result = result | bitmap
+
+    if result is None:
+        return db.players.all()
+    return db.players.rows(index.to_mask(result))
 
 def get_players_by_position(position):
     """
@@ -132,11 +216,36 @@ def get_players_by_position(position):
     Example input: "Midfield", "Defender", "Attack", "Goalkeeper".
     Matching is case-sensitive based on stored data.
     """
-    from Database import db
-    players = db.players.all()
-    return [p for p in players if p.position == position]
+    return db.players.rows(db.players.equals('position', position))
 
-from datetime import datetime
+def _years_before(day, years):
+    """`day` tarihinden tam `years` yıl önceki gün (29 Şubat -> 28 Şubat)."""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+def _as_date(as_of):
+    as_of = as_of or date.today()
+    if isinstance(as_of, datetime):
+        as_of = as_of.date()
+    return as_of
+
+def _birth_window(min_age, max_age, as_of):
+    # age >= min_age  <=>  doğum tarihi <= as_of - min_age yıl
+    # age <= max_age  <=>  doğum tarihi >  as_of - (max_age + 1) yıl
+    until = _years_before(as_of, min_age) if min_age is not None else None
+    after = _years_before(as_of, max_age + 1) if max_age is not None else None
+    return after, until
+
+def get_players_by_age_range(min_age=None, max_age=None, as_of=None):
+    """
+    Returns players whose age (in full years) on `as_of` is within [min_age, max_age].
+    as_of defaults to today and is evaluated once per call. Either bound may be None.
+    Players without valid date_of_birth are ignored.
+    """
+    after, until = _birth_window(min_age, max_age, _as_date(as_of))
+    return db.players.rows(db.players.born_between(after=after, until=until))
 
 def get_players_older_than(age):
     """
@@ -144,77 +253,108 @@ def get_players_older_than(age):
     Uses the player's date_of_birth field to calculate age.
     Players without valid date_of_birth are ignored.
     """
-    players = db.players.all()
-    result = []
-
-    for p in players:
-        if p.date_of_birth:
-            try:
-                dob = datetime.strptime(p.date_of_birth, "%Y-%m-%d")
-                player_age = (datetime.now() - dob).days // 365
-
-                if player_age > age:
-                    result.append(p)
-            except:
-                # Skip invalid dates
-                pass
-
-    return result
+    return get_players_by_age_range(min_age=age + 1)
 
 def get_players_younger_than(age):
     """
     Returns all players younger than the given age.
     Players without valid or parsable date_of_birth are skipped.
     """
-    players = db.players.all()
-    result = []
-
-    for p in players:
-        if p.date_of_birth:
-            try:
-                dob = datetime.strptime(p.date_of_birth, "%Y-%m-%d")
-                player_age = (datetime.now() - dob).days // 365
-                if player_age < age:
-                    result.append(p)
-            except:
-                pass
-    return result
+    if age <= 0:
+        return []
+    return get_players_by_age_range(min_age=0, max_age=age - 1)
+
+def _months_before(day, months):
+    """`day` tarihinden `months` ay önceki gün (ay sonu taşarsa ayın son gününe çekilir)."""
+    year, month = divmod(day.year * 12 + day.month - 1 - months, 12)
+    month += 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+def _undervalued_ranking(threshold_ratio, mask=None):
+    """Returns (positions, ratio) of undervalued players, most undervalued first."""
+    current = db.players.column('market_value_in_eur')
+    peak = db.players.column('highest_market_value_in_eur')
+
+    valid = (peak > 0) & (current > 0)
+    ratio = np.divide(current, peak, out=np.zeros(len(current)), where=valid)
+    selected = valid & (ratio < threshold_ratio)
+    if mask is not None:
+        selected &= mask
+
+    candidates = np.flatnonzero(selected)
+    # Oran küçükten büyüğe; eşitlikte zirve değeri yüksek olan önce
+    order = np.lexsort((-peak[candidates], ratio[candidates]))
+    return candidates[order], ratio
 
 def get_undervalued_players(threshold_ratio=0.5):
     """
     Returns players whose current market value is significantly lower
-    than their historical highest market value.
+    than their historical highest market value, most undervalued first.
     Example: threshold_ratio=0.5 means current value < 50% of peak value.
     Players missing value data are ignored.
     """
-    players = db.players.all()
-    result = []
-
-    for p in players:
-        try:
-            current = float(p.market_value_in_eur or 0)
-            peak = float(p.highest_market_value_in_eur or 0)
-
-            if peak > 0 and current > 0:
-                ratio = current / peak
-                if ratio < threshold_ratio:
-                    result.append(p)
-        except:
-            pass
+    positions, _ = _undervalued_ranking(threshold_ratio)
+    return db.players.rows(positions)
 
-    return result
+def screen_undervalued_players(threshold_ratio=0.5, min_age=None, max_age=None,
+                               contract_expires_before=None, min_trend=None, max_trend=None,
+                               trend_months=12, page=1, per_page=50, as_of=None):
+    """
+    Ranked undervalued-player screener over the whole player base.
+    - ratio: market_value_in_eur / highest_market_value_in_eur, kept if < threshold_ratio
+    - trend: market value change over the last `trend_months` months from
+      player_valuations (0.25 = +25%), None when there is no recent valuation
+    Optional filters: age range on `as_of`, contract expiring on or before
+    `contract_expires_before`, trend bounds (players without a trend are dropped
+    when a bound is given).
+    Returns (results, total): one page of dicts {player, ratio, trend, age},
+    most undervalued first, and the number of matching players.
+    """
+    as_of = _as_date(as_of)
+    store = db.players
+    mask = np.ones(len(store), dtype=bool)
+
+    if min_age is not None or max_age is not None:
+        after, until = _birth_window(min_age, max_age, as_of)
+        in_range = np.zeros(len(store), dtype=bool)
+        in_range[store.born_between(after=after, until=until)] = True
+        mask &= in_range
+
+    if contract_expires_before is not None:
+        expires = store.column('contract_expiration_date')
+        mask &= expires <= np.datetime64(contract_expires_before, 'D')
+
+    trend = store.value_trend(_months_before(as_of, trend_months), as_of)
+    if min_trend is not None:
+        mask &= trend >= min_trend
+    if max_trend is not None:
+        mask &= trend <= max_trend
+
+    positions, ratio = _undervalued_ranking(threshold_ratio, mask)
+    total = int(positions.size)
+
+    page = max(page, 1)
+    page_positions = positions[(page - 1) * per_page: page * per_page]
+    dob = store.column('date_of_birth')
+
+    results = []
+    for position, player in zip(page_positions.tolist(), store.rows(page_positions)):
+        born = None if np.isnat(dob[position]) else dob[position].astype('datetime64[D]').item()
+        results.append({
+            'player': player,
+            'ratio': float(ratio[position]),
+            'trend': None if np.isnan(trend[position]) else float(trend[position]),
+            'age': None if born is None else
+                as_of.year - born.year - ((as_of.month, as_of.day) < (born.month, born.day)),
+        })
+    return results, total
 
 def get_players_by_country(country):
     """
     Return all players whose citizenship matches the given country.
     Case-insensitive comparison.
     """
-    players = db.players.all()
-    return [
-        p for p in players
-        if p.country_of_citizenship
-        and p.country_of_citizenship.lower() == country.lower()
-    ]
+    return db.players.rows(db.players.equals('country_of_citizenship', country, case_sensitive=False))
 
 def insert_player(player_data: dict):
 
@@ -235,6 +375,8 @@ def insert_player(player_data: dict):
         new_id = player_data.get('player_id', cursor.lastrowid)
 
         conn.commit()
+        result_cache.invalidate("players")
+        db.players.invalidate()
         cursor.close()
         return new_id
 
@@ -245,17 +387,87 @@ def insert_player(player_data: dict):
         if conn:
             conn.close()
 
+# --- (Bulk Insert) ---
+def insert_many_players(players_data: list, batch_size=1000):
+    """
+    Inserts several players in one transaction using multi-row INSERTs.
+    Returns {'inserted': n, 'errors': [{'row': index, 'error': message}]} (see services/bulk.py).
+    """
+    result = insert_many("players", PLAYERS_COLUMNS, players_data, batch_size)
+    if result['inserted']:
+        db.players.invalidate()
+    return result
+
+# --- (Delete) ---
+def delete_player(player_id):
+    """Deletes the player with the given player_id. Returns True if a row was removed."""
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+
+        query = "DELETE FROM players WHERE player_id = %s"
+        cursor.execute(query, (player_id,))
+
+        rows_affected = cursor.rowcount
+
+        conn.commit()
+        result_cache.invalidate("players")
+        db.players.invalidate()
+        cursor.close()
+        return rows_affected > 0
+
+    except Exception as e:
+        print(f"Error (delete_player): {e}")
+        return f"Error: {e}"
+    finally:
+        if conn:
+            conn.close()
+
+# --- (Update) ---
+def update_player(player_id, update_data: dict):
+    """Updates the given columns of a player. Returns the number of affected rows."""
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+
+        set_clauses = []
+        update_values = []
+
+        for col, value in update_data.items():
+            if col in PLAYERS_COLUMNS and col != 'player_id':
+                set_clauses.append(f"{col} = %s")
+                update_values.append(value)
+
+        if not set_clauses:
+            return 0
+
+        query = f"UPDATE players SET {', '.join(set_clauses)} WHERE player_id = %s"
+        update_values.append(player_id)
+
+        cursor.execute(query, tuple(update_values))
+
+        rows_affected = cursor.rowcount
+
+        conn.commit()
+        result_cache.invalidate("players")
+        db.players.invalidate()
+        cursor.close()
+        return rows_affected
+
+    except Exception as e:
+        print(f"Error (update_player): {e}")
+        return f"Error: {e}"
+    finally:
+        if conn:
+            conn.close()
+
 def get_players_by_foot(foot):
     """
     Return players whose dominant foot matches the given value.
     Example inputs: 'right', 'left', 'both'
     Case-insensitive comparison.
     """
-    players = db.players.all()
-    return [
-        p for p in players
-        if p.foot and p.foot.lower() == foot.lower()
-    ]
+    return db.players.rows(db.players.equals('foot', foot, case_sensitive=False))
 
 
 
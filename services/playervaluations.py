@@ -1,5 +1,13 @@
 from Database import db
 from Models.PlayerValuations import PlayerValuations # 'Models.PlayerValuations' varsayılıyor
+from services.bulk import insert_many, upsert_many
+from services.cache import count_cache, result_cache
+from services.pagination import fetch_keyset_page, keyset_columns, order_by_clause
+from services.query_utils import (
+    build_rows, cached_fetchall, cached_fetchone, fetch_count, keyset_with_total, page_with_total,
+    select_list, tuple_cursor,
+)
+from services.search import build_search, relevance_order
 
 # PlayerValuations Sınıfının tüm alanlarını listeleyelim
 PLAYER_VALUATION_COLUMNS = [
@@ -11,6 +19,14 @@ PLAYER_VALUATION_COLUMNS = [
 SELECT_FIELDS = ', '.join(PLAYER_VALUATION_COLUMNS)
 PLACEHOLDERS = ', '.join(['%s'] * len(PLAYER_VALUATION_COLUMNS))
 
+# Arama sütunları piyasa değeri tablosu için ayarlandı (Örn: player_id, current_club_id)
+# Sayısal ID'ler birebir, lig kodu önek olarak aranır; böylece indeksler kullanılabilir
+SEARCH_FIELDS = {
+    "prefix": ["player_club_domestic_competition_id"],
+    "number": ["player_id", "current_club_id"],
+}
+PRIMARY_KEY = ('player_id', 'date')
+
 # Varsayım: PlayerValuations tablosunun birincil anahtarı (Primary Key) 
 # 'player_id' ve 'date' kombinasyonudur, çünkü bir oyuncunun birden 
 # fazla tarihte piyasa değeri olabilir.
@@ -26,17 +42,16 @@ def get_valuation(player_id, date):
     """
     conn = db.get_connection()
     try:
-        cursor = conn.cursor()
+        cursor = tuple_cursor(conn)
         query = f"""
         SELECT {SELECT_FIELDS} FROM player_valuations 
         WHERE player_id = %s AND date = %s
         """
-        cursor.execute(query, (player_id, date))
-        result = cursor.fetchone()
+        result = cached_fetchone(cursor, "player_valuations", query, (player_id, date))
         cursor.close()
 
         if result:
-            return PlayerValuations(**result) 
+            return PlayerValuations.from_row(result) 
         return None
 
     except Exception as e:
@@ -65,6 +80,8 @@ def insert_valuation(valuation_data: dict):
         # Piyasa değerlerinin kendi unique ID'si olmayabilir, 
         # bu nedenle sadece başarılı ekleme onayı dönebiliriz.
         conn.commit()
+        result_cache.invalidate("player_valuations")
+        db.players.invalidate_valuations()
         cursor.close()
         return True # Başarı göstergesi
 
@@ -75,6 +92,30 @@ def insert_valuation(valuation_data: dict):
         if conn:
             conn.close()
 
+# --- (Bulk Insert) ---
+def insert_many_valuations(valuations_data: list, batch_size=1000):
+    """
+    Birden fazla piyasa değeri kaydını tek transaction içinde, çok satırlı INSERT'lerle ekler.
+    {'inserted': n, 'errors': [{'row': sıra, 'error': mesaj}]} döndürür (bkz. services/bulk.py).
+    """
+    result = insert_many("player_valuations", PLAYER_VALUATION_COLUMNS, valuations_data, batch_size)
+    if result['inserted']:
+        db.players.invalidate_valuations()
+    return result
+
+# --- (Bulk Upsert) ---
+def upsert_many_valuations(valuations_data: list, batch_size=1000):
+    """
+    Piyasa değeri kayıtlarını (player_id, date) anahtarına göre ekler ya da günceller
+    (çok satırlı INSERT ... ON DUPLICATE KEY UPDATE, tek transaction).
+    Örtüşen snapshot'ları yeniden yüklemek güvenlidir.
+    {'upserted': n, 'errors': [...]} döndürür (bkz. services/bulk.py).
+    """
+    result = upsert_many("player_valuations", PLAYER_VALUATION_COLUMNS, PRIMARY_KEY, valuations_data, batch_size)
+    if result['upserted']:
+        db.players.invalidate_valuations()
+    return result
+
 # --- (Delete) ---
 def delete_valuation(player_id, date):
     """Belirtilen player_id ve tarihe sahip piyasa değeri kaydını siler."""
@@ -88,6 +129,8 @@ def delete_valuation(player_id, date):
         rows_affected = cursor.rowcount
 
         conn.commit()
+        result_cache.invalidate("player_valuations")
+        db.players.invalidate_valuations()
         cursor.close()
         return rows_affected > 0
 
@@ -133,6 +176,8 @@ def update_valuation(player_id, date, update_data: dict):
         rows_affected = cursor.rowcount
 
         conn.commit()
+        result_cache.invalidate("player_valuations")
+        db.players.invalidate_valuations()
         cursor.close()
         return rows_affected
 
@@ -149,23 +194,18 @@ def update_valuation(player_id, date, update_data: dict):
 def get_valuations_by_player(player_id):
     """Belirtilen oyuncuya ait tüm piyasa değeri geçmişini getirir."""
     conn = db.get_connection()
-    results_list = []
     try:
-        cursor = conn.cursor()
+        cursor = tuple_cursor(conn)
 
         query = f"""
         SELECT {SELECT_FIELDS} FROM player_valuations 
         WHERE player_id = %s 
         ORDER BY date DESC
         """
-        cursor.execute(query, (player_id,))
-        results = cursor.fetchall()
+        results = cached_fetchall(cursor, "player_valuations", query, (player_id,))
         cursor.close()
 
-        for row in results:
-            results_list.append(PlayerValuations(**row))
-
-        return results_list
+        return PlayerValuations.from_rows(results)
 
     except Exception as e:
         print(f"Error (get_valuations_by_player): {e}")
@@ -175,29 +215,20 @@ def get_valuations_by_player(player_id):
             conn.close()
 
 # --- (List All with Pagination) ---
+def _count_valuations(cursor, search_term=""):
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+    return fetch_count(cursor, "player_valuations", where_clause, query_params)
+
+
 def get_total_valuation_count(search_term=""):
     """Filtrelenmiş veya tüm piyasa değeri kayıtlarının toplam sayısını döndürür."""
     conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        
-        where_clause = ""
-        query_params = []
-        
-        if search_term:
-            search_like = f"%{search_term}%"
-            # Arama sütunları piyasa değeri tablosu için ayarlandı (Örn: player_id, current_club_id)
-            search_cols = ["player_id", "current_club_id", "player_club_domestic_competition_id"]
-            where_conditions = [f"{col} LIKE %s" for col in search_cols]
-            where_clause = " WHERE " + " OR ".join(where_conditions)
-            query_params = [search_like] * len(search_cols)
-
-        query = f"SELECT COUNT(*) FROM player_valuations {where_clause}"
-        cursor.execute(query, tuple(query_params))
-        result = cursor.fetchone()
-        
-        return result[0] if isinstance(result, tuple) else (result['COUNT(*)'] if result else 0)
-        
+        return count_cache.get_or_load(
+            "player_valuations", search_term, lambda: _count_valuations(cursor, search_term)
+        )
+
     except Exception as e:
         print(f"Error (get_total_valuation_count): {e}")
         return 0
@@ -205,55 +236,117 @@ def get_total_valuation_count(search_term=""):
         if conn: conn.close()
 
 
-def get_all_valuations(page=1, per_page=50, search_term="", sort_by="date", sort_order="DESC"):
-    """Piyasa değeri kayıtlarını sayfalama, arama ve sıralama terimlerine göre listeler."""
-    conn = db.get_connection()
-    results_list = []
-    
+def _fetch_valuations_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=None):
     offset = (page - 1) * per_page
-    
-    where_clause = ""
-    query_params = []
-    
-    if search_term:
-        search_like = f"%{search_term}%"
-        search_cols = ["player_id", "current_club_id", "player_club_domestic_competition_id"]
-        where_conditions = [f"{col} LIKE %s" for col in search_cols]
-        where_clause = " WHERE " + " OR ".join(where_conditions)
-        query_params = [search_like] * len(search_cols)
-        
+
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+
     # Sıralama parametrelerini güvenli hale getir
-    safe_sort_order = sort_order.upper() if sort_order.upper() in ["ASC", "DESC"] else "DESC" # Varsayılan: En yeni ilk
+    safe_sort_order = sort_order.upper() if sort_order.upper() in ["ASC", "DESC"] else "DESC"
     if sort_by not in PLAYER_VALUATION_COLUMNS:
         sort_by = "date"
 
+    # Eşit değerlerde sıranın sabit kalması için birincil anahtar da sıralamaya eklenir
+    order_by = order_by_clause(keyset_columns(sort_by, PRIMARY_KEY), safe_sort_order == "ASC")
+
+    # Arama varsa sonuçlar önce alaka düzeyine göre sıralanır
+    relevance, relevance_params = relevance_order(SEARCH_FIELDS, search_term)
+    if relevance:
+        order_by = f"{relevance}, {order_by}"
+        query_params.extend(relevance_params)
+
     # LIMIT ve OFFSET parametrelerini en sona ekle
     query_params.extend([per_page, offset])
 
+    query = f"""
+        SELECT {select_list(PLAYER_VALUATION_COLUMNS, columns, keyset_columns(sort_by, PRIMARY_KEY))} FROM player_valuations
+        {where_clause}
+        ORDER BY {order_by}
+        LIMIT %s OFFSET %s
+    """
+
+    results = cached_fetchall(cursor, "player_valuations", query, query_params)
+
+    return build_rows(results, PlayerValuations, columns)
+
+
+def get_all_valuations(page=1, per_page=50, search_term="", sort_by="date", sort_order="DESC", columns=None):
+    """Piyasa değeri kayıtlarını sayfalama, arama ve sıralama terimlerine göre listeler."""
+    conn = db.get_connection()
     try:
         cursor = conn.cursor()
-        
-        query = f"""
-            SELECT {SELECT_FIELDS} FROM player_valuations
-            {where_clause}
-            ORDER BY {sort_by} {safe_sort_order}
-            LIMIT %s OFFSET %s
-        """
-        
-        cursor.execute(query, tuple(query_params))       
-        results = cursor.fetchall()
-        
-        for row in results:
-            try:
-                obj = PlayerValuations(**row) 
-                results_list.append(obj)
-            except TypeError as e:
-                print(f"Model conversion error (Row skipped): {e}") 
-
-        return results_list
+        return _fetch_valuations_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=columns)
 
     except Exception as e:
         print(f"Error (get_all_valuations): {e}")
         return []
     finally:
-        if conn: conn.close()
\ No newline at end of file
+        if conn: conn.close()
+
+
+def get_all_valuations_with_total(page=1, per_page=50, search_term="", sort_by="date", sort_order="DESC", columns=None):
+    """Returns (valuations, total_count) for one page using a single connection."""
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return page_with_total(
+            "player_valuations", page, per_page, search_term,
+            lambda: _fetch_valuations_page(cursor, page, per_page, search_term, sort_by, sort_order, columns=columns),
+            lambda: _count_valuations(cursor, search_term),
+        )
+
+    except Exception as e:
+        print(f"Error (get_all_valuations_with_total): {e}")
+        return [], 0
+    finally:
+        if conn: conn.close()
+
+
+def _fetch_valuations_keyset(cursor, per_page, search_term, after, before, page, sort_by, sort_order, columns):
+    if sort_by not in PLAYER_VALUATION_COLUMNS:
+        sort_by = "date"
+    safe_sort_order = sort_order.upper() if sort_order.upper() in ["ASC", "DESC"] else "DESC"
+
+    where_clause, query_params = build_search(SEARCH_FIELDS, search_term)
+    return fetch_keyset_page(
+        cursor, f"SELECT {select_list(PLAYER_VALUATION_COLUMNS, columns, keyset_columns(sort_by, PRIMARY_KEY))} FROM player_valuations", where_clause, query_params,
+        sort_by, keyset_columns(sort_by, PRIMARY_KEY), safe_sort_order == "ASC", per_page, after, before,
+        offset=(page - 1) * per_page, build=None if columns else lambda row: PlayerValuations(**row),
+        table_name="player_valuations",
+    )
+
+
+def get_all_valuations_keyset(per_page=50, search_term="", after=None, before=None, page=1, sort_by="date", sort_order="DESC", columns=None):
+    """
+    Cursor-based pagination ordered by sort_by plus the primary key (player_id, date).
+    Without a cursor, `page` jumps straight to that page via OFFSET.
+    Returns (valuations, next_cursor, prev_cursor); deep pages cost the same as the first one.
+    """
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return _fetch_valuations_keyset(cursor, per_page, search_term, after, before, page, sort_by, sort_order, columns)
+
+    except Exception as e:
+        print(f"Error (get_all_valuations_keyset): {e}")
+        return [], None, None
+    finally:
+        if conn: conn.close()
+
+
+def get_all_valuations_keyset_with_total(per_page=50, search_term="", after=None, before=None, page=1, sort_by="date", sort_order="DESC", columns=None):
+    """get_all_valuations_keyset + total count on the same connection: (valuations, next_cursor, prev_cursor, total_count)."""
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        return keyset_with_total(
+            "player_valuations", search_term,
+            lambda: _fetch_valuations_keyset(cursor, per_page, search_term, after, before, page, sort_by, sort_order, columns),
+            lambda: _count_valuations(cursor, search_term),
+        )
+
+    except Exception as e:
+        print(f"Error (get_all_valuations_keyset_with_total): {e}")
+        return [], None, None, 0
+    finally:
+        if conn: conn.close()
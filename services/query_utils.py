@@ -0,0 +1,119 @@
+# Servislerde tekrar eden sorgu parçaları (COUNT okuma, sayfa + toplam) burada toplanır.
+# Arama koşulları için bkz. services/search.py
+
+import pymysql
+
+from services.cache import count_cache, result_cache
+
+
+def read_count(result):
+    """COUNT(*) sonucunu DictCursor ya da tuple cursor fark etmeksizin int olarak okur."""
+    if not result:
+        return 0
+    if isinstance(result, dict):
+        return next(iter(result.values()))
+    return result[0]
+
+
+def tuple_cursor(conn):
+    """
+    Satırları dict yerine tuple olarak döndüren cursor. SELECT sütunları modelin
+    __slots__ sırasındaysa Model.from_row(row) ile doğrudan nesneye çevrilir.
+    """
+    return conn.cursor(pymysql.cursors.Cursor)
+
+
+def cached_fetchall(cursor, table_name, query, query_params=()):
+    """
+    Sorguyu result_cache üzerinden çalıştırır; anahtar (tablo, sorgu, parametreler).
+    Tabloya yazan servis fonksiyonu result_cache.invalidate() çağırdığında sonuç geçersizleşir.
+    Birden fazla tabloya dokunan (JOIN) sorgular bu yolla önbelleğe alınmamalıdır.
+    """
+    params = tuple(query_params)
+    # Aynı sorgu dict ve tuple cursor ile farklı satır tipleri döndürür
+    row_type = 'dict' if getattr(cursor, 'dict_type', None) is not None else 'tuple'
+
+    def load():
+        cursor.execute(query, params)
+        return list(cursor.fetchall())
+
+    # Çağıran listeyi değiştirebilir (ör. reverse), önbellekteki kopya etkilenmesin
+    return list(result_cache.get_or_load(table_name, f"{row_type}:{query}", params, load))
+
+
+def cached_fetchone(cursor, table_name, query, query_params=()):
+    """cached_fetchall ile aynı, ilk satırı ya da None döndürür (birincil anahtar sorguları için)."""
+    rows = cached_fetchall(cursor, table_name, query, query_params)
+    return rows[0] if rows else None
+
+
+def select_list(all_columns, columns=None, required=()):
+    """
+    SELECT sütun listesi. `columns` verilmişse sadece bu sütunlar ve her zaman
+    gereken anahtar/sıralama sütunları (`required`) seçilir; tabloda olmayan
+    isimler yok sayılır. `columns` boşsa tüm sütunlar.
+    """
+    if not columns:
+        return ', '.join(all_columns)
+    wanted = set(columns) | set(required)
+    return ', '.join(col for col in all_columns if col in wanted)
+
+
+def build_rows(rows, model, columns=None):
+    """
+    Projeksiyon yapıldıysa (`columns`) satırlar hafif dict kayıtları olarak döner,
+    aksi halde model nesnelerine çevrilir (çevrilemeyen satırlar atlanır).
+    """
+    if columns:
+        return rows
+    results_list = []
+    for row in rows:
+        try:
+            results_list.append(model(**row))
+        except TypeError as e:
+            print(f"Model conversion error (Row skipped): {e}")
+    return results_list
+
+
+def fetch_count(cursor, table_name, where_clause="", query_params=()):
+    query = f"SELECT COUNT(*) FROM {table_name} {where_clause}"
+    cursor.execute(query, tuple(query_params))
+    return read_count(cursor.fetchone())
+
+
+def total_from_page(page, per_page, row_count):
+    """
+    Son sayfaya ulaşıldıysa toplam sayı sayfadan hesaplanabilir; COUNT sorgusuna
+    gerek kalmaz. Hesaplanamıyorsa None döner.
+    """
+    if 0 < row_count < per_page or (row_count == 0 and page == 1):
+        return (page - 1) * per_page + row_count
+    return None
+
+
+def page_with_total(table_name, page, per_page, search_term, fetch_page, fetch_total):
+    """
+    Aynı bağlantı üzerinde sayfayı ve toplam sayıyı birlikte döndürür.
+    Toplam, arama terimi bazında count_cache'te tutulur; böylece filtrelenmiş
+    bir sonuçta sayfa değiştirmek tabloyu yeniden taramaz.
+    """
+    # Nesil sayfa okunmadan önce alınır: arada tabloya yazılırsa sayfadan hesaplanan
+    # toplam eski nesille saklanır ve bir sonraki okumada kullanılmaz
+    generation = count_cache.generation(table_name)
+    results_list = fetch_page()
+    total_count = total_from_page(page, per_page, len(results_list))
+    if total_count is None:
+        total_count = count_cache.get_or_load(table_name, search_term, fetch_total)
+    else:
+        count_cache.set(table_name, search_term, total_count, generation=generation)
+    return results_list, total_count
+
+
+def keyset_with_total(table_name, search_term, fetch_page, fetch_total):
+    """
+    page_with_total'ın keyset karşılığı: cursor'lu sayfa ve toplam sayı aynı bağlantıda.
+    (results_list, next_cursor, prev_cursor, total_count) döndürür.
+    """
+    results_list, next_cursor, prev_cursor = fetch_page()
+    total_count = count_cache.get_or_load(table_name, search_term, fetch_total)
+    return results_list, next_cursor, prev_cursor, total_count
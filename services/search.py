@@ -0,0 +1,108 @@
+# Arama alt sistemi.
+# `col LIKE '%terim%'` baştaki joker yüzünden hiçbir indeksi kullanamaz ve her
+# aramada tabloyu baştan sona tarar. Bunun yerine her servis kendi SEARCH_FIELDS
+# yapılandırmasını tanımlar:
+#   "text"   -> FULLTEXT (ngram) indeksli metin sütunları, MATCH ... AGAINST ile
+#   "prefix" -> kod/ID sütunları, `col LIKE 'terim%'` (B-tree indeksi kullanabilir)
+#   "number" -> sayısal ID sütunları, terim tamamen rakamsa `col = terim`
+# "table"  -> sütunların tablosu; FULLTEXT indeksi information_schema'dan kontrol edilir
+# "text" listesi database/schema.sql ve database/migrations/001_fulltext_search.sql'deki
+# FULLTEXT indeksiyle aynı sütunlardan oluşmalıdır; MySQL MATCH() sütun listesini
+# indeksle eşleştirir. İndeks yoksa (migration uygulanmamış ya da SQLite) LIKE kullanılır.
+
+from Database import db
+
+# innodb_ngram_token_size varsayılanı; bundan kısa kelimeler ngram indeksinde aranamaz
+NGRAM_TOKEN_SIZE = 2
+
+# Boolean mode operatörleri kullanıcı girdisinden temizlenir
+_BOOLEAN_OPERATORS = '+-<>()~*"@'
+
+
+def _fulltext_query(search_term):
+    """'lionel messi' -> '+lionel +messi' (her kelime zorunlu; ngram parser kelimeyi öbek olarak arar)."""
+    cleaned = search_term.translate({ord(ch): " " for ch in _BOOLEAN_OPERATORS})
+    words = [word for word in cleaned.split() if len(word) >= NGRAM_TOKEN_SIZE]
+    if not words:
+        return None
+    return " ".join(f"+{word}" for word in words)
+
+
+# MySQL ve SQLite'ta aynı çalışsın diye ters bölü yerine '!' kaçış karakteri kullanılır
+LIKE_ESCAPE = "ESCAPE '!'"
+
+
+def _escape_like(value):
+    return value.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+
+
+def _conditions(search_fields, search_term):
+    """(koşul, parametreler) listesi; her biri tek başına bir eşleşmeyi ifade eder."""
+    conditions = []
+
+    text_cols = search_fields.get("text", [])
+    if text_cols:
+        use_fulltext = db.has_fulltext_index(search_fields.get("table"), text_cols)
+        boolean_query = _fulltext_query(search_term) if use_fulltext else None
+        if boolean_query:
+            conditions.append((f"MATCH({', '.join(text_cols)}) AGAINST (%s IN BOOLEAN MODE)", [boolean_query]))
+        elif use_fulltext:
+            # ngram indeksinin bulamayacağı kadar kısa terimler: önek araması
+            prefix_like = _escape_like(search_term) + "%"
+            conditions.extend((f"{col} LIKE %s {LIKE_ESCAPE}", [prefix_like]) for col in text_cols)
+        else:
+            contains_like = "%" + _escape_like(search_term) + "%"
+            conditions.extend((f"{col} LIKE %s {LIKE_ESCAPE}", [contains_like]) for col in text_cols)
+
+    prefix_like = _escape_like(search_term) + "%"
+    conditions.extend((f"{col} LIKE %s {LIKE_ESCAPE}", [prefix_like]) for col in search_fields.get("prefix", []))
+
+    if search_term.isdigit():
+        conditions.extend((f"{col} = %s", [int(search_term)]) for col in search_fields.get("number", []))
+
+    return conditions
+
+
+def build_search(search_fields, search_term):
+    """
+    Arama terimi için WHERE koşulunu üretir: (where_clause, params).
+    Terim yoksa ("", []); where_clause " WHERE (...)" biçimindedir.
+    """
+    search_term = (search_term or "").strip()
+    if not search_term:
+        return "", []
+
+    conditions = _conditions(search_fields, search_term)
+    if not conditions:
+        # Terim hiçbir alana uymuyor (ör. sayısal sütunlarda metin arama)
+        return " WHERE 1 = 0", []
+
+    query_params = []
+    for _, params in conditions:
+        query_params.extend(params)
+    where_clause = " WHERE (" + " OR ".join(clause for clause, _ in conditions) + ")"
+    return where_clause, query_params
+
+
+def relevance_order(search_fields, search_term):
+    """
+    Sonuçları alaka düzeyine göre sıralamak için ORDER BY ifadesi: (sql, params).
+    Birebir kod/ID eşleşmeleri metin skorunun önüne geçer. Terim yoksa ("", []).
+    """
+    search_term = (search_term or "").strip()
+    if not search_term:
+        return "", []
+
+    scores = []
+    query_params = []
+    for clause, params in _conditions(search_fields, search_term):
+        if clause.startswith("MATCH("):
+            # MATCH skoru, WHERE'dekiyle aynı ifade olduğu için MySQL tekrar hesaplamaz
+            scores.append(clause)
+        else:
+            scores.append(f"(CASE WHEN {clause} THEN 100 ELSE 0 END)")
+        query_params.extend(params)
+
+    if not scores:
+        return "", []
+    return "(" + " + ".join(scores) + ") DESC", query_params
@@ -0,0 +1,160 @@
+# Tablodan bağımsız okuma yolu: /api/<tablo> ve dışa aktarma (services/export.py) bunu kullanır.
+# Tablonun sütunları, birincil anahtarı ve arama alanları (spec) servislerden gelir;
+# sorgu aynı yardımcılarla kurulur (build_search, keyset cursor'ları, result_cache).
+#   spec = {'table': ..., 'columns': [...], 'key': (...), 'search_fields': {...}}
+# Filtreler "sütun=değer" ya da "sütun__op=değer" (op: ne, gt, gte, lt, lte, in) biçimindedir.
+# stream_batches satırları sunucu tarafı (SSDictCursor) cursor ile parça parça okur;
+# büyük çıktılar Flask worker'ında ya da pymysql'de bütünüyle belleğe alınmaz.
+
+import datetime
+import decimal
+
+import pymysql
+
+from Database import db
+from services.pagination import add_condition, fetch_keyset_page, keyset_columns, order_by_clause
+from services.search import build_search
+
+FILTER_OPERATORS = {
+    'eq': '=',
+    'ne': '!=',
+    'gt': '>',
+    'gte': '>=',
+    'lt': '<',
+    'lte': '<=',
+    'in': 'IN',
+}
+
+
+def parse_filters(args, columns, reserved=()):
+    """
+    Sorgu parametrelerinden [(sütun, op, değer)] listesi. `reserved` parametreler atlanır;
+    bilinmeyen sütun ya da operatör ValueError fırlatır.
+    """
+    filters = []
+    for name, value in args.items():
+        if name in reserved:
+            continue
+        col, _, op = name.partition('__')
+        op = op or 'eq'
+        if col not in columns:
+            raise ValueError(f"Unknown column: {col}")
+        if op not in FILTER_OPERATORS:
+            raise ValueError(f"Unknown filter operator: {op}")
+        filters.append((col, op, value.split(',') if op == 'in' else value))
+    return filters
+
+
+def parse_columns(value, columns):
+    """'a,b' -> ['a', 'b']; boşsa None (tüm sütunlar). Bilinmeyen sütun ValueError fırlatır."""
+    if not value:
+        return None
+    wanted = [col.strip() for col in value.split(',') if col.strip()]
+    unknown = [col for col in wanted if col not in columns]
+    if unknown:
+        raise ValueError(f"Unknown column(s): {', '.join(unknown)}")
+    return wanted
+
+
+def build_where(spec, search_term="", filters=()):
+    where_clause, query_params = build_search(spec['search_fields'], search_term)
+    for col, op, value in filters:
+        if op == 'in':
+            condition = f"{col} IN ({', '.join(['%s'] * len(value))})"
+            where_clause, query_params = add_condition(where_clause, query_params, condition, value)
+        else:
+            condition = f"{col} {FILTER_OPERATORS[op]} %s"
+            where_clause, query_params = add_condition(where_clause, query_params, condition, [value])
+    return where_clause, list(query_params)
+
+
+def _select(spec, columns, sort_by):
+    # Cursor için sıralama + anahtar sütunları her zaman seçilir, çıktıdan sonra atılır
+    wanted = set(columns or spec['columns']) | set(keyset_columns(sort_by, spec['key']))
+    return ', '.join(col for col in spec['columns'] if col in wanted)
+
+
+def output_columns(spec, columns=None):
+    """Çıktı sütunları tablo sırasında: `columns` verilmişse sadece onlar."""
+    return [col for col in spec['columns'] if not columns or col in columns]
+
+
+def _project(rows, columns):
+    if not columns:
+        return rows
+    return [{col: row[col] for col in columns} for row in rows]
+
+
+def fetch_rows(spec, columns=None, filters=(), search_term="", sort_by=None, ascending=True,
+               limit=100, after=None):
+    """
+    Tek bir keyset sayfası: (satırlar, next_cursor). Satırlar dict'tir ve sadece
+    `columns` (yoksa tüm sütunlar) içerir. Sonuçlar result_cache üzerinden okunur.
+    """
+    sort_by = sort_by if sort_by in spec['columns'] else spec['key'][0]
+    conn = db.get_connection()
+    try:
+        cursor = conn.cursor()
+        where_clause, query_params = build_where(spec, search_term, filters)
+        rows, next_cursor, _ = fetch_keyset_page(
+            cursor, f"SELECT {_select(spec, columns, sort_by)} FROM {spec['table']}", where_clause,
+            query_params, sort_by, keyset_columns(sort_by, spec['key']), ascending, limit, after,
+            table_name=spec['table'],
+        )
+        cursor.close()
+        return _project(rows, columns), next_cursor
+
+    except Exception as e:
+        print(f"Error (fetch_rows {spec['table']}): {e}")
+        return [], None
+    finally:
+        if conn:
+            conn.close()
+
+
+def stream_batches(spec, columns=None, filters=(), search_term="", sort_by=None, ascending=True,
+                   limit=None, batch_size=1000):
+    """
+    Eşleşen tüm satırları (ya da ilk `limit` satırı) `batch_size`'lık dict listeleri olarak
+    üretir. Uzun süren okuma havuzu meşgul etmesin diye ayrı bir bağlantı ve sunucu tarafı
+    cursor kullanılır; üretici yarıda bırakılırsa bağlantı kapatılır.
+    """
+    sort_by = sort_by if sort_by in spec['columns'] else spec['key'][0]
+    where_clause, query_params = build_where(spec, search_term, filters)
+    query = f"""
+        SELECT {', '.join(output_columns(spec, columns))}
+        FROM {spec['table']}
+        {where_clause}
+        ORDER BY {order_by_clause(keyset_columns(sort_by, spec['key']), ascending)}
+    """
+    if limit is not None:
+        query += " LIMIT %s"
+        query_params.append(limit)
+
+    conn = db.connect(record=True)
+    try:
+        cursor = conn.cursor(pymysql.cursors.SSDictCursor)
+        cursor.execute(query, tuple(query_params))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        # Okunmamış satırlar cursor.close() ile tek tek çekilmesin; bağlantı doğrudan kapanır
+        conn.close()
+
+
+def json_value(value):
+    """JSON'a uygun değer: tarih -> ISO metin, Decimal -> float, bytes -> metin."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, bytes):
+        return value.decode('utf-8', 'replace')
+    return value
+
+
+def json_row(row):
+    return {col: json_value(value) for col, value in row.items()}
@@ -0,0 +1,23 @@
+# Testler MySQL sunucusu olmadan, SQLite arka ucunda (bkz. Database.py) ve süreç içi
+# önbellekle çalışır. Her test boş bir bellek veritabanı alır (database fixture'ı).
+
+import os
+
+os.environ.setdefault('MONEYBALL_DB_BACKEND', 'sqlite')
+os.environ.setdefault('MONEYBALL_SQLITE_PATH', ':memory:')
+os.environ.setdefault('MONEYBALL_CACHE_BACKEND', 'memory')
+
+import pytest
+
+from Database import db
+from services.cache import result_cache
+
+
+@pytest.fixture
+def database():
+    """schema.sql tablolarıyla kurulmuş, boş bir SQLite bellek veritabanı."""
+    db.configure('sqlite', ':memory:')
+    result_cache.clear()
+    yield db
+    result_cache.clear()
+
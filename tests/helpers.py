@@ -0,0 +1,29 @@
+# Testlerde ortak veri yardımcıları (servisleri atlayarak doğrudan tabloya yazar/okur).
+
+from Database import db
+from services.cache import result_cache
+
+
+def insert_rows(table_name, rows):
+    """Test verisi: dict satırlarını doğrudan (servisleri atlayarak) tabloya yazar."""
+    conn = db.connect()
+    try:
+        cursor = conn.cursor()
+        for row in rows:
+            columns = list(row)
+            cursor.execute(f"INSERT INTO {table_name} ({', '.join(columns)})"
+                           f" VALUES ({', '.join(['%s'] * len(columns))})", tuple(row.values()))
+        conn.commit()
+    finally:
+        conn.close()
+    result_cache.invalidate(table_name)
+
+
+def count_rows(table_name, where="", params=()):
+    conn = db.connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) AS n FROM {table_name} {where}", params)
+        return cursor.fetchone()['n']
+    finally:
+        conn.close()
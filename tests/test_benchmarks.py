@@ -0,0 +1,26 @@
+from benchmarks import datagen
+from benchmarks.cases import build_cases, uncovered_functions
+from benchmarks.runner import load_scale, run_cases
+from main import TABLE_REGISTRY, app
+
+from helpers import count_rows
+
+
+def test_generated_data_is_reproducible(tmp_path):
+    first, second = tmp_path / 'a', tmp_path / 'b'
+    counts = datagen.generate('10k', str(first))
+    assert datagen.generate('10k', str(second)) == counts
+    for path in sorted(first.iterdir()):
+        assert path.read_bytes() == (second / path.name).read_bytes()
+
+
+def test_every_case_runs_on_the_sqlite_backend(database, tmp_path):
+    counts = datagen.generate('10k', str(tmp_path / 'data'))
+    load_scale(str(tmp_path / 'data'))
+    assert count_rows('players') == counts['players']
+
+    cases = build_cases('10k', app, TABLE_REGISTRY, str(tmp_path / 'export.csv'), bulk_rows=10)
+    assert uncovered_functions(cases) == []
+    results = run_cases(cases, repeat=1, warmup=0, verbose=False)
+    assert len(results) == len(cases)
+    assert {name: entry['error'] for name, entry in results.items() if 'error' in entry} == {}
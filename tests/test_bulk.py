@@ -0,0 +1,74 @@
+import pytest
+
+from Database import db
+from importer.loader import load_table
+from services import playervaluations
+from services.bulk import upsert_many
+from services.game_events import EVENT_COLUMNS, PRIMARY_KEY as EVENT_KEY
+
+from helpers import count_rows
+
+
+def _drop_event_key():
+    """game_events'i migration 003 öncesindeki gibi benzersiz anahtarsız kurar."""
+    conn = db.connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DROP TABLE game_events")
+        cursor.execute("CREATE TABLE game_events (game_event_id VARCHAR(64), game_id INTEGER, minute INTEGER,"
+                       " type VARCHAR(32), club_id INTEGER, player_id INTEGER, description TEXT,"
+                       " player_in_id INTEGER)")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_upsert_many_updates_rows_with_an_existing_key(database):
+    row = {'player_id': 1, 'date': '2020-01-01', 'market_value_in_eur': 100}
+    assert playervaluations.upsert_many_valuations([row])['upserted'] == 1
+    result = playervaluations.upsert_many_valuations([dict(row, market_value_in_eur=200)])
+    assert result == {'upserted': 1, 'errors': []}
+    assert count_rows('player_valuations') == 1
+    assert count_rows('player_valuations', "WHERE market_value_in_eur = 200") == 1
+
+
+def test_upsert_many_is_rejected_without_a_unique_key(database):
+    _drop_event_key()
+    row = {'game_event_id': 'a', 'game_id': 1, 'minute': 10, 'type': 'Goals'}
+    result = upsert_many('game_events', EVENT_COLUMNS, EVENT_KEY, [row, row])
+    assert result['upserted'] == 0
+    assert result['errors'][0]['row'] is None
+    assert 'unique index' in result['errors'][0]['error']
+    assert count_rows('game_events') == 0
+
+
+def test_import_upsert_is_rejected_without_a_unique_key(database, tmp_path):
+    _drop_event_key()
+    (tmp_path / 'game_events.csv').write_text("game_event_id,game_id,minute,type\na,1,10,Goals\n")
+    with pytest.raises(ValueError, match='unique index'):
+        load_table('game_events', str(tmp_path), upsert=True)
+
+
+def test_import_upsert_needs_the_key_column_in_every_file(database, tmp_path):
+    (tmp_path / 'game_events.csv').write_text("game_id,minute,type\n1,10,Goals\n")
+    with pytest.raises(ValueError, match='no game_event_id column'):
+        load_table('game_events', str(tmp_path), upsert=True)
+
+
+def test_import_upsert_replaces_rows_by_event_id(database, tmp_path):
+    path = tmp_path / 'game_events.csv'
+    path.write_text("game_event_id,game_id,minute,type,description\na,1,10,Goals,first\n")
+    load_table('game_events', str(tmp_path), upsert=True)
+    path.write_text("game_event_id,game_id,minute,type,description\na,1,10,Goals,second\n")
+    load_table('game_events', str(tmp_path), upsert=True)
+    assert count_rows('game_events') == 1
+    assert count_rows('game_events', "WHERE description = 'second'") == 1
+
+
+def test_insert_many_keeps_good_rows_of_a_failing_batch(database):
+    rows = [{'player_id': 1, 'date': '2020-01-01'}, 'not a row', {'player_id': 1, 'date': '2020-01-01'},
+            {'player_id': 2, 'date': '2020-01-01', 'unknown': 'ignored'}]
+    result = playervaluations.insert_many_valuations(rows, batch_size=2)
+    assert result['inserted'] == 2
+    assert [error['row'] for error in result['errors']] == [1, 2]
+    assert count_rows('player_valuations') == 2
@@ -0,0 +1,72 @@
+import os
+import sqlite3
+import stat
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from services import cache
+from services.cache import MemoryBackend, ResultCache, SQLiteBackend
+
+
+@pytest.fixture
+def private_tmp(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    monkeypatch.delenv('MONEYBALL_CACHE_PATH', raising=False)
+    monkeypatch.setenv('MONEYBALL_CACHE_BACKEND', 'sqlite')
+    return tmp_path
+
+
+def test_sqlite_backend_round_trips_row_values(tmp_path):
+    results = ResultCache(SQLiteBackend(str(tmp_path / 'cache.sqlite3')))
+    rows = [(1, 'Ada', None, Decimal('4.5'), date(2024, 1, 2)),
+            {'game_id': 2, 'datetime': datetime(2024, 1, 2, 3, 4, 5)}]
+    results.set('games', 'SELECT 1', (), rows)
+    assert results.get('games', 'SELECT 1') == rows
+
+    results.invalidate('games')
+    assert results.get('games', 'SELECT 1') is None
+
+
+def test_default_cache_file_is_private_to_the_user(private_tmp):
+    backend = cache._default_backend()
+    assert isinstance(backend, SQLiteBackend)
+    directory = os.path.dirname(backend.path)
+    assert os.path.dirname(directory) == str(private_tmp)
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(backend.path).st_mode) == 0o600
+
+
+def test_shared_cache_directory_is_refused(private_tmp):
+    directory = cache.private_cache_dir()
+    os.chmod(directory, 0o777)
+    assert isinstance(cache._default_backend(), MemoryBackend)
+
+
+def test_cache_hits_touch_last_used_in_batches(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / 'cache.sqlite3'))
+    backend.set('k', 'games', 0, 2e9, [1])
+    conn = sqlite3.connect(backend.path)
+    stored = conn.execute("SELECT last_used FROM entries").fetchone()[0]
+
+    assert backend.get('k', 'games', stored + 10) == (True, [1])
+    assert conn.execute("SELECT last_used FROM entries").fetchone()[0] == stored
+
+    backend._flush_touches(backend._connection())
+    assert conn.execute("SELECT last_used FROM entries").fetchone()[0] == stored + 10
+
+
+def test_entries_in_an_older_format_are_dropped(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    old = sqlite3.connect(path)
+    old.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, table_name TEXT NOT NULL, generation INTEGER"
+                " NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL, value BLOB NOT NULL)")
+    old.execute("INSERT INTO entries VALUES ('k', 'games', 0, 2e9, 0, x'80049500')")
+    old.commit()
+    old.close()
+
+    backend = SQLiteBackend(path)
+    assert backend.size() == 0
+    assert backend.get('k', 'games', 0) == (False, None)
@@ -0,0 +1,49 @@
+import io
+from decimal import Decimal
+
+import pytest
+
+from services.export import ExportStats, iter_export
+
+
+def _export(batches, table_name, columns, fmt):
+    stats = ExportStats()
+    data = b''.join(iter_export(iter(batches), table_name, columns, fmt, stats=stats))
+    return data, stats
+
+
+def test_csv_export_writes_every_batch():
+    data, stats = _export([[{'club_id': 1, 'name': 'A'}], [{'club_id': 2, 'name': 'B'}]],
+                          'clubs', ['club_id', 'name'], 'csv')
+    assert data.decode().splitlines() == ['club_id,name', '1,A', '2,B']
+    assert stats.rows == 2
+
+
+@pytest.mark.parametrize('fmt', ['arrow', 'parquet'])
+def test_arrow_schema_does_not_depend_on_the_first_batch(fmt):
+    pa = pytest.importorskip('pyarrow')
+    # İlk parçada hep NULL olan sütunlar sonraki parçalarda dolu
+    batches = [
+        [{'club_id': 1, 'average_age': None, 'coach_name': None}],
+        [{'club_id': 2, 'average_age': Decimal('24.5'), 'coach_name': 'X'}],
+    ]
+    data, stats = _export(batches, 'clubs', ['club_id', 'average_age', 'coach_name'], fmt)
+    if fmt == 'arrow':
+        table = pa.ipc.open_stream(data).read_all()
+    else:
+        import pyarrow.parquet as pq
+        table = pq.read_table(io.BytesIO(data))
+
+    assert stats.rows == 2
+    assert table.schema.field('club_id').type == pa.int64()
+    assert table.schema.field('average_age').type == pa.decimal128(4, 1)
+    assert table.column('average_age').to_pylist() == [None, Decimal('24.5')]
+    assert table.column('coach_name').to_pylist() == [None, 'X']
+
+
+def test_empty_arrow_export_keeps_the_column_types():
+    pa = pytest.importorskip('pyarrow')
+    data, _ = _export([], 'games', ['game_id', 'date'], 'arrow')
+    schema = pa.ipc.open_stream(data).schema
+    assert schema.field('game_id').type == pa.int64()
+    assert schema.field('date').type == pa.date32()
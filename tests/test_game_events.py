@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+
+from Database import db
+from importer.loader import load_table
+from services import game_events
+
+from helpers import count_rows, insert_rows
+
+
+def _event(game_event_id, minute=10, type_='Substitutions', **extra):
+    return dict({'game_event_id': game_event_id, 'game_id': 1, 'minute': minute, 'type': type_}, **extra)
+
+
+def test_keyset_pages_through_events_sharing_game_minute_and_type(database):
+    # Aynı dakikada beş oyuncu değişikliği: (game_id, minute, type) beş satırda aynı
+    insert_rows('game_events', [_event(f"e{i}") for i in range(5)] + [_event("x", minute=90, type_='Goals')])
+
+    seen, after = [], None
+    while True:
+        events, after, _ = game_events.get_all_events_keyset(per_page=2, after=after)
+        seen += [event.game_event_id for event in events]
+        if after is None:
+            break
+    assert seen == ['e0', 'e1', 'e2', 'e3', 'e4', 'x']
+
+
+def test_insert_event_generates_an_id_and_delete_removes_only_that_row(database):
+    first = game_events.insert_event({'game_id': 1, 'minute': 10, 'type': 'Cards'})
+    second = game_events.insert_event({'game_id': 1, 'minute': 10, 'type': 'Cards'})
+    assert first and second and first != second
+
+    assert game_events.delete_event(first)
+    assert game_events.get_event(first) is None
+    assert game_events.get_event(second) is not None
+
+
+def test_insert_event_stores_the_generated_id(database):
+    event_id = game_events.insert_event({'game_id': 1, 'minute': 10, 'type': 'Cards', 'description': 'x'})
+    assert len(event_id) == 32 and int(event_id, 16) >= 0
+    assert count_rows('game_events', "WHERE game_event_id = %s", (event_id,)) == 1
+    assert game_events.get_event(event_id).description == 'x'
+
+
+def test_old_game_minute_type_lookup_still_works(database):
+    insert_rows('game_events', [_event('b', description='second'), _event('a', description='first')])
+    assert game_events.get_event(1, 10, 'Substitutions').game_event_id == 'a'
+    assert game_events.get_event(1, 11, 'Substitutions') is None
+
+    # Eski biçimle silme eskisi gibi eşleşen tüm olayları siler
+    assert game_events.delete_event(1, 10, 'Substitutions')
+    assert count_rows('game_events') == 0
+    with pytest.raises(TypeError):
+        game_events.get_event(1, 10)
+
+
+def test_import_generates_ids_for_files_without_the_key_column(database, tmp_path):
+    (tmp_path / 'game_events.csv').write_text(
+        "game_id,minute,type,club_id\n1,10,Substitutions,5\n1,10,Substitutions,5\n")
+    stats = load_table('game_events', str(tmp_path))
+    assert stats['rows'] == 2
+    assert count_rows('game_events', "WHERE game_event_id IS NOT NULL") == 2
+
+
+def test_migration_adds_unique_event_ids_to_a_legacy_table(tmp_path):
+    path = str(tmp_path / 'legacy.sqlite3')
+    legacy = sqlite3.connect(path)
+    legacy.executescript("""
+        CREATE TABLE game_events (game_id INTEGER NOT NULL, minute INTEGER NOT NULL,
+                                  type VARCHAR(32) NOT NULL, club_id INTEGER, player_id INTEGER,
+                                  description TEXT, player_in_id INTEGER);
+        CREATE INDEX idx_game_events_game ON game_events (game_id, minute, type);
+        INSERT INTO game_events (game_id, minute, type) VALUES (1, 10, 'Cards'), (1, 10, 'Cards');
+    """)
+    legacy.commit()
+    legacy.close()
+
+    db.configure('sqlite', path)
+    try:
+        applied = [version for version, _ in db.migrate()]
+        assert '003_game_event_id' in applied
+        assert count_rows('game_events', "WHERE game_event_id IS NOT NULL") == 2
+        assert db.has_unique_key('game_events', ['game_event_id'])
+        assert db.migrate() == []
+    finally:
+        db.configure('sqlite', ':memory:')
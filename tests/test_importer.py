@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from importer.cleaning import clean_batch
+from importer.loader import parallel_chunks, run_import
+from importer.reader import read_batches
+from importer.tables import TABLES
+
+from helpers import count_rows
+
+CLUBS = "club_id,name,squad_size\n" + "".join(f"{i},Club {i},{20 + i}\n" for i in range(1, 51))
+
+
+def test_parallel_chunks_return_every_row_in_file_order(tmp_path):
+    path = tmp_path / 'clubs.csv'
+    path.write_text(CLUBS)
+    columns = ['club_id', 'name', 'squad_size']
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        chunks = list(parallel_chunks(str(path), columns, pool, max_pending=2, chunk_bytes=64))
+    assert len(chunks) > 1
+    rows = [row for chunk in chunks for row in chunk]
+    assert rows == [row for batch in read_batches(str(path), columns) for row in batch]
+    assert [row[0] for row in rows] == [str(i) for i in range(1, 51)]
+
+
+def test_import_loads_every_file_of_a_table(database, tmp_path):
+    (tmp_path / 'clubs.csv').write_text(CLUBS)
+    (tmp_path / 'club_games.csv').write_text("game_id,club_id,own_goals\n1,1,2\n")
+    (tmp_path / 'c.csv').write_text("2,1,0\n")  # başlıksız, CLUB_GAME_COLUMNS sırasında
+
+    results, _ = run_import(str(tmp_path), ['clubs', 'club_games'], batch_size=7)
+    assert {result['table']: result['rows'] for result in results} == {'clubs': 50, 'club_games': 2}
+    assert count_rows('clubs', "WHERE club_id = 50 AND squad_size = 70") == 1
+    assert count_rows('club_games') == 2
+
+
+def test_import_parses_on_a_process_pool(database, tmp_path):
+    (tmp_path / 'clubs.csv').write_text(CLUBS)
+    results, _ = run_import(str(tmp_path), ['clubs'], batch_size=7, parse_workers=2)
+    assert results[0]['rows'] == 50
+    assert count_rows('clubs') == 50
+
+
+def test_cleaning_parses_transfermarkt_values_and_rejects_bad_rows():
+    columns = TABLES['players']['columns']
+    fields = ['player_id', 'name', 'market_value_in_eur', 'highest_market_value_in_eur', 'date_of_birth']
+    raw = [
+        ('1', 'A', '+€1.30m', '€-450k', '2000-01-02 00:00:00'),
+        ('2', 'null', '+-0', '', 'None'),
+        ('3.5', 'C', '10', '10', ''),
+        ('', 'D', '10', '10', ''),
+    ]
+    rows = [tuple(dict(zip(fields, values)).get(col, '') for col in columns) for values in raw]
+
+    cleaned, rejected = clean_batch('players', columns, rows)
+    assert [tuple(row[columns.index(col)] for col in fields) for row in cleaned] == [
+        (1, 'A', 1300000, -450000, '2000-01-02'),
+        (2, None, 0, None, None),
+    ]
+    assert [reason for reason, _ in rejected] == ['player_id: invalid int', 'player_id: missing primary key']
+    assert rejected[0][1]['player_id'] == '3.5'
+
+
+def test_import_with_clean_writes_rejected_rows_to_the_report(database, tmp_path):
+    data, report = tmp_path / 'data', tmp_path / 'rejected.csv'
+    data.mkdir()
+    (data / 'clubs.csv').write_text("club_id,name,total_market_value\n1,A,€2.5m\nx,B,1\n")
+
+    results, _ = run_import(str(data), ['clubs'], reject_report=str(report))
+    assert (results[0]['rows'], results[0]['rejected']) == (1, 1)
+    assert count_rows('clubs', "WHERE total_market_value = 2500000") == 1
+    assert 'club_id: invalid int' in report.read_text()
+
+
+def test_cleaning_keeps_the_transfer_record_as_text():
+    columns = TABLES['clubs']['columns']
+    row = tuple({'club_id': '1', 'total_market_value': '€2.5m', 'net_transfer_record': '€-37.42m'}.get(col)
+                for col in columns)
+    (cleaned,), rejected = clean_batch('clubs', columns, [row])
+    assert rejected == []
+    assert cleaned[columns.index('total_market_value')] == 2500000
+    assert cleaned[columns.index('net_transfer_record')] == '€-37.42m'
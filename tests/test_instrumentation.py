@@ -0,0 +1,78 @@
+import cProfile
+import os
+
+import pytest
+
+import main
+from main import TABLE_REGISTRY
+from services.instrumentation import Recorder, query_template
+
+from helpers import insert_rows
+
+
+@pytest.fixture
+def recorder(database):
+    recorder = Recorder()
+    database.recorder = recorder
+    yield recorder
+    database.recorder = None
+
+
+def test_query_template_collapses_parameter_lists():
+    assert query_template("SELECT *  FROM t WHERE id IN (%s, %s, %s)") == "SELECT * FROM t WHERE id IN (%s, ...)"
+
+
+def test_pooled_queries_are_recorded(recorder):
+    insert_rows('clubs', [{'club_id': 1, 'name': 'A'}])
+    TABLE_REGISTRY['clubs']['rows'](limit=10)
+    assert any(entry['rows'] == 1 for entry in recorder.queries.summary().values())
+
+
+def test_streaming_reads_are_recorded_with_their_rows(recorder):
+    insert_rows('clubs', [{'club_id': i, 'name': f"c{i}"} for i in range(5)])
+    batches = list(TABLE_REGISTRY['clubs']['stream'](batch_size=2))
+    assert [len(rows) for rows in batches] == [2, 2, 1]
+
+    streamed = [entry for template, entry in recorder.queries.summary().items() if 'FROM clubs' in template]
+    assert len(streamed) == 1
+    assert streamed[0]['rows'] == 5
+    assert streamed[0]['callers'] == ['table_query.stream_batches']
+
+
+def test_profiles_dumped_in_the_same_second_do_not_collide(tmp_path):
+    recorder = Recorder(profile_dir=str(tmp_path))
+    for _ in range(3):
+        recorder._dump_profile(cProfile.Profile(), 'api_table')
+    assert len(set(recorder.profiles)) == 3
+    assert len(os.listdir(tmp_path)) == 3
+
+
+@pytest.fixture
+def app_recorder(recorder, monkeypatch):
+    monkeypatch.setattr(main, 'recorder', recorder)
+    return recorder
+
+
+def test_streamed_queries_count_towards_their_request(app_recorder):
+    insert_rows('clubs', [{'club_id': i, 'name': f"c{i}"} for i in range(5)])
+    response = main.app.test_client().get('/api/clubs?format=ndjson')
+    assert len(response.get_data(as_text=True).splitlines()) == 5
+    response.close()
+
+    request = app_recorder.requests.summary()['api_table']
+    assert request['count'] == 1
+    assert request['rows'] == 5
+    assert app_recorder.current_request() is None
+
+
+def test_plain_responses_still_get_server_timing(app_recorder):
+    response = main.app.test_client().get('/api/clubs')
+    assert 'sql;dur=' in response.headers['Server-Timing']
+    assert app_recorder.requests.summary()['api_table']['count'] == 1
+
+
+def test_reset_forgets_profile_files(tmp_path):
+    recorder = Recorder(profile_dir=str(tmp_path))
+    recorder._dump_profile(cProfile.Profile(), 'api_table')
+    recorder.reset()
+    assert recorder.stats()['profiles'] == []
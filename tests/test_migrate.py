@@ -0,0 +1,23 @@
+import migrate
+from Database import db, migration_files
+
+
+def test_fresh_database_skips_indexes_it_already_has(database):
+    versions = [version for version, _ in migration_files(backend='sqlite')]
+    results = dict(db.migrate())
+    # schema.sql ile kurulan veritabanında indeksler zaten var, CREATE INDEX ifadeleri atlanır
+    assert list(results) == versions
+    assert results['001_fulltext_search'] == [] and results['002_secondary_indexes'] == []
+    assert db.applied_migrations() == set(versions)
+    assert db.migrate() == []
+
+
+def test_status_lists_pending_migrations(database, capsys):
+    assert migrate.main(['--status']) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines and all(line.startswith('pending') for line in lines)
+
+    assert migrate.main([]) == 0
+    capsys.readouterr()
+    migrate.main(['--status'])
+    assert all(line.startswith('applied') for line in capsys.readouterr().out.splitlines())
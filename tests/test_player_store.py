@@ -0,0 +1,90 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from Database import db
+from services import player_store, players, playervaluations
+from services.cache import MemoryBackend, SQLiteBackend, count_cache, result_cache
+from services.player_store import PlayerStore
+from services.query_utils import page_with_total
+
+
+@pytest.fixture(params=['sqlite', 'memory', 'none'])
+def cache_backend(request, tmp_path, monkeypatch):
+    """Okuma-yazma tutarlılığı önbellek arka ucuna bağlı olmamalı."""
+    backends = {
+        'sqlite': lambda: SQLiteBackend(str(tmp_path / 'cache.sqlite3')),
+        'memory': MemoryBackend,
+        'none': lambda: None,
+    }
+    monkeypatch.setattr(result_cache, 'backend', backends[request.param]())
+    return request.param
+
+
+def test_player_writes_are_visible_to_the_next_read(database, cache_backend):
+    assert len(db.players) == 0  # store yüklendi; sonraki yazmalar throttle içinde kalır
+
+    assert players.insert_player({'player_id': 7, 'name': 'Ada', 'position': 'Attack'}) == 7
+    assert players.get_player(7).name == 'Ada'
+
+    assert players.update_player(7, {'name': 'Ada L.'}) == 1
+    assert players.get_player(7).name == 'Ada L.'
+    assert [p.player_id for p in players.get_players_by_position('Attack')] == [7]
+
+    assert players.delete_player(7) is True
+    assert players.get_player(7) is None
+
+
+def test_bulk_player_insert_is_visible_to_the_next_read(database, cache_backend):
+    assert len(db.players) == 0
+    players.insert_many_players([{'player_id': 1, 'name': 'A'}, {'player_id': 2, 'name': 'B'}])
+    assert len(db.players) == 2
+
+
+def test_valuation_writes_reach_the_value_trend(database, cache_backend):
+    players.insert_player({'player_id': 1, 'name': 'A'})
+    playervaluations.insert_valuation({'player_id': 1, 'date': '2024-01-01', 'market_value_in_eur': 100})
+    assert np.isnan(db.players.value_trend(date(2024, 1, 1), date(2024, 6, 1))[0])
+
+    playervaluations.insert_many_valuations(
+        [{'player_id': 1, 'date': '2024-03-01', 'market_value_in_eur': 150}])
+    assert db.players.value_trend(date(2024, 1, 1), date(2024, 6, 1))[0] == pytest.approx(0.5)
+
+
+class _FailingDatabase:
+    def __init__(self):
+        self.attempts = 0
+
+    def get_connection(self):
+        self.attempts += 1
+        raise OSError("database is down")
+
+
+def test_failed_load_is_not_retried_on_every_access(monkeypatch):
+    failing = _FailingDatabase()
+    store = PlayerStore(failing)
+    assert len(store) == 0
+    assert store.top_n('market_value_in_eur', 5) == []
+    assert np.isnan(store.value_trend(date(2024, 1, 1), date(2024, 6, 1))).all()
+    assert failing.attempts == 2  # bir kez oyuncular, bir kez değer geçmişi
+
+    monkeypatch.setattr(player_store, 'LOAD_RETRY_INTERVAL', 0)
+    store.invalidate()
+    len(store)
+    assert failing.attempts == 3
+
+
+def test_page_total_is_not_cached_across_a_concurrent_write(database):
+    players.insert_player({'player_id': 1, 'name': 'A'})
+
+    def fetch_page():
+        rows = players.get_all_players(page=1, per_page=10)
+        # Sayfa okunduktan sonra, toplam saklanmadan önce başka bir istek yazar
+        players.insert_player({'player_id': 2, 'name': 'B'})
+        return rows
+
+    _, total = page_with_total("players", 1, 10, "", fetch_page, lambda: 0)
+    assert total == 1
+    assert count_cache.get("players", "") is None
+    assert players.get_total_player_count() == 2
@@ -0,0 +1,103 @@
+from datetime import date
+
+import pytest
+
+from Database import db
+from Models.Players import Players
+from services import players
+
+from helpers import insert_rows
+
+PLAYERS = [
+    {'player_id': 1, 'name': 'Ada', 'position': 'Attack', 'foot': 'left', 'country_of_citizenship': 'Brazil',
+     'current_club_domestic_competition_id': 'GB1', 'date_of_birth': '2000-06-15',
+     'market_value_in_eur': 40, 'highest_market_value_in_eur': 100, 'contract_expiration_date': '2025-06-30'},
+    {'player_id': 2, 'name': 'Bora', 'position': 'Defender', 'foot': 'left', 'country_of_citizenship': 'Brazil',
+     'current_club_domestic_competition_id': 'ES1', 'date_of_birth': '1990-01-01',
+     'market_value_in_eur': 90, 'highest_market_value_in_eur': 100, 'contract_expiration_date': '2027-06-30'},
+    {'player_id': 3, 'name': 'Cem', 'position': 'Attack', 'foot': 'right', 'country_of_citizenship': 'Turkey',
+     'current_club_domestic_competition_id': 'GB1', 'date_of_birth': None,
+     'market_value_in_eur': 10, 'highest_market_value_in_eur': 50, 'contract_expiration_date': None},
+    {'player_id': 4, 'name': 'Deniz', 'position': 'Goalkeeper', 'foot': 'right', 'country_of_citizenship': 'Turkey',
+     'current_club_domestic_competition_id': 'TR1', 'date_of_birth': '2000-06-16',
+     'market_value_in_eur': None, 'highest_market_value_in_eur': None, 'contract_expiration_date': None},
+]
+
+
+@pytest.fixture
+def squad(database):
+    insert_rows('players', PLAYERS)
+    db.players.invalidate()
+    return database
+
+
+def _ids(rows):
+    return [row.player_id for row in rows]
+
+
+def test_store_serves_model_objects(squad):
+    assert len(db.players) == 4
+    player = db.players.get(2)
+    assert isinstance(player, Players) and player.name == 'Bora'
+    assert db.players.get(2) is player  # nesneler bir kez oluşturulur
+    assert db.players.get(99) is None
+
+
+def test_top_players_are_sorted_and_filtered(squad):
+    assert _ids(players.get_top_players(limit=2)) == [2, 1]
+    assert _ids(players.get_top_players(limit=10, position='Attack')) == [1, 3]
+    assert _ids(players.get_top_players(limit=5, competition_id='GB1')) == [1, 3]
+    assert players.get_top_players(limit=0) == []
+
+
+def test_age_range_uses_the_reference_date(squad):
+    # 2000-06-15 doğumlu oyuncu 2024-06-15'te 24, 2000-06-16 doğumlu hâlâ 23 yaşında
+    as_of = date(2024, 6, 15)
+    assert _ids(players.get_players_by_age_range(min_age=24, max_age=24, as_of=as_of)) == [1]
+    assert _ids(players.get_players_by_age_range(max_age=23, as_of=as_of)) == [4]
+    assert _ids(players.get_players_by_age_range(min_age=30, as_of=as_of)) == [2]
+
+
+def test_find_players_combines_bitmap_filters(squad):
+    assert _ids(players.find_players(foot='LEFT', country='brazil')) == [1, 2]
+    assert _ids(players.find_players(foot='left', position='Attack')) == [1]
+    assert _ids(players.find_players(match='any', position='Goalkeeper', competition_id='ES1')) == [2, 4]
+    assert _ids(players.find_players(position=['Defender', 'Goalkeeper'])) == [2, 4]
+    with pytest.raises(ValueError):
+        players.find_players(name='Ada')
+
+
+def test_screener_ranks_the_most_undervalued_first(squad):
+    assert _ids(players.get_undervalued_players(0.5)) == [3, 1]
+
+    results, total = players.screen_undervalued_players(0.5, max_age=30, as_of=date(2024, 6, 15))
+    assert total == 1
+    assert results[0]['player'].player_id == 1
+    assert results[0]['ratio'] == pytest.approx(0.4)
+    assert results[0]['age'] == 24
+    assert results[0]['trend'] is None
+
+    _, total = players.screen_undervalued_players(0.5, contract_expires_before=date(2025, 12, 31))
+    assert total == 1
+
+
+def test_projected_pages_return_only_the_requested_columns(squad):
+    rows, total = players.get_all_players_with_total(page=1, per_page=3, columns=['name'])
+    assert total == 4
+    assert [row['name'] for row in rows] == ['Ada', 'Bora', 'Cem']
+    assert set(rows[0]) == {'player_id', 'name'}
+
+    rows, total = players.get_all_players_with_total(page=2, per_page=3)
+    assert total == 4 and _ids(rows) == [4]
+
+
+def test_models_have_no_instance_dict(squad):
+    player = db.players.get(1)
+    assert not hasattr(player, '__dict__')
+    assert player.as_dict()['name'] == 'Ada'
+
+
+def test_models_stay_hashable(squad):
+    player = db.players.get(1)
+    assert {player: 'Ada'}[player] == 'Ada'
+    assert player in set(db.players.all())
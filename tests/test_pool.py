@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from Database import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self):
+        self.rollbacks = 0
+        self.closed = False
+        self.alive = True
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def ping(self, reconnect=False):
+        if not self.alive:
+            raise OSError("gone")
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**options):
+    created = []
+
+    def factory():
+        created.append(FakeConnection())
+        return created[-1]
+
+    return ConnectionPool(factory, **options), created
+
+
+def test_connection_is_reused_and_rolled_back_on_release():
+    pool, created = make_pool(max_size=2)
+    conn = pool.acquire()
+    conn.close()
+    conn.close()  # ikinci close etkisiz
+    again = pool.acquire()
+    assert len(created) == 1
+    assert again._raw is created[0]
+    assert created[0].rollbacks == 1
+    assert pool.stats()['reused'] == 1
+
+
+def test_acquire_times_out_when_pool_is_exhausted():
+    pool, _ = make_pool(max_size=1, checkout_timeout=0.05)
+    held = pool.acquire()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+    assert pool.stats()['timeouts'] == 1
+    held.close()
+    pool.acquire().close()
+
+
+def test_waiting_thread_gets_released_connection():
+    pool, created = make_pool(max_size=1, checkout_timeout=2.0)
+    held = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    held.close()
+    waiter.join(2)
+    assert got and got[0]._raw is created[0]
+
+
+def test_dead_connection_is_replaced_after_health_check():
+    pool, created = make_pool(max_size=1, health_check_interval=0)
+    conn = pool.acquire()
+    conn.close()
+    created[0].alive = False
+    replacement = pool.acquire()
+    assert replacement._raw is created[1]
+    assert created[0].closed
+    assert pool.stats()['discarded'] == 1
+
+
+def test_idle_connections_are_evicted():
+    pool, created = make_pool(max_size=2, max_idle_time=0)
+    pool.acquire().close()
+    assert pool.evict_idle() == 1
+    assert created[0].closed
+    assert pool.stats()['size'] == 0
+
+
+def test_pool_serves_sqlite_connections(database):
+    conn = database.get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) AS n FROM players")
+        assert cursor.fetchone() == {'n': 0}
+    finally:
+        conn.close()
+    assert database.pool_stats()['in_use'] == 0
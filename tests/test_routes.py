@@ -0,0 +1,71 @@
+import json
+
+from main import app
+
+from helpers import count_rows, insert_rows
+
+
+def test_delete_removes_only_the_selected_event(database):
+    # Aynı dakikada iki oyuncu değişikliği: (game_id, minute, type) aynı
+    insert_rows('game_events', [
+        {'game_event_id': 'a', 'game_id': 1, 'minute': 10, 'type': 'Substitutions'},
+        {'game_event_id': 'b', 'game_id': 1, 'minute': 10, 'type': 'Substitutions'},
+    ])
+    response = app.test_client().post('/table/game_events/delete/a')
+    assert response.status_code == 302
+    assert count_rows('game_events') == 1
+    assert count_rows('game_events', "WHERE game_event_id = 'b'") == 1
+
+
+def test_table_page_links_delete_to_the_event_id(database):
+    insert_rows('game_events', [{'game_event_id': 'a', 'game_id': 1, 'minute': 10, 'type': 'Goals'}])
+    page = app.test_client().get('/table/game_events').get_data(as_text=True)
+    assert '/table/game_events/delete/a"' in page
+
+
+def test_bulk_endpoint_reports_failed_rows(database):
+    rows = [{'club_id': 1, 'name': 'A'}, {'club_id': 1, 'name': 'Duplicate'}, {'club_id': 2, 'name': 'B'}]
+    response = app.test_client().post('/table/clubs/bulk', json=rows)
+    assert response.status_code == 207
+    body = response.get_json()
+    assert body['inserted'] == 2
+    assert [error['row'] for error in body['errors']] == [1]
+    assert count_rows('clubs') == 2
+
+
+def test_api_pages_through_a_table_with_cursors(database):
+    insert_rows('clubs', [{'club_id': i, 'name': f'Club {i}'} for i in range(1, 6)])
+    client = app.test_client()
+
+    body = client.get('/api/clubs?columns=name&limit=2&order=desc').get_json()
+    assert body['rows'] == [{'name': 'Club 5'}, {'name': 'Club 4'}]
+    body = client.get(f"/api/clubs?limit=2&order=desc&after={body['next_cursor']}").get_json()
+    assert [row['club_id'] for row in body['rows']] == [3, 2]
+
+    assert client.get('/api/clubs?sort=nope').status_code == 400
+    assert client.get('/api/nope').status_code == 404
+
+
+def test_api_streams_ndjson_with_filters(database):
+    insert_rows('clubs', [{'club_id': 1, 'name': 'A', 'domestic_competition_id': 'GB1'},
+                          {'club_id': 2, 'name': 'B', 'domestic_competition_id': 'TR1'},
+                          {'club_id': 3, 'name': 'C', 'domestic_competition_id': 'GB1'}])
+    response = app.test_client().get('/api/clubs?format=ndjson&columns=name&domestic_competition_id=GB1')
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line) for line in lines] == [{'name': 'A'}, {'name': 'C'}]
+
+
+def _checkouts(database):
+    stats = database.pool_stats()
+    return stats['created'] + stats['reused']
+
+
+def test_keyset_table_page_uses_one_connection(database):
+    insert_rows('game_events', [{'game_event_id': f"e{i:02d}", 'game_id': 1, 'minute': i, 'type': 'Goals'}
+                                for i in range(60)])
+    before = _checkouts(database)
+    page = app.test_client().get('/table/game_events').get_data(as_text=True)
+    # Sayfa ve toplam sayı aynı bağlantıdan gelir
+    assert _checkouts(database) - before == 1
+    assert '/table/game_events/delete/e49"' in page and '60' in page
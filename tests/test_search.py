@@ -0,0 +1,44 @@
+from Database import db
+from services import clubs
+from services.search import build_search, relevance_order
+
+from helpers import insert_rows
+
+
+def test_search_uses_like_without_a_fulltext_index(database):
+    where_clause, params = build_search(clubs.SEARCH_FIELDS, "Ana")
+    assert "MATCH(" not in where_clause
+    assert "name LIKE %s" in where_clause and "%Ana%" in params
+
+    insert_rows('clubs', [{'club_id': 1, 'name': 'Galatasaray'}, {'club_id': 2, 'name': 'Fenerbahçe'}])
+    assert [club.club_id for club in clubs.get_all_clubs(search_term="sara")] == [1]
+
+
+def test_search_uses_match_only_when_the_index_exists(database, monkeypatch):
+    indexes = {'ft_clubs_search': ('name', 'stadium_name', 'coach_name')}
+    monkeypatch.setattr(type(db), 'supports_fulltext', property(lambda self: True))
+    monkeypatch.setattr(db, 'fulltext_indexes', lambda table_name: dict(indexes))
+
+    where_clause, params = build_search(clubs.SEARCH_FIELDS, "Ana")
+    assert where_clause.startswith(" WHERE (MATCH(name, stadium_name, coach_name) AGAINST")
+    assert params[0] == "+Ana"
+    assert relevance_order(clubs.SEARCH_FIELDS, "Ana")[0].startswith("(MATCH(")
+
+    # Migration geri alınmış ya da hiç uygulanmamış: eski LIKE aramasına dönülür
+    indexes.clear()
+    db._fulltext.clear()
+    assert "MATCH(" not in build_search(clubs.SEARCH_FIELDS, "Ana")[0]
+
+
+def test_missing_fulltext_index_is_rechecked_after_the_interval(database, monkeypatch):
+    calls = []
+    monkeypatch.setattr(type(db), 'supports_fulltext', property(lambda self: True))
+    monkeypatch.setattr(db, 'fulltext_indexes', lambda table_name: calls.append(table_name) or {})
+
+    assert not db.has_fulltext_index('clubs', ['name'])
+    assert not db.has_fulltext_index('clubs', ['name'])
+    assert calls == ['clubs']
+
+    monkeypatch.setattr('Database.FULLTEXT_CHECK_INTERVAL', 0)
+    assert not db.has_fulltext_index('clubs', ['name'])
+    assert calls == ['clubs', 'clubs']
@@ -0,0 +1,70 @@
+import pytest
+
+import import_data
+from Database import db
+from importer.sync import run_sync, sync_table
+
+from helpers import count_rows
+
+HEADER = "game_event_id,game_id,minute,type,description\n"
+
+
+def test_sync_keeps_events_sharing_game_minute_and_type(database, tmp_path):
+    data, state = tmp_path / 'data', str(tmp_path / 'state')
+    data.mkdir()
+    path = data / 'game_events.csv'
+    path.write_text(HEADER + "a,1,10,Substitutions,in\nb,1,10,Substitutions,out\n")
+
+    stats = sync_table('game_events', str(data), state)
+    assert stats['inserted'] == 2 and 'error' not in stats
+    assert count_rows('game_events') == 2
+
+    # Düzenlenen satır yerinde güncellenir, silinen satır silinir
+    path.write_text(HEADER + "a,1,10,Substitutions,edited\n")
+    stats = sync_table('game_events', str(data), state)
+    assert (stats['updated'], stats['deleted']) == (1, 1)
+    assert count_rows('game_events') == 1
+    assert count_rows('game_events', "WHERE description = 'edited'") == 1
+
+
+def test_sync_refuses_a_table_without_a_unique_key(database, tmp_path):
+    conn = db.connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DROP TABLE game_events")
+        cursor.execute("CREATE TABLE game_events (game_event_id VARCHAR(64), game_id INTEGER, minute INTEGER,"
+                       " type VARCHAR(32), club_id INTEGER, player_id INTEGER, description TEXT,"
+                       " player_in_id INTEGER)")
+        conn.commit()
+    finally:
+        conn.close()
+    (tmp_path / 'game_events.csv').write_text(HEADER + "a,1,10,Goals,x\n")
+
+    with pytest.raises(ValueError, match='unique index'):
+        sync_table('game_events', str(tmp_path), str(tmp_path / 'state'))
+    assert count_rows('game_events') == 0
+
+
+def test_sync_refuses_files_without_the_key_column(database, tmp_path):
+    (tmp_path / 'game_events.csv').write_text("game_id,minute,type\n1,10,Goals\n")
+    with pytest.raises(ValueError, match='no game_event_id column'):
+        sync_table('game_events', str(tmp_path), str(tmp_path / 'state'))
+
+
+def test_sync_with_clean_writes_cleaned_rows_and_keeps_rejected_keys(database, tmp_path):
+    data, state, report = tmp_path / 'data', str(tmp_path / 'state'), tmp_path / 'rejected.csv'
+    data.mkdir()
+    path = data / 'clubs.csv'
+    path.write_text("club_id,name,total_market_value,squad_size\n1,A,+€1.30m,25\n2,B,null,x\n")
+
+    assert import_data.main(['--sync', '--clean', '--data-dir', str(data), '--state-dir', state,
+                             '--tables', 'clubs', '--reject-report', str(report)]) == 0
+    assert count_rows('clubs', "WHERE club_id = 1 AND total_market_value = 1300000") == 1
+    assert count_rows('clubs') == 1
+    assert 'squad_size: invalid int' in report.read_text()
+
+    # Daha önce yazılmış satır bu kez reddedilirse silinmez
+    path.write_text("club_id,name,total_market_value,squad_size\n1,A,+€1.30m,many\n")
+    results, _ = run_sync(str(data), ['clubs'], state, reject_report=str(report))
+    assert (results[0]['rejected'], results[0]['deleted']) == (1, 0)
+    assert count_rows('clubs') == 1